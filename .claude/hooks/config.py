@@ -5,6 +5,9 @@ Defines which tools require human approval and how they should be handled.
 """
 
 import fnmatch
+import functools
+import os
+import re
 from pathlib import Path
 from typing import List, Optional
 
@@ -13,12 +16,16 @@ HITL_CONFIG = {
     # Master switch
     'enabled': True,
 
+    # Resolve symlinks (filesystem walk) before matching protected patterns.
+    # Off by default: lexical normalization already defeats '../' bypasses.
+    'resolve_symlinks': False,
+
     # Tools that always require HITL (decision-making tools)
-    'decision_tools': [
+    'decision_tools': frozenset({
         'AskUserQuestion',   # User questions from Claude
         'ExitPlanMode',      # Plan execution approval
         'EnterPlanMode',     # Plan mode entry
-    ],
+    }),
 
     # File patterns that require approval for Edit/Write operations
     'protected_file_patterns': [
@@ -65,13 +72,13 @@ HINTS_CONFIG = {
     'auto_fix': False,
 
     # Tools that should receive hints
-    'hinted_tools': [
+    'hinted_tools': frozenset({
         'Bash',      # Command hints (npm -> bun, etc.)
         'Read',      # File access hints
         'Edit',      # Edit hints
         'Write',     # Write hints
         'Glob',      # Search hints
-    ],
+    }),
 
     # Specific hint categories to enable
     'categories': {
@@ -84,14 +91,109 @@ HINTS_CONFIG = {
 }
 
 
+# Protected file patterns combined into one alternation regex (built once at import)
+_PROTECTED_RE: Optional[re.Pattern] = None
+
+# Wildcard-free patterns, matched by set lookup on the full path or filename
+_PROTECTED_EXACT: frozenset = frozenset()
+
+# Literal substrings, one per pattern, that any matching path must contain.
+# Lets most paths be rejected with plain substring checks before the regex.
+# None when some pattern has no literal part (prefilter disabled).
+_FAST_PREFILTER: Optional[tuple] = None
+
+# Splits a glob pattern into its literal runs
+_GLOB_WILDCARD_RE = re.compile(r'\*|\?|\[[^\]]*\]')
+
+
+def _rebuild_protected_patterns() -> None:
+    """Recompile protected_file_patterns and drop cached results (call after mutating HITL_CONFIG)."""
+    global _PROTECTED_RE, _PROTECTED_EXACT, _FAST_PREFILTER
+    alternatives = []
+    exact = set()
+    literals = []
+    for pattern in HITL_CONFIG.get('protected_file_patterns', []):
+        literals.append(max(_GLOB_WILDCARD_RE.split(pattern), key=len))
+        if not _GLOB_WILDCARD_RE.search(pattern):
+            exact.add(pattern)
+            continue
+        # fnmatch.translate() anchors each pattern with a trailing \Z;
+        # strip it so the alternation shares a single end anchor
+        translated = fnmatch.translate(pattern)
+        if translated.endswith(r'\Z'):
+            translated = translated[:-2]
+        alternatives.append(f'(?:{translated})')
+    if alternatives:
+        # Optional prefix consumes everything up to the last '/', so one match
+        # tests both the full path and its basename against every pattern
+        _PROTECTED_RE = re.compile(
+            r'(?:(?s:.*/)(?=[^/]*\Z))?(?:' + '|'.join(alternatives) + r')\Z'
+        )
+    else:
+        _PROTECTED_RE = None
+    _PROTECTED_EXACT = frozenset(exact)
+    _FAST_PREFILTER = tuple(sorted(set(literals))) if all(literals) else None
+    _is_protected_file_impl.cache_clear()
+
+
+# Config sub-tables bound once at import (config is constant after load)
+_HITL_ENABLED: bool = True
+_HINTS_ENABLED: bool = True
+_AUTO_FIX_ENABLED: bool = False
+_DECISION_TOOLS: frozenset = frozenset()
+_TIMEOUTS: dict = {}
+_DEFAULT_TIMEOUT: int = 120
+_HITL_TYPES: dict = {}
+_HINTED_TOOLS: frozenset = frozenset()
+_HINT_CATEGORIES: dict = {}
+# Decision tool -> timeout, empty while HITL is disabled
+_DECISION_TIMEOUTS: dict = {}
+
+
+def _rebuild_config_lookups() -> None:
+    """Rebind cached config sub-tables (call after mutating HITL_CONFIG/HINTS_CONFIG)."""
+    global _HITL_ENABLED, _HINTS_ENABLED, _AUTO_FIX_ENABLED
+    global _DECISION_TOOLS, _TIMEOUTS, _DEFAULT_TIMEOUT, _HITL_TYPES
+    global _HINTED_TOOLS, _HINT_CATEGORIES, _DECISION_TIMEOUTS
+    _HITL_ENABLED = HITL_CONFIG.get('enabled', True)
+    _HINTS_ENABLED = HINTS_CONFIG.get('enabled', True)
+    _AUTO_FIX_ENABLED = HINTS_CONFIG.get('auto_fix', False)
+    _DECISION_TOOLS = frozenset(HITL_CONFIG.get('decision_tools', ()))
+    _TIMEOUTS = HITL_CONFIG.get('timeouts', {})
+    _DEFAULT_TIMEOUT = _TIMEOUTS.get('default', 120)
+    _HITL_TYPES = HITL_CONFIG.get('hitl_types', {})
+    _HINTED_TOOLS = frozenset(HINTS_CONFIG.get('hinted_tools', ()))
+    _HINT_CATEGORIES = HINTS_CONFIG.get('categories', {})
+    _DECISION_TIMEOUTS = {
+        tool: _TIMEOUTS.get(tool, _DEFAULT_TIMEOUT) for tool in _DECISION_TOOLS
+    } if _HITL_ENABLED else {}
+
+
+_rebuild_config_lookups()
+
+
 def is_hitl_enabled() -> bool:
     """Check if HITL is enabled globally."""
-    return HITL_CONFIG.get('enabled', True)
+    return _HITL_ENABLED
 
 
 def is_decision_tool(tool_name: str) -> bool:
     """Check if tool is a decision-making tool that always requires HITL."""
-    return tool_name in HITL_CONFIG.get('decision_tools', [])
+    return tool_name in _DECISION_TOOLS
+
+
+def get_decision_tool_timeout(tool_name: str) -> Optional[int]:
+    """
+    Timeout for a decision tool that needs HITL, in one lookup.
+
+    Equivalent to is_hitl_enabled() and is_decision_tool(tool_name)
+    followed by get_timeout(tool_name).
+
+    Returns:
+        Timeout in seconds, or None if HITL is disabled or the tool
+        isn't a decision tool
+    """
+    return _DECISION_TIMEOUTS.get(tool_name)
 
 
 def is_protected_file(file_path: str) -> bool:
@@ -99,43 +201,63 @@ def is_protected_file(file_path: str) -> bool:
     Check if file matches any protected pattern.
 
     Normalizes paths to prevent bypass attempts like '../../.env'.
-    Uses pathlib for cross-platform compatibility.
+    Normalization is lexical (no filesystem access) unless
+    HITL_CONFIG['resolve_symlinks'] is set. Results are cached per path;
+    _rebuild_protected_patterns() clears the cache after config changes.
     """
     if not file_path:
         return False
+    return _is_protected_file_impl(file_path)
+
+
+@functools.lru_cache(maxsize=1024)
+def _is_protected_file_impl(file_path: str) -> bool:
+    """Uncached protected-pattern match for a non-empty path."""
 
     # Normalize the path to resolve '..' and '.' components
     try:
-        normalized_path = Path(file_path).resolve()
-        # Convert to forward slashes for consistent pattern matching
-        normalized_str = normalized_path.as_posix()
+        if HITL_CONFIG.get('resolve_symlinks', False):
+            normalized_str = Path(file_path).resolve().as_posix()
+        else:
+            normalized_str = os.path.abspath(file_path)
+            # abspath keeps a POSIX '//' root; collapse it like resolve() does
+            if normalized_str.startswith('//'):
+                normalized_str = '/' + normalized_str.lstrip('/')
+            # Convert to forward slashes for consistent pattern matching
+            if os.sep != '/':
+                normalized_str = normalized_str.replace(os.sep, '/')
     except (ValueError, OSError):
-        # If path resolution fails, use the original path for matching
+        # If path normalization fails, use the original path for matching
         normalized_str = str(Path(file_path).as_posix())
 
-    patterns = HITL_CONFIG.get('protected_file_patterns', [])
-    for pattern in patterns:
-        # Match against full normalized path
-        if fnmatch.fnmatch(normalized_str, pattern):
-            return True
-        # Also check just the filename
-        basename = normalized_path.name if isinstance(normalized_path, Path) else Path(file_path).name
-        if fnmatch.fnmatch(basename, pattern):
-            return True
+    # Any match (full path or basename) contains its pattern's literal
+    if _FAST_PREFILTER is not None and not any(tok in normalized_str for tok in _FAST_PREFILTER):
+        return False
 
-    return False
+    # Wildcard-free patterns: O(1) set lookups instead of regex matching
+    if _PROTECTED_EXACT and (normalized_str in _PROTECTED_EXACT
+                             or normalized_str.rpartition('/')[2] in _PROTECTED_EXACT):
+        return True
+
+    if _PROTECTED_RE is None:
+        return False
+
+    # Single match covers both the full normalized path and the filename
+    return _PROTECTED_RE.match(normalized_str) is not None
+
+
+is_protected_file.cache_clear = _is_protected_file_impl.cache_clear
+_rebuild_protected_patterns()
 
 
 def get_timeout(tool_name: str) -> int:
     """Get timeout for specific tool."""
-    timeouts = HITL_CONFIG.get('timeouts', {})
-    return timeouts.get(tool_name, timeouts.get('default', 120))
+    return _TIMEOUTS.get(tool_name, _DEFAULT_TIMEOUT)
 
 
 def get_hitl_type(tool_name: str) -> str:
     """Get HITL type for specific tool."""
-    hitl_types = HITL_CONFIG.get('hitl_types', {})
-    return hitl_types.get(tool_name, 'approval')
+    return _HITL_TYPES.get(tool_name, 'approval')
 
 
 def should_require_hitl(tool_name: str, tool_input: dict) -> bool:
@@ -149,11 +271,11 @@ def should_require_hitl(tool_name: str, tool_input: dict) -> bool:
     Returns:
         True if HITL is required, False otherwise
     """
-    if not is_hitl_enabled():
+    if not _HITL_ENABLED:
         return False
 
     # Decision tools always require HITL
-    if is_decision_tool(tool_name):
+    if tool_name in _DECISION_TOOLS:
         return True
 
     # Check Edit/Write for protected files
@@ -171,24 +293,21 @@ def should_require_hitl(tool_name: str, tool_input: dict) -> bool:
 
 def is_hints_enabled() -> bool:
     """Check if hints system is enabled globally."""
-    return HINTS_CONFIG.get('enabled', True)
+    return _HINTS_ENABLED
 
 
 def is_auto_fix_enabled() -> bool:
     """Check if auto-fix (command substitution) is enabled."""
-    return HINTS_CONFIG.get('auto_fix', False)
+    return _AUTO_FIX_ENABLED
 
 
 def should_provide_hints(tool_name: str) -> bool:
     """Check if hints should be provided for this tool."""
-    if not is_hints_enabled():
-        return False
-    return tool_name in HINTS_CONFIG.get('hinted_tools', [])
+    return _HINTS_ENABLED and tool_name in _HINTED_TOOLS
 
 
 def is_hint_category_enabled(category: str) -> bool:
     """Check if specific hint category is enabled."""
-    if not is_hints_enabled():
+    if not _HINTS_ENABLED:
         return False
-    categories = HINTS_CONFIG.get('categories', {})
-    return categories.get(category, True)
+    return _HINT_CATEGORIES.get(category, True)
@@ -3,12 +3,16 @@
 Base handler class for unified hooks router.
 All hook handlers inherit from BaseHookHandler.
 """
-from abc import ABC, abstractmethod
+import sys
+from types import MappingProxyType
 from typing import Dict, Any, Optional, Tuple
 from dataclasses import dataclass, field
 
+# Slotted dataclasses need Python 3.10+
+_DATACLASS_OPTIONS = {'slots': True} if sys.version_info >= (3, 10) else {}
 
-@dataclass
+
+@dataclass(**_DATACLASS_OPTIONS)
 class HandlerResult:
     """Result from handler execution."""
     exit_code: int = 0  # 0=allow, 2=block
@@ -17,15 +21,26 @@ class HandlerResult:
     send_event_options: Dict[str, Any] = field(default_factory=dict)
 
 
-class BaseHookHandler(ABC):
-    """Abstract base class for all hook handlers."""
+# Shared result for the common "allow, no output, no event options" case.
+# Treat as immutable: its options mapping is read-only.
+_ALLOW_NOOP = HandlerResult(send_event_options=MappingProxyType({}))
+
+
+class BaseHookHandler:
+    """
+    Base class for all hook handlers.
+
+    Uses __slots__ (no per-instance __dict__); subclasses should declare
+    __slots__ = () unless they add instance attributes.
+    """
+
+    __slots__ = ('event_type', 'timeout', '_result')
 
     def __init__(self, event_type: str, timeout: int = 10):
         self.event_type = event_type
         self.timeout = timeout
         self._result = HandlerResult()
 
-    @abstractmethod
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """
         Execute handler logic.
@@ -37,7 +52,7 @@ class BaseHookHandler(ABC):
         Returns:
             HandlerResult with exit_code, optional output, and event options
         """
-        pass
+        raise NotImplementedError
 
     def get_session_id(self, input_data: Dict[str, Any]) -> str:
         """Extract session_id from input data."""
@@ -53,6 +68,8 @@ class BaseHookHandler(ABC):
 
     def allow(self, output: Optional[Dict] = None) -> HandlerResult:
         """Allow tool execution, optionally with modified output."""
+        if output is None and not self._result.send_event_options:
+            return _ALLOW_NOOP
         return HandlerResult(
             exit_code=0,
             output=output,
@@ -86,6 +103,8 @@ class SimpleHookHandler(BaseHookHandler):
     Used for: Notification, PostToolUse, SessionStart, SessionEnd, etc.
     """
 
+    __slots__ = ()
+
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """Default implementation: log and allow."""
         self.log_event(input_data)
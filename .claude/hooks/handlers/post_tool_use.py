@@ -16,8 +16,7 @@ parent_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(parent_dir))
 
 from utils.constants import ensure_session_log_dir
-from utils.hitl import ask_question_via_hitl
-from config import is_hitl_enabled, is_decision_tool, get_timeout
+from utils.log_bus import send_log_entry
 
 
 class PostToolUseHandler(SimpleHookHandler):
@@ -25,11 +24,13 @@ class PostToolUseHandler(SimpleHookHandler):
     Handler for post_tool_use hook events.
 
     Responsibilities:
-    1. Log all tool executions to session-specific JSON files
+    1. Log all tool executions to session-specific JSON Lines files
     2. Handle HITL (Human-in-the-Loop) responses for decision tools
     3. Always returns success (exit_code=0) - never blocks
     """
 
+    __slots__ = ()
+
     def __init__(self, event_type: str = "PostToolUse", timeout: int = 10):
         super().__init__(event_type, timeout)
 
@@ -75,7 +76,7 @@ class PostToolUseHandler(SimpleHookHandler):
 
     def _log_tool_execution(self, session_id: str, input_data: Dict[str, Any]):
         """
-        Log tool execution to session-specific JSON file.
+        Append tool execution to session-specific JSON Lines file.
 
         Args:
             session_id: Current session identifier
@@ -84,24 +85,10 @@ class PostToolUseHandler(SimpleHookHandler):
         try:
             # Ensure session log directory exists
             log_dir = ensure_session_log_dir(session_id)
-            log_path = log_dir / 'post_tool_use.json'
-
-            # Read existing log data or initialize empty list
-            if log_path.exists():
-                with open(log_path, 'r') as f:
-                    try:
-                        log_data = json.load(f)
-                    except (json.JSONDecodeError, ValueError):
-                        log_data = []
-            else:
-                log_data = []
-
-            # Append new data
-            log_data.append(input_data)
+            log_path = log_dir / 'post_tool_use.jsonl'
 
-            # Write back to file with formatting
-            with open(log_path, 'w') as f:
-                json.dump(log_data, f, indent=2)
+            # Append-only JSON Lines log (via the session log writer if enabled)
+            send_log_entry(session_id, log_path, input_data)
 
         except Exception as e:
             print(f"[PostToolUse] Warning: Failed to log tool execution: {e}", file=sys.stderr)
@@ -124,13 +111,15 @@ class PostToolUseHandler(SimpleHookHandler):
             tool_response: Response from the tool
             input_data: Complete input data
         """
+        # Imported lazily: most PostToolUse events never reach HITL handling
+        from config import get_decision_tool_timeout
+
         # Only proceed if HITL is enabled and this is a decision tool
-        if not is_hitl_enabled() or not is_decision_tool(tool_name):
+        timeout = get_decision_tool_timeout(tool_name)
+        if timeout is None:
             return
 
         try:
-            timeout = get_timeout(tool_name)
-
             # Session data for HITL requests
             session_data = {
                 'source_app': input_data.get('source_app', 'claude-code'),
@@ -165,6 +154,9 @@ class PostToolUseHandler(SimpleHookHandler):
             session_data: Session metadata
             timeout: Timeout in seconds for HITL request
         """
+        # Imported lazily to keep the networking stack off the common path
+        from utils.hitl import ask_question_via_hitl
+
         questions = tool_input.get('questions', [])
         question_text = questions[0].get('question', '') if questions else 'Unknown question'
 
@@ -3,7 +3,6 @@
 PreCompact hook handler.
 Logs pre-compact events and optionally backs up transcripts.
 """
-import json
 import os
 import shutil
 from pathlib import Path
@@ -11,11 +10,19 @@ from datetime import datetime
 from typing import Dict, Any
 
 from .base import SimpleHookHandler, HandlerResult
+from utils.jsonl_log import append_jsonl
+
+# Pre-compact log location (relative to the cwd)
+_LOG_DIR = "logs"
+_LOG_FILE = os.path.join(_LOG_DIR, "pre_compact.jsonl")
+_log_dir_ready = False
 
 
 class PreCompactHandler(SimpleHookHandler):
     """Handler for pre_compact hook events."""
 
+    __slots__ = ()
+
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """
         Execute pre-compact logic:
@@ -59,27 +66,15 @@ class PreCompactHandler(SimpleHookHandler):
 
     def _log_pre_compact(self, input_data: Dict[str, Any]):
         """Log pre-compact event to logs directory."""
-        # Ensure logs directory exists
-        log_dir = Path("logs")
-        log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / 'pre_compact.json'
-
-        # Read existing log data or initialize empty list
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append the entire input data
-        log_data.append(input_data)
-
-        # Write back to file with formatting
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        global _log_dir_ready
+
+        # Ensure logs directory exists (once per process)
+        if not _log_dir_ready:
+            os.makedirs(_LOG_DIR, exist_ok=True)
+            _log_dir_ready = True
+
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(_LOG_FILE, input_data)
 
     def _backup_transcript(self, transcript_path: str, trigger: str) -> str:
         """Create a backup of the transcript before compaction."""
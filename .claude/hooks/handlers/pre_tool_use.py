@@ -6,25 +6,22 @@ This is the MOST COMPLEX handler. It handles:
 2. Protected file edit approval
 3. Dangerous rm command detection and blocking
 4. Hints system for tool modifications
-5. Session logging with file locking
+5. Session logging (append-only JSONL)
 """
 
 from .base import BaseHookHandler, HandlerResult
 from typing import Dict, Any
-import json
 import sys
 import re
 import shlex
-import fcntl
 from pathlib import Path
 
 # Import from parent utils
 sys.path.insert(0, str(Path(__file__).parent.parent))
 from utils.constants import ensure_session_log_dir
-from utils.hitl import ask_approval, ask_question_via_hitl
-from utils.hints import process_tool_call, create_hook_output
+from utils.jsonl_log import append_jsonl
 from config import (
-    is_hitl_enabled, is_decision_tool, get_hitl_type, get_timeout,
+    is_hitl_enabled, get_decision_tool_timeout, get_hitl_type, get_timeout,
     is_protected_file, should_require_hitl, is_hints_enabled,
     is_auto_fix_enabled, should_provide_hints
 )
@@ -35,15 +32,104 @@ ALLOWED_RM_DIRECTORIES = [
 ]
 
 
+def _allowed_dirs_regex(allowed_dirs):
+    """
+    One anchored regex for "path is inside an allowed directory".
+
+    Matches a path that starts with an allowed dir once all leading '.' and
+    '/' characters are stripped (the (?![./]) makes [./]* take all of them,
+    like path.lstrip('./')), or that starts with './' plus an allowed dir.
+    """
+    if not allowed_dirs:
+        return re.compile(r'(?!)')  # Nothing is allowed
+    dirs = '|'.join(re.escape(d) for d in allowed_dirs)
+    return re.compile(rf'[./]*(?![./])(?:{dirs})|\./(?:{dirs})')
+
+
+# Regex for the default allowed directories, built once at import
+_ALLOWED_RM_RE = _allowed_dirs_regex(ALLOWED_RM_DIRECTORIES)
+
+# Tools whose file_path is checked for .env access / protected-file edits
+_FILE_TOOLS = frozenset({'Read', 'Edit', 'MultiEdit', 'Write'})
+_EDIT_TOOLS = frozenset({'Edit', 'Write', 'MultiEdit'})
+
+# Precompiled detection patterns (compiled once at import). Each group of
+# alternatives is fused into one regex so the command is scanned once.
+
+# The command is untrusted input, so none of these patterns may backtrack
+# catastrophically: "rm ... <flag>" is not written as `rm\s+.*<flag>` (every
+# rm in the command would rescan the rest of it), and no two adjacent pieces
+# of a pattern can match the same character. Matching is linear in the length
+# of the command.
+# rm patterns run on the raw lowercased command. ASCII makes \b and \s follow
+# the shell's ASCII word/blank rules and skips Unicode character-class lookups.
+# Using negative lookbehind (?<!-) to avoid matching --rm (docker flag).
+_RM_START = re.compile(r'(?<!-)\brm\s', re.ASCII)
+
+# Flags are searched for from the end of the first rm: a later rm only sees
+# a suffix of the command, so whatever follows it also follows the first one.
+# Pattern 2: a recursive flag cluster (-r, -rv, -Rf, ...)
+_RECURSIVE_FLAG = re.compile(r'-[a-qs-z]*r', re.ASCII)
+# Pattern 1: Standard rm -rf variations - a flag cluster with both r and f
+# (rm -rf, rm -fr, rm -Rf, rm -vfr, etc.); the letters before the first r/f
+# and between the two exclude them, so there is only one way to match
+_FORCE_RECURSIVE_FLAG = re.compile(
+    r'-[a-eg-qs-z]*(?:r[a-eg-z]*f|f[a-qs-z]*r)', re.ASCII
+)
+# rm --recursive --force / rm --force --recursive
+_RM_LONG_FLAGS = re.compile(
+    r'(?<!-)\brm\s+(?:--recursive\s+--force|--force\s+--recursive)', re.ASCII
+)
+# rm -r ... -f / rm -f ... -r: only the first such rm needs checking, since
+# any later one lies after it and its own -r/-f completes the first's pair
+_RM_SPLIT_FLAG = re.compile(r'(?<!-)\brm\s+-([rf])\s', re.ASCII)
+# Any of these is a dangerous target: root (/, /*), home (~, ~/, $HOME),
+# parent and current directory (.., ., trailing .) and wildcards (*). The
+# multi-character forms all start with one of the single characters, so the
+# alternation reduces to a character class plus $HOME.
+_DANGEROUS_PATHS = re.compile(r'[/~*.]|\$HOME', re.ASCII)
+
+# .env file access in Bash commands (but allow .env.sample). The alternatives
+# share the `.env` suffix, so it is factored out and matched once.
+# `cmd\s+.*` (rest of the line after cmd and its blanks) is spelled
+# `cmd\s(?:\s*\n)?` plus a run that stops at the next command word: that later
+# command reaches every .env the earlier one would, and each character is
+# scanned from one start instead of from every command before it.
+_ENV_PATTERNS = re.compile(
+    r'(?:'
+    r'\b'                                                    # .env but not .env.sample
+    r'|(?:cat|touch|cp|mv)\s(?:\s*\n)?'                      # cat/touch/cp/mv .env
+    r'(?:(?!(?:cat|touch|cp|mv)\s)[^\n])*'
+    r'|echo\s(?:\s*\n)?(?:(?!echo\s)[^\n])*>\s*'             # echo > .env
+    r')\.env\b(?!\.sample)'
+)
+
+# Characters that make shlex.split() differ from str.split(): quotes, escapes,
+# comments, and whitespace that shlex doesn't treat as a separator
+_NEEDS_SHLEX = re.compile(r'[^\x21-\x7e \t\r\n]|[\'"\\#]')
+
+
+def _split_command(command):
+    """Split a shell command into words, using shlex only when quoting requires it."""
+    if _NEEDS_SHLEX.search(command) is None:
+        return command.split()
+    return shlex.split(command)
+
+
 def is_path_in_allowed_directory(command, allowed_dirs):
     """
     Check if the rm command targets paths exclusively within allowed directories.
     Returns True if all paths in the command are within allowed directories.
     Uses shlex for proper shell parsing of quoted paths.
     """
+    # Skip tokenizing when the first word can't be rm: it has to start with
+    # r, or with a quote or backslash that shlex would strip (rm, 'rm', \rm)
+    if command.lstrip(' \t\r\n')[:1] not in ('r', '"', "'", '\\'):
+        return False
+
     try:
-        # Use shlex for proper shell parsing (handles quotes, escapes)
-        parts = shlex.split(command)
+        # Shell parsing (shlex handles quotes and escapes when present)
+        parts = _split_command(command)
     except ValueError:
         # Malformed command - treat as not allowed
         return False
@@ -57,30 +143,38 @@ def is_path_in_allowed_directory(command, allowed_dirs):
     if not paths:
         return False
 
+    if allowed_dirs is ALLOWED_RM_DIRECTORIES:
+        allowed_re = _ALLOWED_RM_RE
+    else:
+        allowed_re = _allowed_dirs_regex(allowed_dirs)
+
     # Check if all paths are within allowed directories
     for path in paths:
         # Skip if empty
         if not path:
             continue
 
-        # Normalize path for comparison
-        normalized = path.lstrip('./')
-
-        # Check if this path is within any allowed directory
-        is_allowed = False
-        for allowed_dir in allowed_dirs:
-            if normalized.startswith(allowed_dir) or path.startswith('./' + allowed_dir):
-                is_allowed = True
-                break
-
-        # If any path is not in allowed directories, return False
-        if not is_allowed:
+        # If any path is not within an allowed directory, return False
+        if not allowed_re.match(path):
             return False
 
     # All paths are within allowed directories
     return True
 
 
+def _is_force_recursive(normalized, flags_start):
+    """Pattern 1: rm -rf and its variations (flags_start: end of the first rm)."""
+    if _FORCE_RECURSIVE_FLAG.search(normalized, flags_start):
+        return True
+    if _RM_LONG_FLAGS.search(normalized):
+        return True
+    split = _RM_SPLIT_FLAG.search(normalized)
+    if split is None:
+        return False
+    other_flag = '-f' if split[1] == 'r' else '-r'
+    return normalized.find(other_flag, split.end()) != -1
+
+
 def is_dangerous_rm_command(command, allowed_dirs=None):
     """
     Comprehensive detection of dangerous rm commands.
@@ -97,47 +191,30 @@ def is_dangerous_rm_command(command, allowed_dirs=None):
     if allowed_dirs is None:
         allowed_dirs = []
 
-    # Normalize command by removing extra spaces and converting to lowercase
-    normalized = ' '.join(command.lower().split())
-
-    # Pattern 1: Standard rm -rf variations
-    # Using negative lookbehind (?<!-) to avoid matching --rm (docker flag)
-    patterns = [
-        r'(?<!-)\brm\s+.*-[a-z]*r[a-z]*f',  # rm -rf, rm -fr, rm -Rf, etc.
-        r'(?<!-)\brm\s+.*-[a-z]*f[a-z]*r',  # rm -fr variations
-        r'(?<!-)\brm\s+--recursive\s+--force',  # rm --recursive --force
-        r'(?<!-)\brm\s+--force\s+--recursive',  # rm --force --recursive
-        r'(?<!-)\brm\s+-r\s+.*-f',  # rm -r ... -f
-        r'(?<!-)\brm\s+-f\s+.*-r',  # rm -f ... -r
-    ]
-
-    # Check for dangerous patterns
-    is_potentially_dangerous = False
-    for pattern in patterns:
-        if re.search(pattern, normalized):
-            is_potentially_dangerous = True
-            break
-
-    # If not found in Pattern 1, check Pattern 2
-    if not is_potentially_dangerous:
-        # Pattern 2: Check for rm with recursive flag targeting dangerous paths
-        dangerous_paths = [
-            r'/',           # Root directory
-            r'/\*',         # Root with wildcard
-            r'~',           # Home directory
-            r'~/',          # Home directory path
-            r'\$HOME',      # Home environment variable
-            r'\.\.',        # Parent directory references
-            r'\*',          # Wildcards in general rm -rf context
-            r'\.',          # Current directory
-            r'\.\s*$',      # Current directory at end of command
-        ]
-
-        if re.search(r'(?<!-)\brm\s+.*-[a-z]*r', normalized):  # If rm has recursive flag
-            for path in dangerous_paths:
-                if re.search(path, normalized):
-                    is_potentially_dangerous = True
-                    break
+    # Fast reject: every pattern below requires a "-" flag and "rm", so skip
+    # regex work for the common case (git, npm, ls, rm foo.txt, ...). "-" has
+    # no case, so it's checked before paying for the lowercased copy. There is
+    # deliberately no '-r' substring gate: -fr and -vrf are recursive flags too.
+    if '-' not in command:
+        return False
+    normalized = command.lower()
+    if 'rm' not in normalized:
+        return False
+
+    rm = _RM_START.search(normalized)
+    if rm is None:
+        return False
+
+    # Every dangerous form (including all of Pattern 1) has a recursive flag,
+    # so a non-recursive rm is safe without running the other patterns
+    if not _RECURSIVE_FLAG.search(normalized, rm.end()):
+        return False
+
+    # Pattern 1: rm -rf variations; Pattern 2: recursive rm on dangerous paths
+    is_potentially_dangerous = (
+        _DANGEROUS_PATHS.search(normalized) is not None
+        or _is_force_recursive(normalized, rm.end())
+    )
 
     # If not potentially dangerous at all, it's safe
     if not is_potentially_dangerous:
@@ -155,29 +232,16 @@ def is_env_file_access(tool_name, tool_input):
     """
     Check if any tool is trying to access .env files containing sensitive data.
     """
-    if tool_name in ['Read', 'Edit', 'MultiEdit', 'Write', 'Bash']:
-        # Check file paths for file-based tools
-        if tool_name in ['Read', 'Edit', 'MultiEdit', 'Write']:
-            file_path = tool_input.get('file_path', '')
-            if '.env' in file_path and not file_path.endswith('.env.sample'):
-                return True
+    # Check file paths for file-based tools
+    if tool_name in _FILE_TOOLS:
+        file_path = tool_input.get('file_path', '')
+        return '.env' in file_path and not file_path.endswith('.env.sample')
 
-        # Check bash commands for .env file access
-        elif tool_name == 'Bash':
-            command = tool_input.get('command', '')
-            # Pattern to detect .env file access (but allow .env.sample)
-            env_patterns = [
-                r'\b\.env\b(?!\.sample)',  # .env but not .env.sample
-                r'cat\s+.*\.env\b(?!\.sample)',  # cat .env
-                r'echo\s+.*>\s*\.env\b(?!\.sample)',  # echo > .env
-                r'touch\s+.*\.env\b(?!\.sample)',  # touch .env
-                r'cp\s+.*\.env\b(?!\.sample)',  # cp .env
-                r'mv\s+.*\.env\b(?!\.sample)',  # mv .env
-            ]
-
-            for pattern in env_patterns:
-                if re.search(pattern, command):
-                    return True
+    # Check bash commands for .env file access
+    if tool_name == 'Bash':
+        command = tool_input.get('command', '')
+        # Every pattern requires a literal ".env"
+        return '.env' in command and _ENV_PATTERNS.search(command) is not None
 
     return False
 
@@ -194,6 +258,8 @@ class PreToolUseHandler(BaseHookHandler):
     - Session logging
     """
 
+    __slots__ = ()
+
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """
         Main execution method - extracts all logic from pre_tool_use.py
@@ -209,104 +275,26 @@ class PreToolUseHandler(BaseHookHandler):
             'session_id': input_data.get('session_id', 'unknown')
         }
 
+        # Looked up once for the protected-file and rm checks below
+        hitl_enabled = is_hitl_enabled()
+
         # ===========================================
         # DECISION TOOLS (AskUserQuestion, ExitPlanMode, etc.)
         # ===========================================
-        if is_hitl_enabled() and is_decision_tool(tool_name):
-            timeout = get_timeout(tool_name)
-
-            # AskUserQuestion - redirect question to UI with voice input
-            if tool_name == 'AskUserQuestion':
-                questions = tool_input.get('questions', [])
-                question_text = questions[0].get('question', '') if questions else 'Unknown question'
-
-                result = ask_question_via_hitl(
-                    f"🤖 Claude asks:\n\n{question_text}",
-                    session_data,
-                    context={
-                        'tool_name': tool_name,
-                        'questions': questions,
-                        'original_input': tool_input
-                    },
-                    hook_event_type='PreToolUse',
-                    payload={'tool_name': tool_name, 'tool_input': tool_input},
-                    timeout=timeout
-                )
-
-                if result.answered and result.response:
-                    # User answered via external UI - block native tool and return answer
-                    reason = f"User already answered via external interface. User's response: \"{result.response}\""
-                    self.log_stderr("[HITL] User response received via external UI")
-                    self.set_send_event_options(summarize=True)
-                    return self.block(reason)
-                elif result.cancelled:
-                    reason = "User cancelled the question via external interface"
-                    self.log_stderr("[HITL] User cancelled the question")
-                    self.set_send_event_options(summarize=True)
-                    return self.block(reason)
-                else:
-                    reason = "No response received (timeout). Please try asking the question again."
-                    self.log_stderr("[HITL] Timeout - no response received")
-                    self.set_send_event_options(summarize=True)
-                    return self.block(reason)
-
-            # ExitPlanMode - approve plan execution
-            elif tool_name == 'ExitPlanMode':
-                result = ask_approval(
-                    "📋 Exit Plan Mode - Ready to execute the plan?",
-                    session_data,
-                    context={
-                        'tool_name': tool_name,
-                        'action': 'exit_plan_mode'
-                    },
-                    hook_event_type='PreToolUse',
-                    payload={'tool_name': tool_name, 'tool_input': tool_input},
-                    timeout=timeout
-                )
-
-                if result.approved:
-                    comment = f" Comment: {result.comment}" if result.comment else ""
-                    self.log_stderr(f"[HITL] Plan execution approved.{comment}")
-                    self.set_send_event_options(summarize=True)
-                    return self.allow()  # Allow - proceed with ExitPlanMode
-                else:
-                    reason = result.comment or "User denied plan execution"
-                    self.log_stderr(f"[HITL] Plan execution denied: {reason}")
-                    self.set_send_event_options(summarize=True)
-                    return self.block(f"Plan execution denied via HITL: {reason}")
-
-            # EnterPlanMode - approve entering plan mode
-            elif tool_name == 'EnterPlanMode':
-                result = ask_approval(
-                    "📝 Enter Plan Mode - Start planning?",
-                    session_data,
-                    context={
-                        'tool_name': tool_name,
-                        'action': 'enter_plan_mode'
-                    },
-                    hook_event_type='PreToolUse',
-                    payload={'tool_name': tool_name, 'tool_input': tool_input},
-                    timeout=timeout
-                )
-
-                if result.approved:
-                    comment = f" Comment: {result.comment}" if result.comment else ""
-                    self.log_stderr(f"[HITL] Entering plan mode approved.{comment}")
-                    self.set_send_event_options(summarize=True)
-                    return self.allow()  # Allow - proceed with EnterPlanMode
-                else:
-                    reason = result.comment or "User denied entering plan mode"
-                    self.log_stderr(f"[HITL] Entering plan mode denied: {reason}")
-                    self.set_send_event_options(summarize=True)
-                    return self.block(f"Entering plan mode denied via HITL: {reason}")
+        decision_timeout = get_decision_tool_timeout(tool_name)
+        if decision_timeout is not None:
+            handler = self._DECISION_HANDLERS.get(tool_name)
+            if handler is not None:
+                return handler(self, tool_name, tool_input, session_data, decision_timeout)
 
         # ===========================================
         # PROTECTED FILE EDITS
         # ===========================================
-        if is_hitl_enabled() and tool_name in ['Edit', 'Write', 'MultiEdit']:
+        if hitl_enabled and tool_name in _EDIT_TOOLS:
             file_path = tool_input.get('file_path', '')
 
             if is_protected_file(file_path):
+                from utils.hitl import ask_approval
                 timeout = get_timeout(tool_name)
 
                 # Build context for diff display
@@ -354,7 +342,8 @@ class PreToolUseHandler(BaseHookHandler):
 
             # Dangerous rm -rf commands require human approval
             if is_dangerous_rm_command(command, ALLOWED_RM_DIRECTORIES):
-                if is_hitl_enabled():
+                if hitl_enabled:
+                    from utils.hitl import ask_approval
                     result = ask_approval(
                         f"🚨 Dangerous command detected:\n\n`{command}`\n\nAllow execution?",
                         session_data,
@@ -387,6 +376,8 @@ class PreToolUseHandler(BaseHookHandler):
         # HINTS AND AUTO-FIX SYSTEM
         # ===========================================
         if is_hints_enabled() and should_provide_hints(tool_name):
+            # Imported lazily: only hinted tools need the hints engine
+            from utils.hints import process_tool_call, create_hook_output
             # Get working directory from input or use current
             cwd = input_data.get('cwd', os.getcwd())
 
@@ -419,32 +410,11 @@ class PreToolUseHandler(BaseHookHandler):
 
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_path = log_dir / 'pre_tool_use.json'
+        log_path = log_dir / 'pre_tool_use.jsonl'
 
-        # Use file locking to prevent TOCTOU race conditions
+        # Append-only JSONL: one write per event, no read-modify-write
         try:
-            with open(log_path, 'a+') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)  # Exclusive lock
-                try:
-                    f.seek(0)
-                    content = f.read()
-                    if content:
-                        try:
-                            log_data = json.loads(content)
-                        except (json.JSONDecodeError, ValueError):
-                            log_data = []
-                    else:
-                        log_data = []
-
-                    # Append new data
-                    log_data.append(input_data)
-
-                    # Write back to file with formatting
-                    f.seek(0)
-                    f.truncate()
-                    json.dump(log_data, f, indent=2)
-                finally:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)  # Release lock
+            append_jsonl(log_path, input_data)
         except Exception as e:
             self.log_stderr(f"[HITL] Logging error: {e}")
 
@@ -453,3 +423,107 @@ class PreToolUseHandler(BaseHookHandler):
 
         # Allow tool execution
         return self.allow()
+
+    def _handle_ask_user_question(self, tool_name: str, tool_input: Dict[str, Any],
+                                  session_data: Dict[str, Any], timeout: int) -> HandlerResult:
+        """Redirect AskUserQuestion to the UI (with voice input)."""
+        # Imported lazily to keep the networking stack off the common path
+        from utils.hitl import ask_question_via_hitl
+
+        questions = tool_input.get('questions', [])
+        question_text = questions[0].get('question', '') if questions else 'Unknown question'
+
+        result = ask_question_via_hitl(
+            f"🤖 Claude asks:\n\n{question_text}",
+            session_data,
+            context={
+                'tool_name': tool_name,
+                'questions': questions,
+                'original_input': tool_input
+            },
+            hook_event_type='PreToolUse',
+            payload={'tool_name': tool_name, 'tool_input': tool_input},
+            timeout=timeout
+        )
+
+        if result.answered and result.response:
+            # User answered via external UI - block native tool and return answer
+            reason = f"User already answered via external interface. User's response: \"{result.response}\""
+            self.log_stderr("[HITL] User response received via external UI")
+            self.set_send_event_options(summarize=True)
+            return self.block(reason)
+        elif result.cancelled:
+            reason = "User cancelled the question via external interface"
+            self.log_stderr("[HITL] User cancelled the question")
+            self.set_send_event_options(summarize=True)
+            return self.block(reason)
+        else:
+            reason = "No response received (timeout). Please try asking the question again."
+            self.log_stderr("[HITL] Timeout - no response received")
+            self.set_send_event_options(summarize=True)
+            return self.block(reason)
+
+    def _handle_exit_plan_mode(self, tool_name: str, tool_input: Dict[str, Any],
+                               session_data: Dict[str, Any], timeout: int) -> HandlerResult:
+        """Ask for approval before ExitPlanMode executes the plan."""
+        # Imported lazily to keep the networking stack off the common path
+        from utils.hitl import ask_approval
+
+        result = ask_approval(
+            "📋 Exit Plan Mode - Ready to execute the plan?",
+            session_data,
+            context={
+                'tool_name': tool_name,
+                'action': 'exit_plan_mode'
+            },
+            hook_event_type='PreToolUse',
+            payload={'tool_name': tool_name, 'tool_input': tool_input},
+            timeout=timeout
+        )
+
+        if result.approved:
+            comment = f" Comment: {result.comment}" if result.comment else ""
+            self.log_stderr(f"[HITL] Plan execution approved.{comment}")
+            self.set_send_event_options(summarize=True)
+            return self.allow()  # Allow - proceed with ExitPlanMode
+        else:
+            reason = result.comment or "User denied plan execution"
+            self.log_stderr(f"[HITL] Plan execution denied: {reason}")
+            self.set_send_event_options(summarize=True)
+            return self.block(f"Plan execution denied via HITL: {reason}")
+
+    def _handle_enter_plan_mode(self, tool_name: str, tool_input: Dict[str, Any],
+                                session_data: Dict[str, Any], timeout: int) -> HandlerResult:
+        """Ask for approval before EnterPlanMode starts planning."""
+        # Imported lazily to keep the networking stack off the common path
+        from utils.hitl import ask_approval
+
+        result = ask_approval(
+            "📝 Enter Plan Mode - Start planning?",
+            session_data,
+            context={
+                'tool_name': tool_name,
+                'action': 'enter_plan_mode'
+            },
+            hook_event_type='PreToolUse',
+            payload={'tool_name': tool_name, 'tool_input': tool_input},
+            timeout=timeout
+        )
+
+        if result.approved:
+            comment = f" Comment: {result.comment}" if result.comment else ""
+            self.log_stderr(f"[HITL] Entering plan mode approved.{comment}")
+            self.set_send_event_options(summarize=True)
+            return self.allow()  # Allow - proceed with EnterPlanMode
+        else:
+            reason = result.comment or "User denied entering plan mode"
+            self.log_stderr(f"[HITL] Entering plan mode denied: {reason}")
+            self.set_send_event_options(summarize=True)
+            return self.block(f"Entering plan mode denied via HITL: {reason}")
+
+    # Decision tool name -> handler, looked up once instead of an if/elif chain
+    _DECISION_HANDLERS = {
+        'AskUserQuestion': _handle_ask_user_question,
+        'ExitPlanMode': _handle_exit_plan_mode,
+        'EnterPlanMode': _handle_enter_plan_mode,
+    }
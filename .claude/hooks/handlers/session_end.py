@@ -5,18 +5,22 @@ SessionEnd hook handler.
 Logs session end events, saves session statistics, and optionally announces
 session end via TTS.
 """
-import json
-import subprocess
 from pathlib import Path
 from datetime import datetime
 from typing import Dict, Any
 
 from .base import SimpleHookHandler, HandlerResult
+from lib.fs_cache import exists_cached
+from utils.jsonl_log import append_jsonl, session_file_id
+from utils.tts import speak_with
+from utils.stats_writer import spawn_stats_writer
 
 
 class SessionEndHandler(SimpleHookHandler):
     """Handler for session_end hook events."""
 
+    __slots__ = ()
+
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """
         Execute session end handler.
@@ -47,28 +51,17 @@ class SessionEndHandler(SimpleHookHandler):
             # Ensure logs directory exists
             log_dir = Path("logs")
             log_dir.mkdir(parents=True, exist_ok=True)
-            log_file = log_dir / 'session_end.json'
-
-            # Read existing log data or initialize empty list
-            if log_file.exists():
-                with open(log_file, 'r') as f:
-                    try:
-                        log_data = json.load(f)
-                    except (json.JSONDecodeError, ValueError):
-                        log_data = []
-            else:
-                log_data = []
+
+            # One file per session so concurrent sessions never append to the same file
+            session_id = input_data.get('session_id', 'unknown')
+            log_file = log_dir / f'session_end.{session_file_id(session_id)}.jsonl'
 
             # Append the entire input data with timestamp
             entry = {
                 **input_data,
                 "logged_at": datetime.now().isoformat()
             }
-            log_data.append(entry)
-
-            # Write back to file with formatting
-            with open(log_file, 'w') as f:
-                json.dump(log_data, f, indent=2)
+            append_jsonl(log_file, entry)
 
         except Exception:
             pass  # Don't fail the hook on logging errors
@@ -76,44 +69,13 @@ class SessionEndHandler(SimpleHookHandler):
     def _save_session_statistics(self, input_data: Dict[str, Any]):
         """Save session statistics for analytics."""
         try:
-            session_id = input_data.get('session_id', 'unknown')
-            reason = input_data.get('reason', 'other')
-            transcript_path = input_data.get('transcript_path', '')
-
-            # Count messages in transcript if available
-            message_count = 0
-            if transcript_path and Path(transcript_path).exists():
-                try:
-                    with open(transcript_path, 'r') as f:
-                        # JSONL format - count lines
-                        message_count = sum(1 for _ in f)
-                except Exception:
-                    pass
-
-            # Save statistics
-            stats_dir = Path("logs")
-            stats_dir.mkdir(parents=True, exist_ok=True)
-            stats_file = stats_dir / 'session_statistics.json'
-
-            if stats_file.exists():
-                with open(stats_file, 'r') as f:
-                    try:
-                        stats = json.load(f)
-                    except (json.JSONDecodeError, ValueError):
-                        stats = []
-            else:
-                stats = []
-
-            stats.append({
-                "session_id": session_id,
-                "ended_at": datetime.now().isoformat(),
-                "reason": reason,
-                "message_count": message_count
-            })
-
-            with open(stats_file, 'w') as f:
-                json.dump(stats, f, indent=2)
-
+            # Counting transcript lines is O(transcript size) - do it in a
+            # detached process so the hook returns immediately
+            spawn_stats_writer(
+                input_data.get('session_id', 'unknown'),
+                input_data.get('reason', 'other'),
+                input_data.get('transcript_path', '')
+            )
         except Exception:
             pass  # Don't fail the hook on stats errors
 
@@ -126,7 +88,7 @@ class SessionEndHandler(SimpleHookHandler):
             script_dir = Path(__file__).parent.parent
             tts_script = script_dir / "utils" / "tts" / "pyttsx3_tts.py"
 
-            if tts_script.exists():
+            if exists_cached(tts_script):
                 messages = {
                     "clear": "Session cleared",
                     "logout": "Logging out",
@@ -135,10 +97,8 @@ class SessionEndHandler(SimpleHookHandler):
                 }
                 message = messages.get(reason, "Session ended")
 
-                subprocess.run(
-                    ["uv", "run", str(tts_script), message],
-                    capture_output=True,
-                    timeout=5
-                )
+                # In-process when pyttsx3 is importable here, else `uv run`;
+                # either way the hook waits at most 5 seconds
+                speak_with(tts_script, message, timeout=5)
         except Exception:
             pass  # Don't fail the hook on TTS errors
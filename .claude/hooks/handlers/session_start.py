@@ -3,18 +3,65 @@
 SessionStart hook handler.
 Manages session initialization, context loading, and git status reporting.
 """
-import json
-import subprocess
+import os
 from pathlib import Path
-from datetime import datetime
 from typing import Dict, Any
 
 from .base import SimpleHookHandler, HandlerResult
+from lib.fs_cache import exists_cached
+from utils.jsonl_log import append_jsonl
+
+
+# Project-specific context files, included in this order when present
+CONTEXT_FILES = (
+    ".claude/CONTEXT.md",
+    ".claude/TODO.md",
+    "TODO.md",
+    ".github/ISSUE_TEMPLATE.md"
+)
+
+# Upper bound on waiting for any one context source (gh itself times out at 10s)
+CONTEXT_TIMEOUT_SECONDS = 15
+
+# Characters kept from each context file, and the bytes read to get them
+# (4 bytes per character is the UTF-8 worst case)
+CONTEXT_MAX_CHARS = 1000
+CONTEXT_MAX_BYTES = 4 * CONTEXT_MAX_CHARS
+
+# Announcement TTS script, resolved once at import (None if it's missing)
+_PYTTSX3_PATH = Path(__file__).resolve().parent.parent / "utils" / "tts" / "pyttsx3_tts.py"
+_PYTTSX3_SCRIPT = str(_PYTTSX3_PATH) if exists_cached(_PYTTSX3_PATH) else None
+
+
+def _read_context_files(context_files):
+    """Return (path, content) for each non-empty context file, in order."""
+    contents = []
+    for file_path in context_files:
+        # Open directly (no exists() stat) and read only the bytes needed for
+        # the first CONTEXT_MAX_CHARS characters, however large the file is
+        try:
+            with open(file_path, 'rb') as f:
+                content = f.read(CONTEXT_MAX_BYTES).decode('utf-8', 'replace').strip()
+        except OSError:
+            continue  # Missing or unreadable
+        if content:
+            contents.append((file_path, content[:CONTEXT_MAX_CHARS]))
+    return contents
+
+
+def _context_result(future, default):
+    """Return a context source's result, or default if it failed or timed out."""
+    try:
+        return future.result(timeout=CONTEXT_TIMEOUT_SECONDS)
+    except Exception:
+        return default
 
 
 class SessionStartHandler(SimpleHookHandler):
     """Handler for session_start hook events."""
 
+    __slots__ = ()
+
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """
         Execute session start logic.
@@ -58,111 +105,90 @@ class SessionStartHandler(SimpleHookHandler):
         # Ensure logs directory exists
         log_dir = Path("logs")
         log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / 'session_start.json'
-
-        # Read existing log data or initialize empty list
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append the entire input data
-        log_data.append(input_data)
-
-        # Write back to file with formatting
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        log_file = log_dir / 'session_start.jsonl'
+
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_file, input_data)
+
+    @staticmethod
+    def _read_git_status():
+        """Run git for [branch, uncommitted_count] (JSON-friendly for the cache)."""
+        import subprocess
+
+        # Branch header and changed-file entries from a single git call
+        status_result = subprocess.run(
+            ['git', 'status', '--porcelain=v2', '--branch'],
+            capture_output=True,
+            text=True,
+            timeout=5
+        )
+        if status_result.returncode != 0:
+            return ["unknown", 0]
+
+        current_branch = "unknown"
+        uncommitted_count = 0
+        for line in status_result.stdout.splitlines():
+            if line.startswith('# branch.head '):
+                current_branch = line[len('# branch.head '):]
+            elif line and not line.startswith('#'):
+                uncommitted_count += 1
+
+        # Report a detached HEAD the way `git rev-parse --abbrev-ref HEAD` does
+        if current_branch == '(detached)':
+            current_branch = 'HEAD'
+
+        return [current_branch, uncommitted_count]
 
     def _get_git_status(self):
-        """Get current git status information."""
+        """Get current git status information (cached until git state changes)."""
         try:
-            # Get current branch
-            branch_result = subprocess.run(
-                ['git', 'rev-parse', '--abbrev-ref', 'HEAD'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            current_branch = branch_result.stdout.strip() if branch_result.returncode == 0 else "unknown"
-
-            # Get uncommitted changes count
-            status_result = subprocess.run(
-                ['git', 'status', '--porcelain'],
-                capture_output=True,
-                text=True,
-                timeout=5
-            )
-            if status_result.returncode == 0:
-                changes = status_result.stdout.strip().split('\n') if status_result.stdout.strip() else []
-                uncommitted_count = len(changes)
-            else:
-                uncommitted_count = 0
-
-            return current_branch, uncommitted_count
+            from lib.git_cache import get_cached
+            branch, uncommitted_count = get_cached('git_status', os.getcwd(), self._read_git_status)
+            return branch, uncommitted_count
         except Exception:
             return None, None
 
     def _get_recent_issues(self):
         """Get recent GitHub issues if gh CLI is available."""
-        try:
-            # Check if gh is available
-            gh_check = subprocess.run(['which', 'gh'], capture_output=True)
-            if gh_check.returncode != 0:
-                return None
-
-            # Get recent open issues
-            result = subprocess.run(
-                ['gh', 'issue', 'list', '--limit', '5', '--state', 'open'],
-                capture_output=True,
-                text=True,
-                timeout=10
-            )
-            if result.returncode == 0 and result.stdout.strip():
-                return result.stdout.strip()
-        except Exception:
-            pass
-        return None
+        # gh_batch resolves gh once per process and returns None when it's missing
+        from lib.gh_batch import list_issues
+        return list_issues(limit=5)
 
     def _load_development_context(self, source: str) -> str:
         """Load relevant development context based on session source."""
+        # Imported lazily: sessions started without --load-context never need them
+        from concurrent.futures import ThreadPoolExecutor
+        from datetime import datetime
+
         context_parts = []
 
         # Add timestamp
         context_parts.append(f"Session started at: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
         context_parts.append(f"Session source: {source}")
 
+        # git, gh and the context files are all I/O-bound (subprocess waits and
+        # disk reads release the GIL), so collect them concurrently: wall time is
+        # the slowest source rather than the sum of all three
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            git_future = executor.submit(self._get_git_status)
+            files_future = executor.submit(_read_context_files, CONTEXT_FILES)
+            issues_future = executor.submit(self._get_recent_issues)
+            branch, changes = _context_result(git_future, (None, None))
+            file_contents = _context_result(files_future, [])
+            issues = _context_result(issues_future, None)
+
         # Add git information
-        branch, changes = self._get_git_status()
         if branch:
             context_parts.append(f"Git branch: {branch}")
             if changes > 0:
                 context_parts.append(f"Uncommitted changes: {changes} files")
 
-        # Load project-specific context files if they exist
-        context_files = [
-            ".claude/CONTEXT.md",
-            ".claude/TODO.md",
-            "TODO.md",
-            ".github/ISSUE_TEMPLATE.md"
-        ]
-
-        for file_path in context_files:
-            if Path(file_path).exists():
-                try:
-                    with open(file_path, 'r') as f:
-                        content = f.read().strip()
-                        if content:
-                            context_parts.append(f"\n--- Content from {file_path} ---")
-                            context_parts.append(content[:1000])  # Limit to first 1000 chars
-                except Exception:
-                    pass
+        # Add project-specific context files
+        for file_path, content in file_contents:
+            context_parts.append(f"\n--- Content from {file_path} ---")
+            context_parts.append(content)
 
         # Add recent issues if available
-        issues = self._get_recent_issues()
         if issues:
             context_parts.append("\n--- Recent GitHub Issues ---")
             context_parts.append(issues)
@@ -173,10 +199,7 @@ class SessionStartHandler(SimpleHookHandler):
         """Announce session start via TTS if available."""
         try:
             # Try to use TTS to announce session start
-            script_dir = Path(__file__).parent.parent
-            tts_script = script_dir / "utils" / "tts" / "pyttsx3_tts.py"
-
-            if tts_script.exists():
+            if _PYTTSX3_SCRIPT:
                 messages = {
                     "startup": "Claude Code session started",
                     "resume": "Resuming previous session",
@@ -184,10 +207,8 @@ class SessionStartHandler(SimpleHookHandler):
                 }
                 message = messages.get(source, "Session started")
 
-                subprocess.run(
-                    ["uv", "run", str(tts_script), message],
-                    capture_output=True,
-                    timeout=5
-                )
+                # Fire-and-forget: speak from a detached process, without waiting for playback
+                from utils.tts import speak_detached
+                speak_detached(_PYTTSX3_SCRIPT, message)
         except Exception:
             pass
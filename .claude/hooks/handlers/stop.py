@@ -1,11 +1,12 @@
 from .base import SimpleHookHandler, HandlerResult
 from typing import Dict, Any
-import json
 import os
 import random
 import subprocess
 from pathlib import Path
 from utils.constants import ensure_session_log_dir
+from lib.fs_cache import dir_entries
+from utils.jsonl_log import append_jsonl, jsonl_to_json_array
 
 try:
     from dotenv import load_dotenv
@@ -33,22 +34,23 @@ def get_tts_script_path():
     # Get hooks directory and construct utils/tts path
     hooks_dir = Path(__file__).parent.parent
     tts_dir = hooks_dir / "utils" / "tts"
+    tts_files = dir_entries(tts_dir)  # One scandir instead of a stat per script
 
     # Check for ElevenLabs API key (highest priority)
     if os.getenv("ELEVENLABS_API_KEY"):
         elevenlabs_script = tts_dir / "elevenlabs_tts.py"
-        if elevenlabs_script.exists():
+        if elevenlabs_script.name in tts_files:
             return str(elevenlabs_script)
 
     # Check for OpenAI API key (second priority)
     if os.getenv("OPENAI_API_KEY"):
         openai_script = tts_dir / "openai_tts.py"
-        if openai_script.exists():
+        if openai_script.name in tts_files:
             return str(openai_script)
 
     # Fall back to pyttsx3 (no API key required)
     pyttsx3_script = tts_dir / "pyttsx3_tts.py"
-    if pyttsx3_script.exists():
+    if pyttsx3_script.name in tts_files:
         return str(pyttsx3_script)
 
     return None
@@ -65,11 +67,12 @@ def get_llm_completion_message():
     # Get hooks directory and construct utils/llm path
     hooks_dir = Path(__file__).parent.parent
     llm_dir = hooks_dir / "utils" / "llm"
+    llm_files = dir_entries(llm_dir)
 
     # Try Anthropic second
     if os.getenv("ANTHROPIC_API_KEY"):
         anth_script = llm_dir / "anth.py"
-        if anth_script.exists():
+        if anth_script.name in llm_files:
             try:
                 result = subprocess.run(
                     ["uv", "run", str(anth_script), "--completion"],
@@ -85,7 +88,7 @@ def get_llm_completion_message():
     # Try OpenAI first (highest priority)
     if os.getenv("OPENAI_API_KEY"):
         oai_script = llm_dir / "oai.py"
-        if oai_script.exists():
+        if oai_script.name in llm_files:
             try:
                 result = subprocess.run(
                     ["uv", "run", str(oai_script), "--completion"],
@@ -131,6 +134,8 @@ def announce_completion():
 class StopHandler(SimpleHookHandler):
     """Handler for stop hook events."""
 
+    __slots__ = ()
+
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """
         Execute stop hook logic.
@@ -147,45 +152,20 @@ class StopHandler(SimpleHookHandler):
 
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_path = log_dir / "stop.json"
-
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, "r") as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append new data
-        log_data.append(input_data)
+        log_path = log_dir / "stop.jsonl"
 
-        # Write back to file with formatting
-        with open(log_path, "w") as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_path, input_data)
 
         # Handle --chat switch (convert transcript to chat.json)
         if getattr(args, 'add_chat', False) and "transcript_path" in input_data:
             transcript_path = input_data["transcript_path"]
             if os.path.exists(transcript_path):
-                # Read .jsonl file and convert to JSON array
-                chat_data = []
+                # Stream the .jsonl transcript into logs/chat.json as a JSON array
+                # (entry by entry - the transcript is never held in memory)
                 try:
-                    with open(transcript_path, "r") as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    chat_data.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    pass  # Skip invalid lines
-
-                    # Write to logs/chat.json
                     chat_file = os.path.join(log_dir, "chat.json")
-                    with open(chat_file, "w") as f:
-                        json.dump(chat_data, f, indent=2)
+                    jsonl_to_json_array(transcript_path, chat_file)
                 except Exception:
                     pass  # Fail silently
 
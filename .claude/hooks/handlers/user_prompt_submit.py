@@ -4,17 +4,37 @@ UserPromptSubmit hook handler.
 Logs user prompts, manages session data, generates agent names, and validates prompts.
 """
 import json
+import re
 import subprocess
 import sys
 from pathlib import Path
 from typing import Dict, Any
 
 from .base import SimpleHookHandler, HandlerResult
+from utils.jsonl_log import append_jsonl
+from utils.llm import get_agent_name
+from utils.fastjson import dumps, loads
+
+
+# Prompt validation rules (customize as needed): (substring, reason) pairs,
+# matched case-insensitively; the first listed match gives the reason
+BLOCKED_PATTERNS = [
+    # Add any patterns you want to block
+    # Example: ('rm -rf /', 'Dangerous command detected'),
+]
+
+# All patterns folded into one alternation so each prompt is scanned once
+_BLOCKED_RE = (
+    re.compile('|'.join(re.escape(pattern.lower()) for pattern, _ in BLOCKED_PATTERNS))
+    if BLOCKED_PATTERNS else None
+)
 
 
 class UserPromptSubmitHandler(SimpleHookHandler):
     """Handler for user_prompt_submit hook event."""
 
+    __slots__ = ()
+
     def execute(self, input_data: Dict[str, Any], args: Any) -> HandlerResult:
         """
         Execute user prompt submit logic.
@@ -69,24 +89,10 @@ class UserPromptSubmitHandler(SimpleHookHandler):
         # Ensure logs directory exists
         log_dir = Path("logs")
         log_dir.mkdir(parents=True, exist_ok=True)
-        log_file = log_dir / "user_prompt_submit.json"
-
-        # Read existing log data or initialize empty list
-        if log_file.exists():
-            with open(log_file, "r") as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append the entire input data
-        log_data.append(input_data)
+        log_file = log_dir / "user_prompt_submit.jsonl"
 
-        # Write back to file with formatting
-        with open(log_file, "w") as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_file, input_data)
 
     def _manage_session_data(self, session_id: str, prompt: str, name_agent: bool = False):
         """Manage session data in the new JSON structure."""
@@ -99,8 +105,8 @@ class UserPromptSubmitHandler(SimpleHookHandler):
 
         if session_file.exists():
             try:
-                with open(session_file, "r") as f:
-                    session_data = json.load(f)
+                with open(session_file, "rb") as f:
+                    session_data = loads(f.read())
             except (json.JSONDecodeError, ValueError):
                 session_data = {"session_id": session_id, "prompts": []}
         else:
@@ -117,8 +123,8 @@ class UserPromptSubmitHandler(SimpleHookHandler):
 
         # Save the updated session data
         try:
-            with open(session_file, "w") as f:
-                json.dump(session_data, f, indent=2)
+            with open(session_file, "wb") as f:
+                f.write(dumps(session_data, pretty=True))
         except Exception:
             # Silently fail if we can't write the file
             pass
@@ -131,22 +137,15 @@ class UserPromptSubmitHandler(SimpleHookHandler):
         Returns:
             Agent name (string) or None if generation failed
         """
-        # Try Anthropic first (preferred)
+        # Try Anthropic first (preferred) - in-process when its SDK imports here
         try:
-            result = subprocess.run(
-                ["uv", "run", ".claude/hooks/utils/llm/anth.py", "--agent-name"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-
-            if result.returncode == 0 and result.stdout.strip():
-                agent_name = result.stdout.strip()
-                # Validate the name
-                if len(agent_name.split()) == 1 and agent_name.isalnum():
-                    return agent_name
-                else:
-                    raise Exception("Invalid name from Anthropic")
+            agent_name = get_agent_name(timeout=10)
+
+            # Validate the name (in-process failures return None - also fall back)
+            if agent_name and len(agent_name.split()) == 1 and agent_name.isalnum():
+                return agent_name
+            else:
+                raise Exception("Invalid name from Anthropic")
         except Exception:
             # Fall back to Ollama if Anthropic fails
             try:
@@ -178,16 +177,15 @@ class UserPromptSubmitHandler(SimpleHookHandler):
         Returns:
             Tuple of (is_valid, reason). reason is None if valid.
         """
-        # Example validation rules (customize as needed)
-        blocked_patterns = [
-            # Add any patterns you want to block
-            # Example: ('rm -rf /', 'Dangerous command detected'),
-        ]
+        if _BLOCKED_RE is None:
+            return True, None
 
         prompt_lower = prompt.lower()
 
-        for pattern, reason in blocked_patterns:
-            if pattern.lower() in prompt_lower:
-                return False, reason
+        # One regex pass; only a hit walks the list to find the first pattern's reason
+        if _BLOCKED_RE.search(prompt_lower):
+            for pattern, reason in BLOCKED_PATTERNS:
+                if pattern.lower() in prompt_lower:
+                    return False, reason
 
         return True, None
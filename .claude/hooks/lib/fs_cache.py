@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Filesystem Lookup Cache
+
+Hooks probe the same handful of paths on every event (TTS and LLM scripts,
+project marker files), one stat() syscall per Path.exists(). Hook processes
+are short-lived and those paths don't appear or disappear while one runs, so
+the answers are memoized per process:
+
+- exists_cached(): one stat() per distinct path
+- dir_entries(): one os.scandir() per directory, after which any number of
+  "is this file here?" checks are set lookups
+
+Don't use these for files the hook itself creates or removes (logs, caches).
+"""
+
+import os
+from functools import lru_cache
+from typing import FrozenSet, Union
+
+PathLike = Union[str, "os.PathLike[str]"]
+
+
+@lru_cache(maxsize=256)
+def _exists(path: str) -> bool:
+    return os.path.exists(path)
+
+
+def exists_cached(path: PathLike) -> bool:
+    """Memoized os.path.exists()."""
+    return _exists(os.fspath(path))
+
+
+@lru_cache(maxsize=64)
+def _dir_entries(path: str) -> FrozenSet[str]:
+    try:
+        with os.scandir(path) as entries:
+            return frozenset(entry.name for entry in entries)
+    except OSError:
+        return frozenset()  # Missing or unreadable directory
+
+
+def dir_entries(path: PathLike) -> FrozenSet[str]:
+    """
+    Names in a directory, read with a single memoized os.scandir().
+
+    Args:
+        path: Directory to list
+
+    Returns:
+        Frozenset of entry names (empty if the directory can't be read)
+    """
+    return _dir_entries(os.fspath(path))
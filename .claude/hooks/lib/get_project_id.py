@@ -6,14 +6,25 @@ Generates unique project identifiers using a 3-tier fallback:
 1. Manual override: .claude/project-id file
 2. Git remote: owner:repo format
 3. Fallback: hashed directory path
+
+Results are memoized per process and, inside git repositories, cached on disk
+until .claude/project-id or .git/config changes, so repeat hook invocations
+skip all three tiers.
 """
 
+import configparser
+import functools
 import os
+import re
 import subprocess
-import hashlib
+import sys
 from pathlib import Path
 from typing import Optional
 
+# Sibling module import (this file is also loaded by path via importlib)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+from git_cache import find_git_dir, get_cached
+
 
 def get_project_id(cwd: Optional[str] = None) -> str:
     """
@@ -27,7 +38,25 @@ def get_project_id(cwd: Optional[str] = None) -> str:
     """
     if cwd is None:
         cwd = os.getcwd()
+    return _get_project_id_cached(os.path.realpath(cwd))
+
+
+@functools.lru_cache(maxsize=8)
+def _get_project_id_cached(cwd: str) -> str:
+    """Project ID for a resolved cwd, reused across processes while its inputs are unchanged."""
+    try:
+        return get_cached(
+            "project_id", cwd, lambda: _compute_project_id(cwd),
+            git_files=("config",),
+            extra_files=(Path(cwd) / ".claude" / "project-id",),
+            ttl=None,
+        )
+    except (subprocess.TimeoutExpired, OSError):
+        return _compute_project_id(cwd)
+
 
+def _compute_project_id(cwd: str) -> str:
+    """Resolve the project ID through the three tiers (uncached)."""
     # Tier 1: Check for manual override
     project_id = _get_from_override_file(cwd)
     if project_id:
@@ -53,28 +82,84 @@ def _get_from_override_file(cwd: str) -> Optional[str]:
 
 
 def _get_from_git_remote(cwd: str) -> Optional[str]:
-    """Extract project ID from git remote URL."""
+    """Extract project ID from git remote URL (cached until git state changes)."""
     try:
-        result = subprocess.run(
-            ["git", "config", "--get", "remote.origin.url"],
-            cwd=cwd,
-            capture_output=True,
-            text=True,
-            timeout=5
-        )
+        git_remote = get_cached("remote_origin_url", cwd, lambda: _read_git_remote(cwd))
+    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+        return None
 
-        if result.returncode != 0:
-            return None
+    if not git_remote:
+        return None
 
-        git_remote = result.stdout.strip()
-        if not git_remote:
-            return None
+    return _parse_git_url(git_remote)
 
-        return _parse_git_url(git_remote)
 
-    except (subprocess.TimeoutExpired, FileNotFoundError, OSError):
+# Returned by _read_remote_from_config when only git can answer reliably
+_UNRESOLVED = object()
+
+
+def _read_remote_from_config(cwd: str):
+    """
+    Read remote.origin.url straight from .git/config, without spawning git.
+
+    Returns:
+        The URL, None if origin has no URL, or _UNRESOLVED when the config
+        is missing or uses features this plain INI read doesn't model
+    """
+    git_dir = find_git_dir(cwd)
+    if git_dir is None:
+        return None  # Not a repository - no origin
+
+    parser = configparser.ConfigParser(strict=False, interpolation=None,
+                                       allow_no_value=True)
+    try:
+        with open(git_dir / "config", "r", encoding="utf-8") as f:
+            parser.read_file(f)
+    except (OSError, UnicodeDecodeError, configparser.Error):
+        return _UNRESOLVED
+
+    url = ""
+    for section in parser.sections():
+        name = section.lower()
+        if name.startswith(("include", "remote.")):
+            return _UNRESOLVED  # Included files or legacy [remote.origin] syntax
+        # Section names are case-insensitive, subsection names are not
+        if name.startswith("remote ") and section[7:].strip() == '"origin"':
+            url = (parser.get(section, "url", fallback=None) or "").strip()
+
+    if any(c in url for c in '"\\;#'):
+        return _UNRESOLVED  # Quoting, escapes and comments need git's parser
+    return url or None
+
+
+def _read_git_remote(cwd: str) -> Optional[str]:
+    """Origin remote URL (None if not configured)."""
+    url = _read_remote_from_config(cwd)
+    if url is not _UNRESOLVED:
+        return url
+
+    # Unusual layouts (worktrees, includes, quoted values) - ask git itself
+    result = subprocess.run(
+        ["git", "config", "--get", "remote.origin.url"],
+        cwd=cwd,
+        capture_output=True,
+        text=True,
+        timeout=5
+    )
+
+    if result.returncode != 0:
         return None
 
+    return result.stdout.strip() or None
+
+
+# SSH shorthand with a single colon: git@host:[path/]owner/repo
+_SSH_URL_RE = re.compile(r"git@[^:]*:(?:[^:]*/)?([^:/]*)/([^:/]*)\Z")
+
+# Any other URL: the last two path segments, the owner without any user@
+# prefix and not starting with "http" (so bare https://host/repo is rejected)
+_URL_RE = re.compile(r"(?:^|/)(?:[^/]*@)?(?!http)([^/@]+)/([^/]+)\Z")
+
 
 def _parse_git_url(url: str) -> Optional[str]:
     """
@@ -90,42 +175,25 @@ def _parse_git_url(url: str) -> Optional[str]:
     # Remove .git suffix
     url = url.removesuffix(".git")
 
-    # Handle SSH format: git@github.com:owner/repo
-    if url.startswith("git@"):
-        # git@github.com:owner/repo -> owner/repo
-        parts = url.split(":")
-        if len(parts) == 2:
-            path_parts = parts[1].split("/")
-            if len(path_parts) >= 2:
-                owner = path_parts[-2]
-                repo = path_parts[-1]
-                return f"{owner}:{repo}"
-
-    # Handle HTTPS/SSH URL format
-    # https://github.com/owner/repo -> owner/repo
-    # ssh://git@github.com/owner/repo -> owner/repo
-    parts = url.split("/")
-    if len(parts) >= 2:
-        owner = parts[-2]
-        repo = parts[-1]
-
-        # Clean up owner if it contains @ (ssh://git@github.com)
-        if "@" in owner:
-            owner = owner.split("@")[-1]
-
-        # Validate we got reasonable values
-        if owner and repo and not owner.startswith("http"):
-            return f"{owner}:{repo}"
-
-    return None
+    # git@github.com:owner/repo -> last two path segments after the colon
+    match = _SSH_URL_RE.match(url)
+    if match is None:
+        # https://github.com/owner/repo, ssh://git@github.com/owner/repo
+        match = _URL_RE.search(url)
+    if match is None:
+        return None
+    return f"{match[1]}:{match[2]}"
 
 
 def _get_from_directory_hash(cwd: str) -> str:
     """Generate project ID from directory path hash."""
+    import hashlib  # Only needed when git gives no project ID
+
     abs_path = Path(cwd).resolve()
 
-    # Create hash of full path for uniqueness
-    path_hash = hashlib.sha256(str(abs_path).encode()).hexdigest()[:12]
+    # Hash the full path for uniqueness (non-cryptographic use: BLAKE2b with a
+    # 6-byte digest gives the same 12 hex chars as before, cheaper than SHA-256)
+    path_hash = hashlib.blake2b(str(abs_path).encode(), digest_size=6).hexdigest()
 
     # Use directory name for readability
     dir_name = abs_path.name
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""
+GitHub CLI Client
+
+Shared wrapper around the gh CLI for hooks that pull GitHub data into context.
+Each gh invocation is a subprocess plus at least one API round-trip, so lookups
+are batched: fetch_issue_titles() resolves any number of issues with a single
+`gh api graphql` call (one aliased field per issue) instead of one call each.
+"""
+
+import json
+import shutil
+import subprocess
+from functools import lru_cache
+from typing import Dict, Iterable, Optional
+
+# Seconds to wait for a gh command before giving up
+GH_TIMEOUT_SECONDS = 10
+
+
+@lru_cache(maxsize=1)
+def gh_path() -> Optional[str]:
+    """Location of the gh CLI on PATH (None if not installed)."""
+    return shutil.which("gh")
+
+
+def _run_gh(*args: str, check: bool = True) -> Optional[str]:
+    """
+    Run gh with args and return its stripped stdout (None on failure).
+
+    With check=False a non-zero exit still returns stdout; gh api exits
+    non-zero when a GraphQL response carries errors next to partial data.
+    """
+    gh = gh_path()
+    if not gh:
+        return None
+    try:
+        result = subprocess.run(
+            [gh, *args],
+            capture_output=True,
+            text=True,
+            timeout=GH_TIMEOUT_SECONDS
+        )
+    except (subprocess.SubprocessError, OSError):
+        return None
+    if check and result.returncode != 0:
+        return None
+    return result.stdout.strip() or None
+
+
+def list_issues(limit: int = 5) -> Optional[str]:
+    """
+    List the most recent open issues of the current directory's repository.
+
+    Args:
+        limit: Maximum number of issues
+
+    Returns:
+        gh's tab-separated issue listing, or None if gh is unavailable or fails
+    """
+    return _run_gh("issue", "list", "--limit", str(limit), "--state", "open")
+
+
+def fetch_issue_titles(numbers: Iterable[int]) -> Dict[int, str]:
+    """
+    Look up the titles of several issues with one GraphQL request.
+
+    Args:
+        numbers: Issue numbers in the current directory's repository
+
+    Returns:
+        Mapping of issue number to title (missing issues are omitted)
+    """
+    numbers = sorted({int(n) for n in numbers})
+    if not numbers:
+        return {}
+
+    fields = " ".join(f"i{n}: issue(number: {n}) {{ title }}" for n in numbers)
+    query = (
+        "query($owner: String!, $repo: String!) {"
+        f" repository(owner: $owner, name: $repo) {{ {fields} }} }}"
+    )
+    # gh fills {owner}/{repo} from the current directory's repository
+    output = _run_gh("api", "graphql",
+                     "-F", "owner={owner}", "-F", "repo={repo}",
+                     "-f", f"query={query}",
+                     check=False)
+    if not output:
+        return {}
+
+    # Unknown numbers come back as null fields plus an error entry
+    try:
+        repository = (json.loads(output).get("data") or {}).get("repository")
+    except (ValueError, AttributeError):
+        return {}
+
+    titles = {}
+    for n in numbers:
+        issue = (repository or {}).get(f"i{n}")
+        if issue and issue.get("title") is not None:
+            titles[n] = issue["title"]
+    return titles
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Git State Cache
+
+Hooks run as fresh processes many times per session, and each git query costs
+a subprocess. Results are cached per repository in the user's cache directory
+(~/.cache/claude-hooks/git/<hash of the repository root>.json, nothing is
+written into the working tree), keyed by the mtimes of git's internal files
+(HEAD, index, config), so git is only re-run after the repository state changes.
+A short TTL bounds staleness for changes git doesn't record in those files
+(e.g. editing a tracked file without staging it).
+"""
+
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Any, Callable, List, Optional, Sequence, Tuple
+
+CACHE_DIR = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache") / "claude-hooks" / "git"
+
+# Cached values are recomputed after this many seconds regardless of mtimes
+CACHE_TTL_SECONDS = 60
+
+# Git internals whose changes invalidate cached results
+WATCHED_GIT_FILES = ("HEAD", "index", "config")
+
+
+def _find_repo(cwd: str) -> Optional[Tuple[Path, Path]]:
+    """(repository root, git directory) for cwd, or None outside a repository."""
+    path = Path(cwd).resolve()
+    for directory in (path, *path.parents):
+        dot_git = directory / ".git"
+        if dot_git.is_dir():
+            return directory, dot_git
+        if dot_git.is_file():
+            try:
+                content = dot_git.read_text().strip()
+            except OSError:
+                return None
+            if content.startswith("gitdir:"):
+                return directory, (directory / content[len("gitdir:"):].strip()).resolve()
+            return None
+    return None
+
+
+def find_git_dir(cwd: str) -> Optional[Path]:
+    """
+    Locate the git directory for cwd (walking up to the repository root).
+
+    Handles worktrees/submodules where .git is a file containing "gitdir: <path>".
+    """
+    repo = _find_repo(cwd)
+    return repo[1] if repo else None
+
+
+def _cache_file(repo_root: Path) -> Path:
+    """Cache file for one repository (the root path hashed into the name)."""
+    digest = hashlib.blake2b(str(repo_root).encode(), digest_size=8).hexdigest()
+    return CACHE_DIR / f"{digest}.json"
+
+
+def _stamp(paths: List[Path]) -> List[Optional[List[int]]]:
+    """[mtime_ns, size] per path (None if missing) - the cache validity key."""
+    stamps = []
+    for path in paths:
+        try:
+            st = os.stat(path)
+            stamps.append([st.st_mtime_ns, st.st_size])
+        except OSError:
+            stamps.append(None)
+    return stamps
+
+
+def _load(cache_file: Path) -> dict:
+    try:
+        with open(cache_file, "r") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except (OSError, ValueError):
+        return {}
+
+
+def _store(cache_file: Path, data: dict) -> None:
+    """Write the cache atomically (best-effort)."""
+    try:
+        cache_file.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_file = cache_file.with_name(f"{cache_file.name}.{os.getpid()}.tmp")
+        # Serialize first, then hand the file a single write
+        payload = json.dumps(data, separators=(",", ":")).encode()
+        with open(tmp_file, "wb") as f:
+            f.write(payload)
+        os.replace(tmp_file, cache_file)
+    except OSError:
+        pass
+
+
+def get_cached(key: str, cwd: str, producer: Callable[[], Any],
+               git_files: Sequence[str] = WATCHED_GIT_FILES,
+               extra_files: Sequence[Path] = (),
+               ttl: Optional[float] = CACHE_TTL_SECONDS) -> Any:
+    """
+    Return producer()'s result, reusing a cached value while git state is unchanged.
+
+    Args:
+        key: Cache entry name (e.g. "git_status")
+        cwd: Project directory the result belongs to
+        producer: Computes the value (JSON-serializable) on a cache miss
+        git_files: Files in the git directory whose changes invalidate the value
+        extra_files: Other files whose changes invalidate the value
+        ttl: Seconds before the value is recomputed anyway (None: never)
+
+    Returns:
+        The cached or freshly computed value
+    """
+    repo = _find_repo(cwd)
+    if repo is None:
+        return producer()  # Not a repository - nothing to key the cache on
+    repo_root, git_dir = repo
+
+    # One file per repository; values are per directory within it
+    cache_file = _cache_file(repo_root)
+    key = f"{key}:{Path(cwd).resolve()}"
+    watched = [git_dir / name for name in git_files] + list(extra_files)
+    stamps = _stamp(watched)
+    cache = _load(cache_file)
+
+    entry = cache.get(key)
+    if (isinstance(entry, dict) and entry.get("mtimes") == stamps
+            and (ttl is None or time.time() - entry.get("ts", 0) < ttl)):
+        return entry.get("value")
+
+    value = producer()
+    # Stamp again afterwards: git status refreshes the index's stat data and
+    # rewrites it, so stamps from before the producer would never match again
+    stamps = _stamp(watched)
+    cache = _load(cache_file)  # Re-read: the producer may have cached entries too
+    cache[key] = {"mtimes": stamps, "value": value, "ts": time.time()}
+    _store(cache_file, cache)
+    return value
@@ -3,50 +3,57 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
 import argparse
+import functools
 import json
 import os
 import sys
 import subprocess
 import random
 from pathlib import Path
+from lib.fs_cache import dir_entries
 from utils.constants import ensure_session_log_dir
 from utils.dedup import is_duplicate_event
+from utils.env_cache import load_dotenv_cached
+from utils.jsonl_log import append_jsonl
+from utils.fastjson import loads
 
-try:
-    from dotenv import load_dotenv
-    load_dotenv()
-except ImportError:
-    pass  # dotenv is optional
+# Load .env, found like load_dotenv() does (dotenv is only imported when one exists)
+load_dotenv_cached()
 
 
+@functools.lru_cache(maxsize=1)
 def get_tts_script_path():
     """
     Determine which TTS script to use based on available API keys.
     Priority order: ElevenLabs > OpenAI > pyttsx3
+
+    Memoized: API keys and the TTS script layout don't change within a process.
     """
     # Get current script directory and construct utils/tts path
     script_dir = Path(__file__).parent
     tts_dir = script_dir / "utils" / "tts"
+    tts_files = dir_entries(tts_dir)  # One scandir instead of a stat per script
     
     # Check for ElevenLabs API key (highest priority)
     if os.getenv('ELEVENLABS_API_KEY'):
         elevenlabs_script = tts_dir / "elevenlabs_tts.py"
-        if elevenlabs_script.exists():
+        if elevenlabs_script.name in tts_files:
             return str(elevenlabs_script)
     
     # Check for OpenAI API key (second priority)
     if os.getenv('OPENAI_API_KEY'):
         openai_script = tts_dir / "openai_tts.py"
-        if openai_script.exists():
+        if openai_script.name in tts_files:
             return str(openai_script)
     
     # Fall back to pyttsx3 (no API key required)
     pyttsx3_script = tts_dir / "pyttsx3_tts.py"
-    if pyttsx3_script.exists():
+    if pyttsx3_script.name in tts_files:
         return str(pyttsx3_script)
     
     return None
@@ -92,7 +99,7 @@ def main():
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = loads(sys.stdin.buffer.read())
 
         # Extract session_id
         session_id = input_data.get('session_id', 'unknown')
@@ -103,24 +110,10 @@ def main():
         
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_file = log_dir / 'notification.json'
-        
-        # Read existing log data or initialize empty list
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-        
-        # Append new data
-        log_data.append(input_data)
+        log_file = log_dir / 'notification.jsonl'
         
-        # Write back to file with formatting
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_file, input_data)
         
         # Announce notification via TTS only if --notify flag is set
         # Skip TTS for the generic "Claude is waiting for your input" message
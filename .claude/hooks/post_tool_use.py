@@ -1,28 +1,27 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.8"
-# dependencies = ["requests", "python-dotenv"]
+# dependencies = ["requests", "python-dotenv", "orjson"]
 # ///
 
-import os
 from pathlib import Path
 
-# Load .env BEFORE any other imports that might use env vars
-from dotenv import load_dotenv
-_env_path = Path.home() / '.claude' / '.env'
-if _env_path.exists():
-    load_dotenv(_env_path)
+# Load .env BEFORE any other imports that might use env vars (env_cache only
+# imports python-dotenv when the file exists)
+from utils.env_cache import load_dotenv_cached
+load_dotenv_cached(str(Path.home() / '.claude' / '.env'))
 
 import json
 import sys
 from utils.constants import ensure_session_log_dir
-from utils.hitl import ask_question_via_hitl
-from config import is_hitl_enabled, is_decision_tool, get_timeout
+from utils.jsonl_log import append_jsonl
+from utils.fastjson import loads
+from config import get_decision_tool_timeout
 
 def main():
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.buffer.read())
 
         # Extract session_id and tool info
         session_id = input_data.get('session_id', 'unknown')
@@ -32,31 +31,16 @@ def main():
 
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_path = log_dir / 'post_tool_use.json'
+        log_path = log_dir / 'post_tool_use.jsonl'
 
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append new data
-        log_data.append(input_data)
-
-        # Write back to file with formatting
-        with open(log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_path, input_data)
 
         # ===========================================
         # HITL for Decision Tools (AskUserQuestion, etc.)
         # ===========================================
-        if is_hitl_enabled() and is_decision_tool(tool_name):
-            timeout = get_timeout(tool_name)
-
+        timeout = get_decision_tool_timeout(tool_name)
+        if timeout is not None:
             # Session data for HITL requests
             session_data = {
                 'source_app': input_data.get('source_app', 'claude-code'),
@@ -65,6 +49,9 @@ def main():
 
             # AskUserQuestion - check if user answered via HITL
             if tool_name == 'AskUserQuestion':
+                # Imported lazily to keep the networking stack off the common path
+                from utils.hitl import ask_question_via_hitl
+
                 questions = tool_input.get('questions', [])
                 question_text = questions[0].get('question', '') if questions else 'Unknown question'
 
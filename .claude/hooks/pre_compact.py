@@ -3,6 +3,7 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
@@ -12,6 +13,8 @@ import os
 import sys
 from pathlib import Path
 from datetime import datetime
+from utils.jsonl_log import append_jsonl
+from utils.fastjson import loads
 
 try:
     from dotenv import load_dotenv
@@ -25,24 +28,10 @@ def log_pre_compact(input_data):
     # Ensure logs directory exists
     log_dir = Path("logs")
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / 'pre_compact.json'
+    log_file = log_dir / 'pre_compact.jsonl'
     
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Append the entire input data
-    log_data.append(input_data)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    # Append-only JSONL: one write per event, no read-modify-write
+    append_jsonl(log_file, input_data)
 
 
 def backup_transcript(transcript_path, trigger):
@@ -81,7 +70,7 @@ def main():
         args = parser.parse_args()
         
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = loads(sys.stdin.buffer.read())
         
         # Extract fields
         session_id = input_data.get('session_id', 'unknown')
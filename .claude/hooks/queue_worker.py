@@ -4,6 +4,8 @@
 # dependencies = [
 #     "redis",
 #     "python-dotenv",
+#     "requests",
+#     "orjson",
 # ]
 # ///
 
@@ -13,16 +15,17 @@ Processes events from Redis Streams and forwards them to the observability serve
 
 Features:
 - Consumer group based processing (at-least-once delivery)
+- Optional batched delivery (--batch: one POST per read to <server-url>/batch,
+  split at MAX_BATCH_BYTES) for servers that provide that endpoint
 - Automatic retry with exponential backoff
 - Dead letter queue for failed events
 - Stale event recovery from crashed workers
 - Graceful shutdown handling
 
 Usage:
-    uv run queue_worker.py [--consumer CONSUMER_ID] [--batch-size N]
+    uv run queue_worker.py [--consumer CONSUMER_ID] [--batch-size N] [--batch]
 """
 
-import json
 import sys
 import os
 import time
@@ -32,22 +35,43 @@ import urllib.request
 import urllib.error
 import random
 from datetime import datetime
-from typing import Optional, Tuple
+from typing import Iterator, List, Optional, Tuple
 
 # Add utils to path
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
-from utils.redis_cache import get_hook_cache
+from utils.fastjson import JSONDecodeError, dumps, loads
+from utils.redis_cache import EVENT_FIELD, get_hook_cache
+
+# Keep-alive HTTP session (optional): reuses one connection to the server
+# across events instead of a new TCP handshake per POST
+try:
+    import requests
+    from requests.adapters import HTTPAdapter
+except ImportError:
+    requests = None  # Fall back to a urllib request per event
 
 # Configuration
 DEFAULT_STREAM = "hook_events"
 DEFAULT_GROUP = "event_processors"
+DLQ_STREAM = f"{DEFAULT_STREAM}_dlq"
 DEFAULT_SERVER_URL = "http://localhost:4000/events"
 MAX_RETRIES = 3
 RETRY_BACKOFF_BASE = 2  # seconds
 STALE_CHECK_INTERVAL = 60  # seconds
 STALE_THRESHOLD_MS = 300000  # 5 minutes
 
+# Events read per batch. One POST per event (with retries) must get through a
+# read well within STALE_THRESHOLD_MS, or other workers claim and resend the
+# unACKed rest; a batch POST sends a whole read at once, so it can read more
+DEFAULT_BATCH_SIZE = 10
+DEFAULT_BATCH_SIZE_BATCHED = 100
+
+REQUEST_HEADERS = {
+    'Content-Type': 'application/json',
+    'User-Agent': 'Claude-Queue-Worker/1.0'
+}
+
 # Global shutdown flag
 shutdown_requested = False
 
@@ -59,52 +83,165 @@ def signal_handler(signum, frame):
     shutdown_requested = True
 
 
-def send_event_to_server(event_data: dict, server_url: str) -> bool:
-    """Send event to the observability server."""
+def _create_session():
+    """Create the pooled HTTP session (None if requests isn't installed)."""
+    if requests is None:
+        return None
+    session = requests.Session()
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=4)
+    session.mount('http://', adapter)
+    session.mount('https://', adapter)
+    session.headers.update(REQUEST_HEADERS)
+    return session
+
+
+_SESSION = _create_session()
+
+
+def _post_with_session(body: bytes, url: str) -> Optional[int]:
+    """POST over the pooled keep-alive session; HTTP status or None."""
     try:
-        req = urllib.request.Request(
-            server_url,
-            data=json.dumps(event_data).encode('utf-8'),
-            headers={
-                'Content-Type': 'application/json',
-                'User-Agent': 'Claude-Queue-Worker/1.0'
-            }
-        )
+        return _SESSION.post(url, data=body, timeout=10).status_code
+    except requests.RequestException as e:
+        print(f"[QueueWorker] Server error: {e}", file=sys.stderr)
+        return None
 
-        with urllib.request.urlopen(req, timeout=10) as response:
-            return response.status == 200
 
+def _post_with_urllib(body: bytes, url: str) -> Optional[int]:
+    """POST with a one-off urllib connection; HTTP status or None."""
+    try:
+        req = urllib.request.Request(url, data=body, headers=REQUEST_HEADERS)
+        with urllib.request.urlopen(req, timeout=10) as response:
+            return response.status
+    except urllib.error.HTTPError as e:
+        print(f"[QueueWorker] Server error: {e}", file=sys.stderr)
+        return e.code
     except urllib.error.URLError as e:
         print(f"[QueueWorker] Server error: {e}", file=sys.stderr)
-        return False
+        return None
+
+
+def _post_body(body: bytes, url: str) -> Optional[int]:
+    """POST an encoded JSON body; returns the HTTP status (None if unreachable)."""
+    try:
+        if _SESSION is not None:
+            return _post_with_session(body, url)
+        return _post_with_urllib(body, url)
+    except Exception as e:
+        print(f"[QueueWorker] Unexpected error: {e}", file=sys.stderr)
+        return None
+
+
+def _post_json(payload, url: str) -> Optional[int]:
+    """POST payload as JSON; returns the HTTP status (None if unreachable)."""
+    try:
+        body = dumps(payload)  # orjson emits bytes directly
     except Exception as e:
         print(f"[QueueWorker] Unexpected error: {e}", file=sys.stderr)
+        return None
+    return _post_body(body, url)
+
+
+def send_event_to_server(event_data: dict, server_url: str) -> bool:
+    """Send event to the observability server."""
+    return _post_json(event_data, server_url) == 200
+
+
+# Set once the server answers the batch endpoint with 404/405/501 (older server)
+_batch_unsupported = False
+
+
+# Largest request body for one batch; bigger backlogs go out in several
+MAX_BATCH_BYTES = 1_000_000
+
+
+def send_events_batch(events_json: List[bytes], server_url: str) -> bool:
+    """
+    Send several events to the observability server in one request.
+
+    POSTs the events, given as encoded JSON documents, as one JSON array to
+    <server_url>/batch. Returns False when the request fails or the server
+    has no batch endpoint, in which case the caller should send the events
+    one at a time.
+    """
+    global _batch_unsupported
+    if _batch_unsupported:
         return False
+    body = b'[' + b','.join(events_json) + b']'
+    status = _post_body(body, server_url.rstrip('/') + '/batch')
+    if status in (404, 405, 501):
+        _batch_unsupported = True
+        print("[QueueWorker] Server has no batch endpoint, sending events individually")
+    return status == 200
 
 
 def parse_event_data(raw_data: dict) -> dict:
-    """Parse event data from Redis (strings back to proper types)."""
+    """Parse event data from Redis (one JSON document per stream entry)."""
+    if len(raw_data) == 1 and EVENT_FIELD in raw_data:
+        try:
+            return loads(raw_data[EVENT_FIELD])
+        except (JSONDecodeError, TypeError):
+            pass
+
+    # Entry queued by an older version: one string field per event key
     parsed = {}
     for key, value in raw_data.items():
         try:
             # Try to parse JSON values
-            parsed[key] = json.loads(value)
-        except (json.JSONDecodeError, TypeError):
+            parsed[key] = loads(value)
+        except (JSONDecodeError, TypeError):
             parsed[key] = value
     return parsed
 
 
-def move_to_dlq(cache, event_id: str, event_data: dict, error: str):
-    """Move failed event to dead letter queue."""
-    dlq_stream = f"{DEFAULT_STREAM}_dlq"
-    dlq_data = {
+def event_json(raw_data: dict) -> bytes:
+    """
+    Encoded JSON for a queued event.
+
+    Entries holding one JSON document are passed through as stored, without
+    decoding and re-encoding them; older per-field entries are parsed first.
+    """
+    if len(raw_data) == 1 and EVENT_FIELD in raw_data:
+        document = raw_data[EVENT_FIELD]
+        return document.encode('utf-8') if isinstance(document, str) else document
+    return dumps(parse_event_data(raw_data))
+
+
+def split_batch(batch: list) -> Iterator[Tuple[list, List[bytes]]]:
+    """
+    Split stream entries into runs whose JSON fits in MAX_BATCH_BYTES.
+
+    Yields:
+        (entries, their encoded JSON) per run; an event larger than the limit
+        gets a run of its own
+    """
+    entries, documents, size = [], [], 0
+    for entry in batch:
+        document = event_json(entry[1])
+        if entries and size + len(document) > MAX_BATCH_BYTES:
+            yield entries, documents
+            entries, documents, size = [], [], 0
+        entries.append(entry)
+        documents.append(document)
+        size += len(document) + 1  # Comma
+    if entries:
+        yield entries, documents
+
+
+def make_dlq_entry(event_id: str, event_data: dict, error: str) -> dict:
+    """
+    Build the dead letter stream entry for a failed event.
+
+    The event's stream fields are kept exactly as queued (the JSON document
+    under EVENT_FIELD is not re-encoded), with the error metadata added as
+    sibling fields.
+    """
+    return {
+        **event_data,
         'original_id': event_id,
         'error': error,
-        'failed_at': datetime.now().isoformat(),
-        **event_data
+        'failed_at': datetime.now().isoformat()
     }
-    cache.queue_event(dlq_data, stream=dlq_stream)
-    print(f"[QueueWorker] Moved to DLQ: {event_id}")
 
 
 def process_event(cache, event_id: str, event_data: dict, server_url: str) -> Tuple[bool, bool]:
@@ -141,12 +278,25 @@ def process_event(cache, event_id: str, event_data: dict, server_url: str) -> Tu
 
 def run_worker(
     consumer_id: str,
-    batch_size: int = 10,
-    server_url: str = DEFAULT_SERVER_URL
+    batch_size: Optional[int] = None,
+    server_url: str = DEFAULT_SERVER_URL,
+    use_batch_endpoint: bool = False
 ):
-    """Main worker loop."""
+    """
+    Main worker loop.
+
+    With use_batch_endpoint, each read is POSTed to <server_url>/batch as one
+    JSON array. Off by default: the server must really store the events it
+    answers 200 for, since they are ACKed on that answer alone.
+
+    batch_size defaults to DEFAULT_BATCH_SIZE_BATCHED with the batch endpoint
+    and DEFAULT_BATCH_SIZE without it.
+    """
     global shutdown_requested
 
+    if batch_size is None:
+        batch_size = DEFAULT_BATCH_SIZE_BATCHED if use_batch_endpoint else DEFAULT_BATCH_SIZE
+
     cache = get_hook_cache()
 
     if not cache.is_redis_available:
@@ -159,37 +309,71 @@ def run_worker(
         sys.exit(1)
 
     print(f"[QueueWorker] Started: consumer={consumer_id}, batch={batch_size}")
-    print(f"[QueueWorker] Server: {server_url}")
+    print(f"[QueueWorker] Server: {server_url}" + (" (batch endpoint)" if use_batch_endpoint else ""))
 
-    last_stale_check = time.time()
+    # Monotonic deadline: one clock read per loop, immune to wall-clock jumps
+    next_stale_check = time.monotonic() + STALE_CHECK_INTERVAL
     events_processed = 0
     events_failed = 0
     events_requeued = 0
 
-    def process_single_event(event_id: str, event_data: dict) -> None:
-        """Process a single event with proper ACK ordering."""
+    def process_batch(batch: list) -> None:
+        """Send a batch in as few requests as fit MAX_BATCH_BYTES each."""
+        if use_batch_endpoint and len(batch) > 1 and not _batch_unsupported:
+            for entries, documents in split_batch(batch):
+                process_entries(entries, documents)
+        else:
+            process_entries(batch, None)
+
+    def process_entries(batch: list, documents: Optional[List[bytes]]) -> None:
+        """Send entries in one request, falling back to per-event processing."""
+        nonlocal events_processed
+
+        if documents is not None and len(batch) > 1 and not shutdown_requested:
+            if send_events_batch(documents, server_url):
+                cache.ack_events([event_id for event_id, _ in batch], DEFAULT_STREAM, DEFAULT_GROUP)
+                events_processed += len(batch)
+                return
+
+        # Single event, no batch endpoint, or the batch failed: retry per event
+        acks = []
+        dead_letters = []
+        for event_id, event_data in batch:
+            if shutdown_requested:
+                break
+            process_single_event(event_id, event_data, acks, dead_letters)
+
+        # ACK the batch and write its DLQ entries in one Redis round trip
+        if cache.ack_and_queue(acks, dead_letters, DEFAULT_STREAM, DEFAULT_GROUP, DLQ_STREAM):
+            for entry in dead_letters:
+                print(f"[QueueWorker] Moved to DLQ: {entry['original_id']}")
+
+    def process_single_event(event_id: str, event_data: dict,
+                             acks: list, dead_letters: list) -> None:
+        """Process a single event, collecting its ACK and DLQ entry for the batch."""
         nonlocal events_processed, events_failed, events_requeued
 
         success, should_requeue = process_event(cache, event_id, event_data, server_url)
 
         if success:
-            cache.ack_event(event_id, DEFAULT_STREAM, DEFAULT_GROUP)
+            acks.append(event_id)
             events_processed += 1
         elif should_requeue:
             # Shutdown requested - don't ACK, event will be reprocessed
             # The event stays in pending state for another worker to pick up
             events_requeued += 1
         else:
-            # Failed after retries - ACK first, then move to DLQ
-            # This order prevents duplicate DLQ entries if DLQ write fails
-            cache.ack_event(event_id, DEFAULT_STREAM, DEFAULT_GROUP)
-            move_to_dlq(cache, event_id, event_data, "Max retries exceeded")
+            # Failed after retries - ACK, then move to DLQ (ack_and_queue
+            # keeps that order, which prevents duplicate DLQ entries)
+            acks.append(event_id)
+            dead_letters.append(make_dlq_entry(event_id, event_data, "Max retries exceeded"))
             events_failed += 1
 
     while not shutdown_requested:
         try:
             # Periodically check for stale events from crashed workers
-            if time.time() - last_stale_check > STALE_CHECK_INTERVAL:
+            now = time.monotonic()
+            if now >= next_stale_check:
                 stale_events = cache.claim_stale_events(
                     stream=DEFAULT_STREAM,
                     group=DEFAULT_GROUP,
@@ -199,11 +383,8 @@ def run_worker(
                 if stale_events:
                     print(f"[QueueWorker] Claimed {len(stale_events)} stale events, processing...")
                     # Actually process the claimed stale events
-                    for event_id, event_data in stale_events:
-                        if shutdown_requested:
-                            break
-                        process_single_event(event_id, event_data)
-                last_stale_check = time.time()
+                    process_batch(stale_events)
+                next_stale_check = now + STALE_CHECK_INTERVAL
 
             # Read new events (blocking with timeout)
             events = cache.consume_events(
@@ -217,10 +398,7 @@ def run_worker(
             if not events:
                 continue
 
-            for event_id, event_data in events:
-                if shutdown_requested:
-                    break
-                process_single_event(event_id, event_data)
+            process_batch(events)
 
         except KeyboardInterrupt:
             shutdown_requested = True
@@ -261,7 +439,7 @@ def show_status():
         print("\nNo pending events")
 
     # DLQ info
-    dlq_info = cache.get_stream_info(f"{DEFAULT_STREAM}_dlq")
+    dlq_info = cache.get_stream_info(DLQ_STREAM)
     if dlq_info:
         print(f"\nDead Letter Queue: {dlq_info['length']} events")
 
@@ -270,10 +448,14 @@ def main():
     parser = argparse.ArgumentParser(description='Event Queue Worker')
     parser.add_argument('--consumer', default=f"worker-{os.getpid()}",
                        help='Consumer ID (default: worker-PID)')
-    parser.add_argument('--batch-size', type=int, default=10,
-                       help='Batch size for reading events')
+    parser.add_argument('--batch-size', type=int, default=None,
+                       help=f'Batch size for reading events (default: {DEFAULT_BATCH_SIZE}, '
+                            f'{DEFAULT_BATCH_SIZE_BATCHED} with --batch)')
     parser.add_argument('--server-url', default=DEFAULT_SERVER_URL,
                        help='Observability server URL')
+    parser.add_argument('--batch', action='store_true',
+                       help='POST each read as one request to <server-url>/batch '
+                            '(only for servers that provide that endpoint)')
     parser.add_argument('--status', action='store_true',
                        help='Show queue status and exit')
 
@@ -290,7 +472,8 @@ def main():
     run_worker(
         consumer_id=args.consumer,
         batch_size=args.batch_size,
-        server_url=args.server_url
+        server_url=args.server_url,
+        use_batch_endpoint=args.batch
     )
 
 
@@ -1,18 +1,20 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.8"
-# dependencies = ["requests", "websockets", "python-dotenv", "redis"]
+# dependencies = ["requests", "websockets", "python-dotenv", "redis", "orjson", "urllib3", "zstandard"]
 # ///
 
 import json
 import sys
-import argparse
+import os
+from functools import lru_cache
 from pathlib import Path
+from types import SimpleNamespace
 
 # Add hooks dir to path for imports
 sys.path.insert(0, str(Path(__file__).parent))
 
-from utils.event_sender import send_event_direct
+from utils.fastjson import loads
 
 # Handler registry - lazy loading
 HANDLERS = {
@@ -27,8 +29,9 @@ HANDLERS = {
     'UserPromptSubmit': 'handlers.user_prompt_submit:UserPromptSubmitHandler',
 }
 
+@lru_cache(maxsize=None)
 def get_handler_class(event_type: str):
-    """Lazy load handler class by event type."""
+    """Lazy load handler class by event type (memoized per process)."""
     if event_type not in HANDLERS:
         raise ValueError(f"Unknown event type: {event_type}")
 
@@ -36,7 +39,23 @@ def get_handler_class(event_type: str):
     module = __import__(module_path, fromlist=[class_name])
     return getattr(module, class_name)
 
-def main():
+# Router flags: options that take a value, and boolean switches
+VALUE_FLAGS = ('--event-type', '--server-url', '--source-app')
+SWITCH_FLAGS = (
+    '--auto-project-id', '--add-chat', '--summarize', '--notify', '--load-context',
+    '--announce', '--save-stats', '--backup', '--verbose', '--name-agent', '--validate',
+)
+
+
+def _flag_dest(flag: str) -> str:
+    """Attribute name for a flag, as argparse derives it (--add-chat -> add_chat)."""
+    return flag[2:].replace('-', '_')
+
+
+def build_parser():
+    """Full argparse parser (help, abbreviations and error messages)."""
+    import argparse
+
     parser = argparse.ArgumentParser(description='Unified hooks router')
     parser.add_argument('--event-type', required=True, help='Hook event type')
     parser.add_argument('--server-url', default=None, help='Server URL for events')
@@ -53,12 +72,48 @@ def main():
     parser.add_argument('--verbose', action='store_true', help='Verbose output')
     parser.add_argument('--name-agent', action='store_true', help='Generate agent name')
     parser.add_argument('--validate', action='store_true', help='Validate prompt')
+    return parser
+
+
+def parse_args(argv):
+    """
+    Parse router flags with a plain scan over argv.
+
+    Hook commands pass a few exact flags, so building the argparse parser
+    (and importing argparse) on every invocation is wasted start-up time.
+    Anything the scan doesn't recognize - help, abbreviated or unknown flags,
+    a missing value or --event-type - is handed to argparse, which then
+    parses or rejects it exactly as before.
+    """
+    args = dict.fromkeys(map(_flag_dest, VALUE_FLAGS))
+    args.update(dict.fromkeys(map(_flag_dest, SWITCH_FLAGS), False))
+
+    remaining = iter(argv)
+    for arg in remaining:
+        flag, has_value, value = arg.partition('=')
+        if flag in VALUE_FLAGS:
+            if not has_value:
+                value = next(remaining, None)
+                if value is None or value.startswith('-'):
+                    break
+            args[_flag_dest(flag)] = value
+        elif arg in SWITCH_FLAGS:
+            args[_flag_dest(arg)] = True
+        else:
+            break
+    else:
+        if args['event_type'] is not None:
+            return SimpleNamespace(**args)
+
+    return build_parser().parse_args(argv)
+
 
-    args = parser.parse_args()
+def main():
+    args = parse_args(sys.argv[1:])
 
     # Read stdin ONCE
     try:
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.buffer.read())
     except json.JSONDecodeError as e:
         print(f"Error parsing stdin JSON: {e}", file=sys.stderr)
         sys.exit(1)
@@ -80,6 +135,8 @@ def main():
 
         # Send event if handler requests it
         if result.should_send_event:
+            from utils.event_daemon import send_via_daemon, run_detached
+
             options = {
                 'event_type': args.event_type,
                 'server_url': args.server_url,
@@ -87,9 +144,21 @@ def main():
                 'summarize': args.summarize,
                 'auto_project_id': args.auto_project_id,
                 'source_app': args.source_app,
+                'cwd': os.getcwd(),
             }
             options.update(result.send_event_options)
-            send_event_direct(input_data, options)
+
+            # Prefer the long-running sender; otherwise send in-process, from a
+            # detached background process so the hook doesn't wait on the server
+            if not send_via_daemon(input_data, options):
+                def send():
+                    # Imported only when needed: event_sender pulls in dotenv, redis and
+                    # the summarizer, which hooks that don't send never pay for
+                    from utils.event_sender import send_event_direct
+                    send_event_direct(input_data, options)
+
+                if not run_detached(send):
+                    send()
 
         sys.exit(result.exit_code)
 
@@ -5,6 +5,9 @@
 #     "anthropic",
 #     "python-dotenv",
 #     "redis",
+#     "urllib3",
+#     "orjson",
+#     "zstandard",
 # ]
 # ///
 
@@ -16,23 +19,24 @@ Features:
 - Direct HTTP POST to server (primary)
 - Redis queue fallback when server unavailable
 - WSL PowerShell fallback for Windows connectivity
+- Hands events to the long-running send_event_daemon.py when enabled
+  (CLAUDE_HOOKS_DAEMON=1)
 """
 
+import functools
 import json
 import sys
 import os
 import argparse
-import urllib.request
 import urllib.error
 import subprocess
-from datetime import datetime
-from utils.summarizer import generate_event_summary
-from utils.model_extractor import get_model_from_transcript
-from utils.dedup import is_duplicate_event, get_content_hash
-from utils.redis_cache import get_hook_cache
+import time
+from utils.event_daemon import send_via_daemon, run_detached
+from utils.fastjson import dumps, loads
 
+@functools.lru_cache(maxsize=1)
 def is_wsl():
-    """Detect if running in WSL."""
+    """Detect if running in WSL (read once per process)."""
     try:
         with open('/proc/version', 'r') as f:
             return 'microsoft' in f.read().lower()
@@ -61,19 +65,16 @@ def validate_server_url(url: str) -> bool:
     except Exception:
         return False
 
-def escape_json_for_powershell(json_str: str) -> str:
-    """
-    Escape JSON string for safe embedding in PowerShell here-string.
-    Replaces characters that could break out of here-string.
-    """
-    # Here-strings in PowerShell end with '@ on a new line
-    # We need to escape any '@ patterns and control characters
-    escaped = json_str.replace("'@", "'`@")  # Escape here-string terminator
-    return escaped
+# Reads the request body (raw UTF-8 bytes) from stdin and POSTs it to $env:HOOK_URL
+POWERSHELL_POST_SCRIPT = (
+    "$body = New-Object IO.MemoryStream; "
+    "[Console]::OpenStandardInput().CopyTo($body); "
+    "Invoke-RestMethod -Method Post -Uri $env:HOOK_URL -ContentType 'application/json' -Body $body.ToArray()"
+)
 
-def send_via_powershell(event_data, server_url):
+def send_via_powershell(json_body, server_url):
     """
-    Send event using PowerShell (for WSL-to-Windows connectivity).
+    Send an encoded event using PowerShell (for WSL-to-Windows connectivity).
 
     Security: Only allows localhost URLs to prevent command injection.
     """
@@ -83,33 +84,27 @@ def send_via_powershell(event_data, server_url):
         return False
 
     try:
-        import base64
-        json_body = json.dumps(event_data)
-
-        # SECURITY: Escape JSON for PowerShell here-string
-        escaped_json = escape_json_for_powershell(json_body)
-
-        # SECURITY: URL already validated as localhost
-        ps_script = f"""
-$body = @'
-{escaped_json}
-'@
-Invoke-RestMethod -Method Post -Uri '{server_url}' -ContentType 'application/json' -Body $body
-"""
-        encoded = base64.b64encode(ps_script.encode('utf-16-le')).decode('ascii')
-        cmd = ['powershell.exe', '-EncodedCommand', encoded]
-        result = subprocess.run(cmd, capture_output=True, timeout=10)
+        # The body goes in on stdin and the URL in an environment variable, so
+        # neither is ever part of the PowerShell command line (WSLENV carries
+        # HOOK_URL across to the Windows process)
+        env = dict(os.environ, HOOK_URL=server_url)
+        env['WSLENV'] = f"{env['WSLENV']}:HOOK_URL" if env.get('WSLENV') else 'HOOK_URL'
+        # -NoProfile: don't load the user's profile scripts on every event
+        cmd = ['powershell.exe', '-NoProfile', '-NonInteractive', '-Command', POWERSHELL_POST_SCRIPT]
+        result = subprocess.run(cmd, input=json_body, env=env, capture_output=True, timeout=10)
         return result.returncode == 0
     except Exception as e:
         print(f"PowerShell fallback failed: {e}", file=sys.stderr)
         return False
 
-def queue_event_fallback(event_data) -> bool:
-    """Queue event to Redis as fallback when server is unavailable."""
+def queue_event_fallback(event_data, json_body=None) -> bool:
+    """Queue event to Redis as fallback when server is unavailable (reusing json_body if already encoded)."""
+    from utils.redis_cache import get_hook_cache
+
     try:
         cache = get_hook_cache()
         if cache.is_redis_available:
-            if cache.queue_event(event_data):
+            if cache.queue_event(event_data, encoded=json_body):
                 print("[Hook] Event queued to Redis (server unavailable)", file=sys.stderr)
                 return True
     except Exception as e:
@@ -129,45 +124,68 @@ def send_event_to_server(event_data, server_url='https://ai.di4.dev/events', use
     Returns:
         True if sent successfully (or queued as fallback)
     """
+    from utils.http_pool import post
+
+    json_body = None
     try:
-        # Prepare the request
-        req = urllib.request.Request(
+        # Encoded once: the PowerShell and queue fallbacks reuse the same bytes
+        json_body = dumps(event_data)
+
+        # Send the request (over the process-wide keep-alive connection pool)
+        status = post(
             server_url,
-            data=json.dumps(event_data).encode('utf-8'),
+            json_body,
             headers={
                 'Content-Type': 'application/json',
                 'User-Agent': 'Claude-Code-Hook/1.0'
-            }
+            },
+            timeout=5
         )
-
-        # Send the request
-        with urllib.request.urlopen(req, timeout=5) as response:
-            if response.status == 200:
-                return True
-            else:
-                print(f"Server returned status: {response.status}", file=sys.stderr)
-                if use_queue_fallback:
-                    return queue_event_fallback(event_data)
-                return False
+        if status == 200:
+            return True
+        else:
+            print(f"Server returned status: {status}", file=sys.stderr)
+            if use_queue_fallback:
+                return queue_event_fallback(event_data, json_body)
+            return False
 
     except urllib.error.URLError as e:
         # WSL-to-Windows fallback: use PowerShell if urllib fails
         if is_wsl():
-            if send_via_powershell(event_data, server_url):
+            if send_via_powershell(json_body, server_url):
                 return True
 
         # Queue fallback when server is unavailable
         if use_queue_fallback:
-            return queue_event_fallback(event_data)
+            return queue_event_fallback(event_data, json_body)
 
         print(f"Failed to send event: {e}", file=sys.stderr)
         return False
     except Exception as e:
         print(f"Unexpected error: {e}", file=sys.stderr)
         if use_queue_fallback:
-            return queue_event_fallback(event_data)
+            return queue_event_fallback(event_data, json_body)
         return False
 
+@functools.lru_cache(maxsize=1)
+def _load_project_id_module():
+    """
+    Load lib/get_project_id.py once per process (None if it's missing).
+
+    Keeping the module alive also keeps its in-process project ID memo.
+    """
+    script_dir = os.path.dirname(os.path.abspath(__file__))
+    lib_path = os.path.join(script_dir, 'lib', 'get_project_id.py')
+    if not os.path.exists(lib_path):
+        return None
+
+    import importlib.util
+    spec = importlib.util.spec_from_file_location("get_project_id", lib_path)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
 def get_auto_project_id(cwd: str = None) -> str:
     """
     Auto-detect project ID using hybrid approach.
@@ -175,17 +193,16 @@ def get_auto_project_id(cwd: str = None) -> str:
     """
     if cwd is None:
         cwd = os.getcwd()
+    return _auto_project_id(cwd)
+
 
+@functools.lru_cache(maxsize=32)
+def _auto_project_id(cwd: str) -> str:
+    """get_auto_project_id() for an explicit cwd, memoized per process."""
     try:
         # Try to import from lib directory
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        lib_path = os.path.join(script_dir, 'lib', 'get_project_id.py')
-
-        if os.path.exists(lib_path):
-            import importlib.util
-            spec = importlib.util.spec_from_file_location("get_project_id", lib_path)
-            module = importlib.util.module_from_spec(spec)
-            spec.loader.exec_module(module)
+        module = _load_project_id_module()
+        if module is not None:
             return module.get_project_id(cwd)
     except Exception:
         pass
@@ -213,30 +230,17 @@ def get_auto_project_id(cwd: str = None) -> str:
 
     # Fallback to directory hash
     abs_path = Path(cwd).resolve()
-    path_hash = hashlib.sha256(str(abs_path).encode()).hexdigest()[:12]
+    path_hash = hashlib.blake2b(str(abs_path).encode(), digest_size=6).hexdigest()
     dir_name = "".join(c if c.isalnum() or c in "-_" else "-" for c in abs_path.name)[:30]
     return f"local:{dir_name}-{path_hash}"
 
 
-def main():
-    # Parse command line arguments
-    parser = argparse.ArgumentParser(description='Send Claude Code hook events to observability server')
-    source_group = parser.add_mutually_exclusive_group(required=True)
-    source_group.add_argument('--source-app', help='Source application name (explicit)')
-    source_group.add_argument('--auto-project-id', action='store_true', help='Auto-detect project ID from git/directory')
-    parser.add_argument('--event-type', required=True, help='Hook event type (PreToolUse, PostToolUse, etc.)')
-    parser.add_argument('--server-url', default='https://ai.di4.dev/events', help='Server URL')
-    parser.add_argument('--add-chat', action='store_true', help='Include chat transcript if available')
-    parser.add_argument('--summarize', action='store_true', help='Generate AI summary of the event')
-
-    args = parser.parse_args()
-
-    try:
-        # Read hook data from stdin
-        input_data = json.load(sys.stdin)
-    except json.JSONDecodeError as e:
-        print(f"Failed to parse JSON input: {e}", file=sys.stderr)
-        sys.exit(1)
+def process_event(args, input_data):
+    """Build the event from hook input and send it to the server."""
+    from utils.summarizer import generate_event_summary
+    from utils.model_extractor import get_model_from_transcript
+    from utils.dedup import is_duplicate_event, get_content_hash
+    from utils.transcript_cache import read_transcript
 
     # Check for duplicate events
     session_id = input_data.get('session_id', 'unknown')
@@ -244,7 +248,7 @@ def main():
 
     if is_duplicate_event(args.event_type, session_id, content_hash):
         # Skip duplicate event
-        sys.exit(0)
+        return
 
     # Extract model name from transcript (with caching)
     transcript_path = input_data.get('transcript_path', '')
@@ -265,7 +269,7 @@ def main():
         'session_id': session_id,
         'hook_event_type': args.event_type,
         'payload': input_data,
-        'timestamp': int(datetime.now().timestamp() * 1000),
+        'timestamp': time.time_ns() // 1_000_000,
         'model_name': model_name
     }
     
@@ -273,20 +277,10 @@ def main():
     if args.add_chat and 'transcript_path' in input_data:
         transcript_path = input_data['transcript_path']
         if os.path.exists(transcript_path):
-            # Read .jsonl file and convert to JSON array
-            chat_data = []
+            # Read .jsonl file as a JSON array (only lines added since
+            # this process last read it are parsed)
             try:
-                with open(transcript_path, 'r') as f:
-                    for line in f:
-                        line = line.strip()
-                        if line:
-                            try:
-                                chat_data.append(json.loads(line))
-                            except json.JSONDecodeError:
-                                pass  # Skip invalid lines
-                
-                # Add chat to event data
-                event_data['chat'] = chat_data
+                event_data['chat'] = read_transcript(transcript_path)
             except Exception as e:
                 print(f"Failed to read transcript: {e}", file=sys.stderr)
     
@@ -298,10 +292,49 @@ def main():
         # Continue even if summary generation fails
     
     # Send to server
-    success = send_event_to_server(event_data, args.server_url)
-    
+    send_event_to_server(event_data, args.server_url)
+
+
+def main():
+    # Parse command line arguments
+    parser = argparse.ArgumentParser(description='Send Claude Code hook events to observability server')
+    source_group = parser.add_mutually_exclusive_group(required=True)
+    source_group.add_argument('--source-app', help='Source application name (explicit)')
+    source_group.add_argument('--auto-project-id', action='store_true', help='Auto-detect project ID from git/directory')
+    parser.add_argument('--event-type', required=True, help='Hook event type (PreToolUse, PostToolUse, etc.)')
+    parser.add_argument('--server-url', default='https://ai.di4.dev/events', help='Server URL')
+    parser.add_argument('--add-chat', action='store_true', help='Include chat transcript if available')
+    parser.add_argument('--summarize', action='store_true', help='Generate AI summary of the event')
+
+    args = parser.parse_args()
+
+    try:
+        # Read hook data from stdin
+        input_data = loads(sys.stdin.buffer.read())
+    except json.JSONDecodeError as e:
+        print(f"Failed to parse JSON input: {e}", file=sys.stderr)
+        sys.exit(1)
+
+    # Hand the event to the daemon, which has everything below already loaded
+    options = {
+        'event_type': args.event_type,
+        'server_url': args.server_url,
+        'add_chat': args.add_chat,
+        'summarize': args.summarize,
+        'auto_project_id': args.auto_project_id,
+        'source_app': args.source_app,
+        'cwd': os.getcwd(),
+    }
+    if send_via_daemon(input_data, options):
+        sys.exit(0)
+
+    # No daemon running: send in-process, from a detached background process
+    # so the hook returns without waiting on summaries or the server
+    if not run_detached(lambda: process_event(args, input_data)):
+        process_event(args, input_data)
+
     # Always exit with 0 to not block Claude Code operations
     sys.exit(0)
 
 if __name__ == '__main__':
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,149 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# dependencies = [
+#     "anthropic",
+#     "python-dotenv",
+#     "redis",
+#     "urllib3",
+#     "orjson",
+#     "zstandard",
+# ]
+# ///
+
+"""
+Event Sender Daemon for Claude Code Hooks.
+Sends hook events handed over by send_event.py and router.py, so each event
+costs a Unix socket write instead of an interpreter start plus imports.
+
+Features:
+- Summarizer, model extractor, Redis client and HTTP connection pool are
+  loaded once and reused for every event
+- On WSL, one persistent PowerShell process for the Windows send fallback
+- Same sending path as in-process hooks (send_event_direct)
+- Started automatically by the first hook that finds no daemon running
+- Exits after IDLE_TIMEOUT_SECONDS without events
+
+Protocol (see utils/event_daemon.py): the client writes one JSON object
+{"input_data": ..., "options": ...} and shuts down its write side; the
+daemon replies with b'1' as soon as it has parsed the event, then sends it.
+
+Usage:
+    uv run send_event_daemon.py [SOCKET_PATH]
+"""
+
+import sys
+import os
+import socket
+import socketserver
+
+# Add utils to path
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from utils.event_daemon import SOCKET_PATH, ensure_private_dir
+from utils.fastjson import loads
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not available on Windows
+
+# Exit after this long without events (new hooks start a fresh daemon)
+IDLE_TIMEOUT_SECONDS = 600
+
+
+class EventHandler(socketserver.StreamRequestHandler):
+    """Handle one event per connection."""
+
+    def handle(self):
+        from utils.event_sender import send_event_direct
+
+        try:
+            request = loads(self.rfile.read())
+            input_data, options = request['input_data'], request['options']
+        except Exception as e:
+            print(f"[EventDaemon] Invalid request: {e}", file=sys.stderr)
+            return  # Closing without a reply makes the client send it itself
+
+        # Acknowledge before sending: the hook returns while the POST (and any
+        # summary) happens here
+        try:
+            self.wfile.write(b'1')
+            self.connection.shutdown(socket.SHUT_WR)
+        except OSError:
+            pass  # Client gave up waiting; send anyway
+
+        try:
+            send_event_direct(input_data, options)
+        except Exception as e:
+            print(f"[EventDaemon] Failed to send event: {e}", file=sys.stderr)
+
+
+class EventServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix socket server that notices when it has gone idle."""
+
+    # handle_request() gives up after this long without a connection
+    timeout = IDLE_TIMEOUT_SECONDS
+    idle = False
+
+    def handle_timeout(self):
+        self.idle = True
+
+
+def main():
+    # start_daemon() passes the path it connects to (keyed on its environment)
+    socket_path = sys.argv[1] if len(sys.argv) > 1 else SOCKET_PATH
+    if not socket_path or fcntl is None:
+        print("[EventDaemon] Unix sockets are not supported on this platform", file=sys.stderr)
+        sys.exit(1)
+
+    # Socket and lock only in a directory no other user can write to
+    if not ensure_private_dir(os.path.dirname(socket_path)):
+        print(f"[EventDaemon] {os.path.dirname(socket_path)} is not a private directory", file=sys.stderr)
+        sys.exit(1)
+
+    # Only one daemon per socket: the lock is held until this process exits
+    lock_fd = os.open(socket_path + '.lock', os.O_WRONLY | os.O_CREAT, 0o600)
+    try:
+        fcntl.flock(lock_fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+    except OSError:
+        sys.exit(0)  # Another daemon is already running
+
+    # Load everything the sending path needs before accepting events
+    from utils.event_sender import is_wsl
+    from utils.powershell_worker import enable_powershell_worker, stop_powershell_worker
+    if is_wsl():
+        enable_powershell_worker()
+
+    # Remove a socket left behind by a daemon that was killed
+    try:
+        os.unlink(socket_path)
+    except FileNotFoundError:
+        pass
+
+    # Socket accessible to this user only
+    old_umask = os.umask(0o177)
+    try:
+        server = EventServer(socket_path, EventHandler)
+    finally:
+        os.umask(old_umask)
+
+    print(f"[EventDaemon] Listening on {socket_path}", file=sys.stderr)
+    try:
+        while not server.idle:
+            server.handle_request()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        # Unlink first so new hooks stop connecting, then wait for in-flight events
+        try:
+            os.unlink(socket_path)
+        except OSError:
+            pass
+        server.server_close()
+        stop_powershell_worker()
+        os.close(lock_fd)
+
+
+if __name__ == '__main__':
+    main()
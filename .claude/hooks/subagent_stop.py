@@ -3,6 +3,7 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
@@ -13,7 +14,11 @@ import sys
 import subprocess
 from pathlib import Path
 from datetime import datetime
+from lib.fs_cache import dir_entries
 from utils.constants import ensure_session_log_dir
+from utils.jsonl_log import append_jsonl, jsonl_to_json_array
+from utils.tts import speak_detached
+from utils.fastjson import loads
 
 try:
     from dotenv import load_dotenv
@@ -23,33 +28,34 @@ except ImportError:
     pass  # dotenv is optional
 
 
+# TTS scripts that exist, by provider - checked once at import, not per event
+_TTS_DIR = Path(__file__).resolve().parent / "utils" / "tts"
+_TTS_AVAILABLE = {
+    name: str(path)
+    for name, path in (
+        ("elevenlabs", _TTS_DIR / "elevenlabs_tts.py"),
+        ("openai", _TTS_DIR / "openai_tts.py"),
+        ("pyttsx3", _TTS_DIR / "pyttsx3_tts.py"),
+    )
+    if path.name in dir_entries(_TTS_DIR)  # One scandir for all three
+}
+
+
 def get_tts_script_path():
     """
     Determine which TTS script to use based on available API keys.
     Priority order: ElevenLabs > OpenAI > pyttsx3
     """
-    # Get current script directory and construct utils/tts path
-    script_dir = Path(__file__).parent
-    tts_dir = script_dir / "utils" / "tts"
-
     # Check for ElevenLabs API key (highest priority)
-    if os.getenv("ELEVENLABS_API_KEY"):
-        elevenlabs_script = tts_dir / "elevenlabs_tts.py"
-        if elevenlabs_script.exists():
-            return str(elevenlabs_script)
+    if os.getenv("ELEVENLABS_API_KEY") and "elevenlabs" in _TTS_AVAILABLE:
+        return _TTS_AVAILABLE["elevenlabs"]
 
     # Check for OpenAI API key (second priority)
-    if os.getenv("OPENAI_API_KEY"):
-        openai_script = tts_dir / "openai_tts.py"
-        if openai_script.exists():
-            return str(openai_script)
+    if os.getenv("OPENAI_API_KEY") and "openai" in _TTS_AVAILABLE:
+        return _TTS_AVAILABLE["openai"]
 
     # Fall back to pyttsx3 (no API key required)
-    pyttsx3_script = tts_dir / "pyttsx3_tts.py"
-    if pyttsx3_script.exists():
-        return str(pyttsx3_script)
-
-    return None
+    return _TTS_AVAILABLE.get("pyttsx3")
 
 
 def announce_subagent_completion():
@@ -62,12 +68,8 @@ def announce_subagent_completion():
         # Use fixed message for subagent completion
         completion_message = "Subagent Complete"
 
-        # Call the TTS script with the completion message
-        subprocess.run(
-            ["uv", "run", tts_script, completion_message],
-            capture_output=True,  # Suppress output
-            timeout=10,  # 10-second timeout
-        )
+        # Fire-and-forget: speak from a detached process, without waiting for playback
+        speak_detached(tts_script, completion_message)
 
     except (subprocess.TimeoutExpired, subprocess.SubprocessError, FileNotFoundError):
         # Fail silently if TTS encounters issues
@@ -90,7 +92,7 @@ def main():
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = loads(sys.stdin.buffer.read())
 
         # Extract required fields
         session_id = input_data.get("session_id", "")
@@ -98,45 +100,20 @@ def main():
 
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_path = log_dir / "subagent_stop.json"
-
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, "r") as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-
-        # Append new data
-        log_data.append(input_data)
+        log_path = log_dir / "subagent_stop.jsonl"
 
-        # Write back to file with formatting
-        with open(log_path, "w") as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_path, input_data)
 
         # Handle --chat switch (same as stop.py)
         if args.chat and "transcript_path" in input_data:
             transcript_path = input_data["transcript_path"]
             if os.path.exists(transcript_path):
-                # Read .jsonl file and convert to JSON array
-                chat_data = []
+                # Stream the .jsonl transcript into logs/chat.json as a JSON array
+                # (entry by entry - the transcript is never held in memory)
                 try:
-                    with open(transcript_path, "r") as f:
-                        for line in f:
-                            line = line.strip()
-                            if line:
-                                try:
-                                    chat_data.append(json.loads(line))
-                                except json.JSONDecodeError:
-                                    pass  # Skip invalid lines
-
-                    # Write to logs/chat.json
                     chat_file = os.path.join(log_dir, "chat.json")
-                    with open(chat_file, "w") as f:
-                        json.dump(chat_data, f, indent=2)
+                    jsonl_to_json_array(transcript_path, chat_file)
                 except Exception:
                     pass  # Fail silently
 
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""Tests for utils.env_cache.load_dotenv_cached."""
+import os
+
+import pytest
+
+from utils import env_cache
+from utils.env_cache import _find_env_file, load_dotenv_cached
+
+
+@pytest.fixture(autouse=True)
+def fresh(monkeypatch):
+    monkeypatch.setattr(env_cache, '_loaded', set())
+    monkeypatch.delenv('ENV_CACHE_TEST', raising=False)
+    monkeypatch.delenv('ENV_CACHE_REF', raising=False)
+
+
+def test_find_walks_up_from_start(tmp_path):
+    (tmp_path / '.env').write_text('A=1\n')
+    nested = tmp_path / 'a' / 'b'
+    nested.mkdir(parents=True)
+    assert _find_env_file(nested) == tmp_path / '.env'
+
+    (tmp_path / 'a' / '.env').write_text('A=2\n')
+    assert _find_env_file(nested) == tmp_path / 'a' / '.env'
+
+
+def test_default_is_relative_to_caller_not_cwd(tmp_path, monkeypatch):
+    pytest.importorskip('dotenv')
+    project = tmp_path / 'project'
+    hooks = project / '.claude' / 'hooks'
+    hooks.mkdir(parents=True)
+    (project / '.env').write_text('ENV_CACHE_TEST=from-project\n')
+    caller = hooks / 'caller.py'
+    caller.write_text('from utils.env_cache import load_dotenv_cached\nloaded = load_dotenv_cached()\n')
+
+    monkeypatch.chdir(tmp_path)  # No .env here
+    namespace = {}
+    exec(compile(caller.read_text(), str(caller), 'exec'), namespace)
+
+    assert namespace['loaded']
+    assert os.environ['ENV_CACHE_TEST'] == 'from-project'
+
+
+def test_explicit_path_and_interpolation(tmp_path, monkeypatch):
+    pytest.importorskip('dotenv')
+    env_file = tmp_path / '.env'
+    env_file.write_text('ENV_CACHE_TEST=${ENV_CACHE_REF}-x\n')
+    monkeypatch.setenv('ENV_CACHE_REF', 'live')
+
+    assert load_dotenv_cached(str(env_file))
+    assert os.environ['ENV_CACHE_TEST'] == 'live-x'
+
+
+def test_existing_values_kept_unless_override(tmp_path, monkeypatch):
+    pytest.importorskip('dotenv')
+    env_file = tmp_path / '.env'
+    env_file.write_text('ENV_CACHE_TEST=from-file\n')
+    monkeypatch.setenv('ENV_CACHE_TEST', 'from-env')
+
+    load_dotenv_cached(str(env_file))
+    assert os.environ['ENV_CACHE_TEST'] == 'from-env'
+
+    env_cache._loaded.clear()
+    load_dotenv_cached(str(env_file), override=True)
+    assert os.environ['ENV_CACHE_TEST'] == 'from-file'
+
+
+def test_missing_file(tmp_path):
+    assert not load_dotenv_cached(str(tmp_path / '.env'))
+
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""Tests for the event daemon client (utils.event_daemon) and server."""
+import os
+import socket
+import stat
+import sys
+import threading
+import types
+
+import pytest
+
+from utils import event_daemon
+
+pytestmark = pytest.mark.skipif(not hasattr(socket, 'AF_UNIX'), reason='Unix sockets only')
+
+
+def test_config_key_follows_sending_settings(monkeypatch):
+    monkeypatch.setenv('OBSERVABILITY_SERVER_URL', 'http://localhost:4000/events')
+    key = event_daemon._config_key()
+    assert event_daemon._config_key() == key
+
+    monkeypatch.setenv('OBSERVABILITY_SERVER_URL', 'http://localhost:4001/events')
+    assert event_daemon._config_key() != key
+
+    monkeypatch.setenv('OBSERVABILITY_SERVER_URL', 'http://localhost:4000/events')
+    monkeypatch.setenv('ANTHROPIC_API_KEY', 'other-key')
+    assert event_daemon._config_key() != key
+
+
+def test_config_key_ignores_unrelated_environment(monkeypatch):
+    key = event_daemon._config_key()
+    monkeypatch.setenv('SOME_UNRELATED_VARIABLE', '1')
+    assert event_daemon._config_key() == key
+
+
+def test_socket_in_per_user_directory(monkeypatch, tmp_path):
+    monkeypatch.setenv('XDG_RUNTIME_DIR', str(tmp_path))
+    socket_dir = event_daemon._socket_dir()
+    assert socket_dir == tmp_path / f'claude-hooks-{os.getuid()}'
+
+    monkeypatch.setattr(event_daemon, 'SOCKET_DIR', socket_dir)
+    assert event_daemon._socket_path() == str(socket_dir / f'{event_daemon._config_key()}.sock')
+
+
+def test_ensure_private_dir(tmp_path):
+    path = tmp_path / 'private'
+    assert event_daemon.ensure_private_dir(path)
+    assert stat.S_IMODE(os.lstat(path).st_mode) == 0o700
+    assert event_daemon.ensure_private_dir(path)  # Existing is fine
+
+
+def test_shared_directory_is_rejected(tmp_path):
+    path = tmp_path / 'shared'
+    path.mkdir(mode=0o777)
+    os.chmod(path, 0o777)
+    assert not event_daemon.private_dir_ok(path)
+    assert not event_daemon.ensure_private_dir(path)
+
+    link = tmp_path / 'link'
+    link.symlink_to(tmp_path / 'elsewhere', target_is_directory=True)
+    (tmp_path / 'elsewhere').mkdir(mode=0o700)
+    assert not event_daemon.ensure_private_dir(link)
+
+
+def test_untrusted_directory_is_never_connected(monkeypatch, tmp_path):
+    socket_dir = tmp_path / 'shared'
+    socket_dir.mkdir()
+    os.chmod(socket_dir, 0o777)
+    started = []
+    monkeypatch.setattr(event_daemon, 'DAEMON_ENABLED', True)
+    monkeypatch.setattr(event_daemon, 'SOCKET_DIR', socket_dir)
+    monkeypatch.setattr(event_daemon, 'SOCKET_PATH', str(socket_dir / 'd.sock'))
+    monkeypatch.setattr(event_daemon, 'start_daemon', lambda: started.append(True))
+    monkeypatch.setattr(event_daemon.socket, 'socket', lambda *a: pytest.fail('connected'))
+
+    assert not event_daemon.send_via_daemon({'a': 1}, {'event_type': 'Stop'})
+
+
+def test_no_daemon_starts_one(monkeypatch, tmp_path):
+    started = []
+    monkeypatch.setattr(event_daemon, 'DAEMON_ENABLED', True)
+    monkeypatch.setattr(event_daemon, 'SOCKET_DIR', tmp_path)
+    monkeypatch.setattr(event_daemon, 'SOCKET_PATH', str(tmp_path / 'none.sock'))
+    monkeypatch.setattr(event_daemon, 'start_daemon', lambda: started.append(True))
+
+    assert not event_daemon.send_via_daemon({'a': 1}, {'event_type': 'Stop'})
+    assert started == [True]
+
+
+def test_disabled(monkeypatch):
+    monkeypatch.setattr(event_daemon, 'DAEMON_ENABLED', False)
+    monkeypatch.setattr(event_daemon, 'start_daemon', lambda: pytest.fail('started a daemon'))
+    assert not event_daemon.send_via_daemon({'a': 1}, {'event_type': 'Stop'})
+
+
+@pytest.fixture
+def daemon(monkeypatch, tmp_path):
+    """A daemon server on a temporary socket, sending into a list."""
+    import send_event_daemon
+
+    sent = []
+    done = threading.Event()
+
+    def send_event_direct(input_data, options):
+        sent.append((input_data, options))
+        done.set()
+
+    # The handler imports the sender lazily; give it a recording one
+    fake_sender = types.ModuleType('utils.event_sender')
+    fake_sender.send_event_direct = send_event_direct
+    monkeypatch.setitem(sys.modules, 'utils.event_sender', fake_sender)
+
+    os.chmod(tmp_path, 0o700)
+    path = str(tmp_path / 'd.sock')
+    server = send_event_daemon.EventServer(path, send_event_daemon.EventHandler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    monkeypatch.setattr(event_daemon, 'DAEMON_ENABLED', True)
+    monkeypatch.setattr(event_daemon, 'SOCKET_DIR', tmp_path)
+    monkeypatch.setattr(event_daemon, 'SOCKET_PATH', path)
+    monkeypatch.setattr(event_daemon, 'start_daemon', lambda: pytest.fail('started a daemon'))
+    yield sent, done, path
+    server.shutdown()
+    server.server_close()
+
+
+def test_event_round_trip(daemon):
+    sent, done, _ = daemon
+    options = {'event_type': 'Stop', 'source_app': 'demo', 'server_url': None}
+
+    assert event_daemon.send_via_daemon({'session_id': 's', 'text': 'héllo'}, options)
+    assert done.wait(5)
+    assert sent == [({'session_id': 's', 'text': 'héllo'}, options)]
+
+
+def test_invalid_request_is_not_acknowledged(daemon, capsys):
+    sent, done, path = daemon
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(5)
+        sock.connect(path)
+        sock.sendall(b'{"input_data": {}}')  # No options
+        sock.shutdown(socket.SHUT_WR)
+        assert sock.recv(1) == b''  # Closed without the b'1' ack
+    assert sent == []
@@ -0,0 +1,102 @@
+#!/usr/bin/env python3
+"""Tests for lib.git_cache."""
+import shutil
+import subprocess
+
+import pytest
+
+from lib import git_cache
+from lib.git_cache import find_git_dir, get_cached
+
+pytestmark = pytest.mark.skipif(shutil.which('git') is None, reason='git not installed')
+
+
+def git(cwd, *args):
+    subprocess.run(
+        ['git', '-c', 'user.name=test', '-c', 'user.email=test@example.com', *args],
+        cwd=cwd, check=True, capture_output=True
+    )
+
+
+@pytest.fixture
+def repo(tmp_path, monkeypatch):
+    monkeypatch.setattr(git_cache, 'CACHE_DIR', tmp_path / 'cache')
+    root = tmp_path / 'repo'
+    (root / 'sub').mkdir(parents=True)
+    git(root, 'init', '-q')
+    (root / 'tracked.txt').write_text('one\n')
+    git(root, 'add', 'tracked.txt')
+    git(root, 'commit', '-q', '-m', 'initial')
+    return root
+
+
+class Producer:
+    def __init__(self, func=lambda: 'value'):
+        self.calls = 0
+        self.func = func
+
+    def __call__(self):
+        self.calls += 1
+        return self.func()
+
+
+def test_find_git_dir(repo, tmp_path):
+    assert find_git_dir(str(repo / 'sub')) == repo / '.git'
+    assert find_git_dir(str(tmp_path)) is None
+
+
+def test_nothing_written_to_working_tree(repo):
+    get_cached('k', str(repo), Producer())
+    get_cached('k', str(repo / 'sub'), Producer())
+
+    status = subprocess.run(['git', 'status', '--porcelain', '--ignored'],
+                            cwd=repo, capture_output=True, text=True).stdout
+    assert status == ''
+    assert len(list((git_cache.CACHE_DIR).iterdir())) == 1
+
+
+def test_reused_until_git_state_changes(repo):
+    producer = Producer()
+    assert get_cached('k', str(repo), producer) == 'value'
+    assert get_cached('k', str(repo), producer) == 'value'
+    assert producer.calls == 1
+
+    git(repo, 'checkout', '-q', '-b', 'feature')  # Rewrites HEAD
+    get_cached('k', str(repo), producer)
+    assert producer.calls == 2
+
+
+def test_hit_after_git_status_rewrites_index(repo):
+    # git status refreshes the index (rewriting it) while the producer runs
+    (repo / 'tracked.txt').write_text('two\n')
+    producer = Producer(lambda: subprocess.run(
+        ['git', 'status', '--porcelain'], cwd=repo, capture_output=True, text=True
+    ).stdout)
+
+    first = get_cached('git_status', str(repo), producer)
+    assert get_cached('git_status', str(repo), producer) == first
+    assert producer.calls == 1
+
+
+def test_values_are_per_directory(repo):
+    assert get_cached('k', str(repo), lambda: 'root') == 'root'
+    assert get_cached('k', str(repo / 'sub'), lambda: 'sub') == 'sub'
+    assert get_cached('k', str(repo), lambda: 'changed') == 'root'
+
+
+def test_ttl(repo, monkeypatch):
+    producer = Producer()
+    get_cached('k', str(repo), producer, ttl=10)
+    now = git_cache.time.time()
+    monkeypatch.setattr(git_cache.time, 'time', lambda: now + 11)
+    get_cached('k', str(repo), producer, ttl=10)
+    assert producer.calls == 2
+
+
+def test_outside_repository_is_not_cached(tmp_path, monkeypatch):
+    monkeypatch.setattr(git_cache, 'CACHE_DIR', tmp_path / 'cache')
+    producer = Producer()
+    get_cached('k', str(tmp_path), producer)
+    get_cached('k', str(tmp_path), producer)
+    assert producer.calls == 2
+    assert not (tmp_path / 'cache').exists()
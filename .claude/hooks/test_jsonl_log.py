@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""Tests for utils.jsonl_log: append, rotate and read round-trip."""
+import os
+
+import pytest
+
+from utils import jsonl_log
+from utils.jsonl_log import append_jsonl, count_lines, read_jsonl, session_file_id
+
+
+def test_append_read_round_trip(tmp_path):
+    log = tmp_path / 'events.jsonl'
+    entries = [{'n': 1}, {'text': 'héllo ☃'}, {'nested': {'a': [1, 2]}}]
+    for entry in entries:
+        append_jsonl(log, entry)
+
+    assert list(read_jsonl(log)) == entries
+
+
+def test_large_entry_is_written_whole(tmp_path):
+    log = tmp_path / 'big.jsonl'
+    entry = {'blob': 'x' * (jsonl_log.UNLOCKED_WRITE_MAX * 4)}
+    append_jsonl(log, {'n': 1})
+    append_jsonl(log, entry)
+
+    assert list(read_jsonl(log)) == [{'n': 1}, entry]
+
+
+def test_read_skips_partial_and_blank_lines(tmp_path):
+    log = tmp_path / 'partial.jsonl'
+    log.write_bytes(b'{"n":1}\n\n{"n":\n{"n":2}\n')
+
+    assert list(read_jsonl(log)) == [{'n': 1}, {'n': 2}]
+
+
+def test_read_missing_file(tmp_path):
+    assert list(read_jsonl(tmp_path / 'missing.jsonl')) == []
+
+
+def test_rotates_when_full(tmp_path, monkeypatch):
+    monkeypatch.setattr(jsonl_log, 'MAX_LOG_BYTES', 100)
+    log = tmp_path / 'events.jsonl'
+    for n in range(10):
+        append_jsonl(log, {'n': n, 'pad': 'x' * 20})
+
+    rotated = sorted(p for p in tmp_path.iterdir() if p != log)
+    assert rotated and all(p.name.startswith('events.') and p.suffix == '.jsonl' for p in rotated)
+
+    # Every entry ends up in exactly one file, none over the limit by more than a line
+    entries = [e['n'] for p in rotated + [log] if p.exists() for e in read_jsonl(p)]
+    assert sorted(entries) == list(range(10))
+    assert all(os.path.getsize(p) <= 100 + 40 for p in rotated)
+
+
+def test_count_lines(tmp_path):
+    path = tmp_path / 'transcript.jsonl'
+    path.write_bytes(b'{"n":1}\n' * 3 + b'{"n":4}')  # Last line unterminated
+    assert count_lines(path) == 4
+
+    path.write_bytes(b'')
+    assert count_lines(path) == 0
+    assert count_lines(tmp_path / 'missing.jsonl') == 0
+
+
+@pytest.mark.parametrize('session_id', ['abc-123', 'A_b', '0' * 128])
+def test_session_file_id_keeps_safe_ids(session_id):
+    assert session_file_id(session_id) == session_id
+
+
+@pytest.mark.parametrize('session_id', ['../x', 'a/b', '..', '', 'a b', '0' * 129])
+def test_session_file_id_hashes_other_ids(session_id):
+    file_id = session_file_id(session_id)
+    assert file_id.startswith('id-')
+    assert '/' not in file_id and '.' not in file_id
+    assert file_id != session_file_id(session_id + 'x')
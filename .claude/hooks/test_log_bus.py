@@ -0,0 +1,60 @@
+#!/usr/bin/env python3
+"""Tests for utils.log_bus: the writer's batching and rotation handling."""
+import socket
+
+import pytest
+
+from utils import log_bus
+from utils.jsonl_log import read_jsonl, rotate_log
+
+
+@pytest.fixture
+def bus():
+    """(sender, receiver) datagram pair standing in for the writer socket."""
+    sender, receiver = socket.socketpair(socket.AF_UNIX, socket.SOCK_DGRAM)
+    files = {}
+    yield sender, receiver, files
+    for fd in files.values():
+        log_bus.os.close(fd)
+    sender.close()
+    receiver.close()
+
+
+def message(path, line):
+    return str(path).encode() + b'\n' + line + b'\n'
+
+
+def test_drain_writes_queued_messages(tmp_path, bus):
+    sender, receiver, files = bus
+    log = tmp_path / 'a.jsonl'
+    sender.send(message(log, b'{"n":2}'))
+    sender.send(message(tmp_path / 'b.jsonl', b'{"n":3}'))
+
+    log_bus._drain(receiver, message(log, b'{"n":1}'), files)
+
+    assert list(read_jsonl(log)) == [{'n': 1}, {'n': 2}]
+    assert list(read_jsonl(tmp_path / 'b.jsonl')) == [{'n': 3}]
+
+
+def test_drain_follows_rotation(tmp_path, bus):
+    _, receiver, files = bus
+    log = tmp_path / 'a.jsonl'
+    log_bus._drain(receiver, message(log, b'{"n":1}'), files)
+
+    rotate_log(log)  # As a hook appending directly would
+    log_bus._drain(receiver, message(log, b'{"n":2}'), files)
+
+    rotated = [p for p in tmp_path.iterdir() if p != log]
+    assert len(rotated) == 1
+    assert list(read_jsonl(rotated[0])) == [{'n': 1}]
+    assert list(read_jsonl(log)) == [{'n': 2}]
+
+
+def test_drain_recreates_deleted_log(tmp_path, bus):
+    _, receiver, files = bus
+    log = tmp_path / 'a.jsonl'
+    log_bus._drain(receiver, message(log, b'{"n":1}'), files)
+    log.unlink()
+    log_bus._drain(receiver, message(log, b'{"n":2}'), files)
+
+    assert list(read_jsonl(log)) == [{'n': 2}]
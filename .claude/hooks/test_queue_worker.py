@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""Tests for queue_worker batching helpers."""
+import pytest
+
+import queue_worker
+from queue_worker import event_json, send_events_batch, split_batch
+from utils.redis_cache import EVENT_FIELD
+
+
+def entry(n, size=20):
+    """A stream entry whose stored JSON document is exactly size bytes."""
+    document = b'{"n":%d,"p":"' % n
+    document += b'x' * (size - len(document) - 2) + b'"}'
+    assert len(document) == size
+    return (f'{n}-0', {EVENT_FIELD: document})
+
+
+def test_event_json_passes_stored_documents_through():
+    document = b'{"a":1}'
+    assert event_json({EVENT_FIELD: document}) is document
+    assert event_json({EVENT_FIELD: '{"a":1}'}) == document
+
+
+def test_event_json_encodes_legacy_entries():
+    assert event_json({'a': '1', 'b': 'text'}) == b'{"a":1,"b":"text"}'
+
+
+def test_split_batch_keeps_small_batches_whole():
+    batch = [entry(n) for n in range(5)]
+    runs = list(split_batch(batch))
+
+    assert len(runs) == 1
+    entries, documents = runs[0]
+    assert entries == batch
+    assert documents == [event_json(e[1]) for e in batch]
+
+
+def test_split_batch_respects_size_limit(monkeypatch):
+    monkeypatch.setattr(queue_worker, 'MAX_BATCH_BYTES', 100)
+    batch = [entry(n, size=30) for n in range(10)]
+    runs = list(split_batch(batch))
+
+    # Every entry exactly once, in order
+    assert [e for entries, _ in runs for e in entries] == batch
+    for entries, documents in runs:
+        assert len(entries) == len(documents)
+        body = b'[' + b','.join(documents) + b']'
+        assert len(body) <= 100 + 2
+
+
+def test_split_batch_gives_oversized_event_its_own_run(monkeypatch):
+    monkeypatch.setattr(queue_worker, 'MAX_BATCH_BYTES', 100)
+    batch = [entry(0, size=30), entry(1, size=500), entry(2, size=30)]
+    runs = [entries for entries, _ in split_batch(batch)]
+
+    assert runs == [[batch[0]], [batch[1]], [batch[2]]]
+
+
+def test_split_batch_empty():
+    assert list(split_batch([])) == []
+
+
+@pytest.fixture
+def posts(monkeypatch):
+    """Record POSTs instead of sending them; answers with posts.status."""
+    calls = []
+
+    def fake_post(body, url):
+        calls.append((url, body))
+        return fake_post.status
+
+    fake_post.status = 200
+    fake_post.calls = calls
+    monkeypatch.setattr(queue_worker, '_post_body', fake_post)
+    monkeypatch.setattr(queue_worker, '_batch_unsupported', False)
+    return fake_post
+
+
+def test_send_events_batch_posts_one_array(posts):
+    assert send_events_batch([b'{"a":1}', b'{"b":2}'], 'http://localhost:4000/events/')
+    assert posts.calls == [('http://localhost:4000/events/batch', b'[{"a":1},{"b":2}]')]
+
+
+@pytest.mark.parametrize('status', [404, 405, 501])
+def test_send_events_batch_disables_itself_without_endpoint(posts, status):
+    posts.status = status
+    assert not send_events_batch([b'{}'], 'http://localhost:4000/events')
+    assert queue_worker._batch_unsupported
+
+    posts.status = 200
+    assert not send_events_batch([b'{}'], 'http://localhost:4000/events')
+    assert len(posts.calls) == 1
+
+
+def test_send_events_batch_failure_keeps_batching(posts):
+    posts.status = 500
+    assert not send_events_batch([b'{}'], 'http://localhost:4000/events')
+    assert not queue_worker._batch_unsupported
+
+
+def test_dlq_entry_keeps_the_queued_document():
+    document = b'{"a":1}'
+    dlq = queue_worker.make_dlq_entry('1-0', {EVENT_FIELD: document}, 'Max retries exceeded')
+
+    assert dlq[EVENT_FIELD] is document
+    assert dlq['original_id'] == '1-0'
+    assert dlq['error'] == 'Max retries exceeded'
+    assert isinstance(dlq['failed_at'], str)
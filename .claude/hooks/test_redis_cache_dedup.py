@@ -0,0 +1,125 @@
+#!/usr/bin/env python3
+"""Tests for HookCache deduplication without Redis (memo and mmap table)."""
+import threading
+
+import pytest
+
+from utils import redis_cache
+from utils.redis_cache import DEDUP_PROBE_LIMIT, DEDUP_SLOTS, HookCache, get_content_hash
+
+
+class FakeClock:
+    """Stands in for the time module inside redis_cache."""
+
+    def __init__(self):
+        self.now = 1_000_000.0
+
+    def time(self):
+        return self.now
+
+    def monotonic(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(redis_cache, 'time', fake)
+    return fake
+
+
+@pytest.fixture
+def make_cache(tmp_path, monkeypatch):
+    """HookCache instances on a private dedup table, with Redis disabled."""
+    monkeypatch.setattr(redis_cache, 'REDIS_ENABLED', False)
+    monkeypatch.setattr(redis_cache, 'FALLBACK_DEDUP_FILE', tmp_path / 'dedup.bin')
+    return HookCache
+
+
+def key_for_slot(slot, n):
+    """The n-th distinct dedup key whose probe starts at slot."""
+    return f"dedup:{slot + n * DEDUP_SLOTS:016x}"
+
+
+def test_duplicate_within_ttl(make_cache, clock):
+    cache = make_cache()
+    assert not cache.is_duplicate_event('Stop', 's1', 'h')
+    assert cache.is_duplicate_event('Stop', 's1', 'h')
+    assert not cache.is_duplicate_event('Stop', 's1', 'other')
+    assert not cache.is_duplicate_event('Stop', 's2', 'h')
+
+
+def test_expires_after_ttl(make_cache, clock):
+    cache = make_cache()
+    assert not cache.is_duplicate_event('Stop', 's1', 'h', ttl_seconds=5)
+    clock.now += 4.9
+    assert cache.is_duplicate_event('Stop', 's1', 'h', ttl_seconds=5)
+    clock.now += 5
+    assert not cache.is_duplicate_event('Stop', 's1', 'h', ttl_seconds=5)
+
+
+def test_table_is_shared_between_instances(make_cache, clock):
+    # Separate instances stand in for separate hook processes
+    assert not make_cache().is_duplicate_event('Stop', 's1', 'h')
+    assert make_cache().is_duplicate_event('Stop', 's1', 'h')
+
+
+def test_full_probe_window_evicts_oldest(make_cache, clock):
+    cache = make_cache()
+    keys = [key_for_slot(7, n) for n in range(DEDUP_PROBE_LIMIT + 1)]
+    for key in keys[:DEDUP_PROBE_LIMIT]:
+        assert not cache._file_check_duplicate(key, 60)
+        clock.now += 1
+
+    # The window is full of live entries: the next key replaces the oldest
+    assert not cache._file_check_duplicate(keys[-1], 60)
+    assert not cache._file_check_duplicate(keys[0], 60)
+    assert cache._file_check_duplicate(keys[-1], 60)
+
+
+def test_expired_slot_is_reused(make_cache, clock):
+    cache = make_cache()
+    keys = [key_for_slot(DEDUP_SLOTS - 1, n) for n in range(DEDUP_PROBE_LIMIT + 1)]
+    for key in keys[:DEDUP_PROBE_LIMIT]:
+        assert not cache._file_check_duplicate(key, 5)
+    clock.now += 10
+
+    # Every slot in the window (wrapping past the end) has expired
+    assert not cache._file_check_duplicate(keys[-1], 5)
+    assert cache._file_check_duplicate(keys[-1], 5)
+
+
+def test_memo_prunes_expired_keys(make_cache, clock, monkeypatch):
+    monkeypatch.setattr(redis_cache, 'RECENT_EVENTS_PRUNE_SIZE', 10)
+    cache = make_cache()
+    for n in range(10):
+        cache.is_duplicate_event('Stop', 's', str(n), ttl_seconds=5)
+    clock.now += 10
+    cache.is_duplicate_event('Stop', 's', 'new', ttl_seconds=5)
+
+    assert len(cache._recent_events) == 1
+
+
+def test_concurrent_checks(make_cache, clock, monkeypatch, capsys):
+    monkeypatch.setattr(redis_cache, 'RECENT_EVENTS_PRUNE_SIZE', 10)
+    cache = make_cache()
+    errors = []
+
+    def check(worker):
+        try:
+            for n in range(500):
+                cache.is_duplicate_event('Stop', f's{worker}', str(n), ttl_seconds=0)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=check, args=(w,)) for w in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert errors == []
+
+
+def test_content_hash_is_stable_and_order_independent():
+    assert get_content_hash({'a': 1, 'b': [1, 2]}) == get_content_hash({'b': [1, 2], 'a': 1})
+    assert get_content_hash({'a': 1}) != get_content_hash({'a': 2})
@@ -0,0 +1,51 @@
+#!/usr/bin/env python3
+"""Tests for router.parse_args: the fast scan must agree with argparse."""
+import pytest
+
+from router import build_parser, parse_args
+
+
+def outcome(parse, argv):
+    """Parsed flags as a dict, or the exit code if parsing was rejected."""
+    try:
+        return vars(parse(argv))
+    except SystemExit as e:
+        return ('exit', e.code)
+
+
+# Forms hook commands use (handled by the scan itself)
+ACCEPTED = [
+    ['--event-type', 'PreToolUse'],
+    ['--event-type=Stop'],
+    ['--event-type', 'PostToolUse', '--auto-project-id', '--summarize'],
+    ['--event-type', 'Notification', '--notify', '--server-url', 'http://localhost:4000/events'],
+    ['--event-type=SessionEnd', '--announce', '--save-stats', '--server-url=http://localhost:4000/events'],
+    ['--source-app', 'demo', '--event-type', 'UserPromptSubmit', '--add-chat', '--validate'],
+    ['--event-type', 'SubagentStop', '--name-agent', '--verbose', '--backup', '--load-context'],
+    ['--event-type', 'Stop', '--source-app='],
+    ['--event-type', 'Stop', '--event-type', 'PreCompact'],
+]
+
+# Forms the scan hands to argparse (accepted or rejected there)
+DEFERRED = [
+    [],
+    ['--summarize'],
+    ['--event-type'],
+    ['--event-type', '--summarize'],
+    ['--event-type', 'Stop', '--unknown'],
+    ['--event-typ', 'Stop'],
+    ['--event-type', 'Stop', '--add-chat=1'],
+    ['--event-type', 'Stop', 'extra'],
+]
+
+
+@pytest.mark.parametrize('argv', ACCEPTED)
+def test_accepted_forms_match_argparse(argv):
+    result = outcome(parse_args, argv)
+    assert isinstance(result, dict)
+    assert result == outcome(build_parser().parse_args, argv)
+
+
+@pytest.mark.parametrize('argv', DEFERRED)
+def test_other_forms_match_argparse(argv, capsys):
+    assert outcome(parse_args, argv) == outcome(build_parser().parse_args, argv)
@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""Tests for utils.transcript_cache: incremental reads must match a full parse."""
+import json
+import os
+
+import pytest
+
+from utils import transcript_cache
+from utils.transcript_cache import read_transcript
+
+
+def full_parse(path):
+    entries = []
+    with open(path, 'rb') as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                try:
+                    entries.append(json.loads(line))
+                except ValueError:
+                    pass
+    return entries
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    transcript_cache._cache.clear()
+    yield
+    transcript_cache._cache.clear()
+
+
+def append(path, *lines):
+    with open(path, 'ab') as f:
+        f.write(b''.join(lines))
+
+
+def test_appended_lines_are_picked_up(tmp_path):
+    path = tmp_path / 't.jsonl'
+    append(path, b'{"n":1}\n', b'not json\n', b'\n')
+    assert read_transcript(str(path)) == [{'n': 1}]
+
+    append(path, b'{"n":2}\n')
+    assert read_transcript(str(path)) == [{'n': 1}, {'n': 2}]
+    assert read_transcript(str(path)) == full_parse(path)
+
+
+def test_partial_last_line(tmp_path):
+    path = tmp_path / 't.jsonl'
+    append(path, b'{"n":1}\n{"n":')
+    assert read_transcript(str(path)) == [{'n': 1}]
+
+    append(path, b'2}')  # Complete but no newline yet: counted
+    assert read_transcript(str(path)) == [{'n': 1}, {'n': 2}]
+
+    append(path, b'\n{"n":3}\n')
+    assert read_transcript(str(path)) == [{'n': 1}, {'n': 2}, {'n': 3}]
+
+
+def test_returned_list_is_the_callers(tmp_path):
+    path = tmp_path / 't.jsonl'
+    append(path, b'{"n":1}\n')
+    first = read_transcript(str(path))
+    first.append('mine')
+    append(path, b'{"n":2}\n')
+
+    assert read_transcript(str(path)) == [{'n': 1}, {'n': 2}]
+
+
+def test_truncated_file_is_reparsed(tmp_path):
+    path = tmp_path / 't.jsonl'
+    append(path, b'{"n":1}\n{"n":2}\n')
+    read_transcript(str(path))
+
+    path.write_bytes(b'{"n":3}\n')
+    assert read_transcript(str(path)) == [{'n': 3}]
+
+
+def test_rewritten_in_place_is_reparsed(tmp_path):
+    path = tmp_path / 't.jsonl'
+    append(path, b'{"n":1}\n')
+    read_transcript(str(path))
+
+    # Same inode, longer, different prefix
+    with open(path, 'r+b') as f:
+        f.write(b'{"n":9}\n{"n":8}\n')
+    assert read_transcript(str(path)) == [{'n': 9}, {'n': 8}]
+
+
+def test_replaced_file_is_reparsed(tmp_path):
+    path = tmp_path / 't.jsonl'
+    append(path, b'{"n":1}\n')
+    read_transcript(str(path))
+
+    other = tmp_path / 'new.jsonl'
+    append(other, b'{"n":1}\n{"n":2}\n')
+    os.replace(other, path)
+    assert read_transcript(str(path)) == [{'n': 1}, {'n': 2}]
+
+
+def test_cache_is_bounded(tmp_path, monkeypatch):
+    monkeypatch.setattr(transcript_cache, 'MAX_CACHED_TRANSCRIPTS', 2)
+    for n in range(5):
+        path = tmp_path / f'{n}.jsonl'
+        append(path, b'{"n":%d}\n' % n)
+        assert read_transcript(str(path)) == [{'n': n}]
+
+    assert list(transcript_cache._cache) == [str(tmp_path / '3.jsonl'), str(tmp_path / '4.jsonl')]
+
+
+def test_missing_file_raises(tmp_path):
+    with pytest.raises(OSError):
+        read_transcript(str(tmp_path / 'missing.jsonl'))
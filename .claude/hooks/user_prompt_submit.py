@@ -3,15 +3,20 @@
 # requires-python = ">=3.11"
 # dependencies = [
 #     "python-dotenv",
+#     "orjson",
 # ]
 # ///
 
 import argparse
 import json
 import os
+import re
 import sys
 from pathlib import Path
 from datetime import datetime
+from utils.jsonl_log import append_jsonl
+from utils.llm import get_agent_name
+from utils.fastjson import dumps, loads
 
 try:
     from dotenv import load_dotenv
@@ -26,24 +31,10 @@ def log_user_prompt(session_id, input_data):
     # Ensure logs directory exists
     log_dir = Path("logs")
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "user_prompt_submit.json"
+    log_file = log_dir / "user_prompt_submit.jsonl"
 
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, "r") as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-
-    # Append the entire input data
-    log_data.append(input_data)
-
-    # Write back to file with formatting
-    with open(log_file, "w") as f:
-        json.dump(log_data, f, indent=2)
+    # Append-only JSONL: one write per event, no read-modify-write
+    append_jsonl(log_file, input_data)
 
 
 def manage_session_data(session_id, prompt, name_agent=False):
@@ -59,8 +50,8 @@ def manage_session_data(session_id, prompt, name_agent=False):
 
     if session_file.exists():
         try:
-            with open(session_file, "r") as f:
-                session_data = json.load(f)
+            with open(session_file, "rb") as f:
+                session_data = loads(f.read())
         except (json.JSONDecodeError, ValueError):
             session_data = {"session_id": session_id, "prompts": []}
     else:
@@ -71,22 +62,15 @@ def manage_session_data(session_id, prompt, name_agent=False):
 
     # Generate agent name if requested and not already present
     if name_agent and "agent_name" not in session_data:
-        # Try Anthropic first (preferred)
+        # Try Anthropic first (preferred) - in-process when its SDK imports here
         try:
-            result = subprocess.run(
-                ["uv", "run", ".claude/hooks/utils/llm/anth.py", "--agent-name"],
-                capture_output=True,
-                text=True,
-                timeout=10,
-            )
-
-            if result.returncode == 0 and result.stdout.strip():
-                agent_name = result.stdout.strip()
-                # Validate the name
-                if len(agent_name.split()) == 1 and agent_name.isalnum():
-                    session_data["agent_name"] = agent_name
-                else:
-                    raise Exception("Invalid name from Anthropic")
+            agent_name = get_agent_name(timeout=10)
+
+            # Validate the name (in-process failures return None - also fall back)
+            if agent_name and len(agent_name.split()) == 1 and agent_name.isalnum():
+                session_data["agent_name"] = agent_name
+            else:
+                raise Exception("Invalid name from Anthropic")
         except Exception:
             # Fall back to Ollama if Anthropic fails
             try:
@@ -108,29 +92,42 @@ def manage_session_data(session_id, prompt, name_agent=False):
 
     # Save the updated session data
     try:
-        with open(session_file, "w") as f:
-            json.dump(session_data, f, indent=2)
+        with open(session_file, "wb") as f:
+            f.write(dumps(session_data, pretty=True))
     except Exception:
         # Silently fail if we can't write the file
         pass
 
 
+# Prompt validation rules (customize as needed): (substring, reason) pairs,
+# matched case-insensitively; the first listed match gives the reason
+BLOCKED_PATTERNS = [
+    # Add any patterns you want to block
+    # Example: ('rm -rf /', 'Dangerous command detected'),
+]
+
+# All patterns folded into one alternation so each prompt is scanned once
+_BLOCKED_RE = (
+    re.compile('|'.join(re.escape(pattern.lower()) for pattern, _ in BLOCKED_PATTERNS))
+    if BLOCKED_PATTERNS else None
+)
+
+
 def validate_prompt(prompt):
     """
     Validate the user prompt for security or policy violations.
     Returns tuple (is_valid, reason).
     """
-    # Example validation rules (customize as needed)
-    blocked_patterns = [
-        # Add any patterns you want to block
-        # Example: ('rm -rf /', 'Dangerous command detected'),
-    ]
+    if _BLOCKED_RE is None:
+        return True, None
 
     prompt_lower = prompt.lower()
 
-    for pattern, reason in blocked_patterns:
-        if pattern.lower() in prompt_lower:
-            return False, reason
+    # One regex pass; only a hit walks the list to find the first pattern's reason
+    if _BLOCKED_RE.search(prompt_lower):
+        for pattern, reason in BLOCKED_PATTERNS:
+            if pattern.lower() in prompt_lower:
+                return False, reason
 
     return True, None
 
@@ -160,7 +157,7 @@ def main():
         args = parser.parse_args()
 
         # Read JSON input from stdin
-        input_data = json.loads(sys.stdin.read())
+        input_data = loads(sys.stdin.buffer.read())
 
         # Extract session_id and prompt
         session_id = input_data.get("session_id", "unknown")
@@ -0,0 +1,65 @@
+#!/usr/bin/env python3
+"""
+.env loading for short-lived hook processes.
+
+Most hook runs find no .env at all, yet load_dotenv() imports python-dotenv
+to find that out. load_dotenv_cached() looks for the file first, the way
+load_dotenv() would (walking up from the calling module's directory, as
+find_dotenv() does), and only imports dotenv when there is one to parse.
+Each file is loaded at most once per process.
+
+Values are parsed by python-dotenv on every load (interpolation sees the
+current environment) and are never written anywhere else.
+"""
+
+import os
+import sys
+from pathlib import Path
+from typing import Optional, Set
+
+# Files already loaded into os.environ by this process
+_loaded: Set[str] = set()
+
+
+def _find_env_file(start_dir: Path) -> Optional[Path]:
+    """First .env in start_dir or its parents (find_dotenv(usecwd=False))."""
+    for directory in (start_dir, *start_dir.parents):
+        candidate = directory / '.env'
+        if candidate.is_file():
+            return candidate
+    return None
+
+
+def load_dotenv_cached(env_path: Optional[str] = None, override: bool = False) -> bool:
+    """
+    Load a .env file into os.environ, skipping python-dotenv when there is none.
+
+    Args:
+        env_path: Path to the .env file (default: the nearest .env in the
+            calling module's directory or its parents, like load_dotenv())
+        override: Overwrite variables already present in the environment
+
+    Returns:
+        True if a .env file was loaded
+    """
+    if env_path is None:
+        caller_file = sys._getframe(1).f_code.co_filename
+        found = _find_env_file(Path(os.path.abspath(caller_file)).parent)
+        if found is None:
+            return False
+        env_path = str(found)
+
+    abs_path = os.path.abspath(env_path)
+    if abs_path in _loaded:
+        return True
+    if not os.path.isfile(abs_path):
+        return False
+
+    try:
+        from dotenv import load_dotenv
+    except ImportError:
+        return False  # dotenv is optional
+
+    load_dotenv(abs_path, override=override)
+    _loaded.add(abs_path)
+    return True
@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Client side of the long-running event sender (send_event_daemon.py).
+
+Sending an event from a fresh hook process means starting an interpreter and
+importing dotenv, redis, the summarizer and the HTTP stack, all to make one
+POST. The daemon keeps those loaded (along with its Redis client and server
+connection); hooks hand it the event over a Unix socket instead. The daemon
+acknowledges as soon as it has the event, so hooks don't wait for the send.
+
+send_via_daemon() returns False when no daemon answers, after starting one
+in the background for the events that follow, and the caller then sends the
+event in-process. run_detached() lets it do that from a background process
+so the hook still returns right away. The daemon is opt-in: set
+CLAUDE_HOOKS_DAEMON=1 to use it; otherwise events are sent in-process.
+
+The socket and its lock live in a per-user 0700 directory (SOCKET_DIR) that
+must be owned by this user: a socket in a shared directory could be created
+first by another local user, who would then receive every hook payload.
+
+The daemon keeps the interpreter and environment of the hook that started
+it, so the socket name includes a hash of both (see DAEMON_ENV_PREFIXES):
+hooks from projects configured differently get a daemon of their own
+instead of having their events sent with another project's settings.
+"""
+
+import hashlib
+import os
+import socket
+import stat
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional, Union
+
+from utils.fastjson import dumps
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent
+DAEMON_SCRIPT = HOOKS_DIR / 'send_event_daemon.py'
+
+# Opt-in, and Unix sockets only (the daemon isn't used on Windows)
+DAEMON_ENABLED = (
+    hasattr(socket, 'AF_UNIX')
+    and os.name == 'posix'
+    and os.environ.get('CLAUDE_HOOKS_DAEMON', '').lower() in ('1', 'true')
+)
+
+
+# Environment variables read on the sending path (server URL and allowed
+# hosts, Redis, summarizer API keys, log settings)
+DAEMON_ENV_PREFIXES = (
+    'OBSERVABILITY_', 'REDIS_', 'ANTHROPIC_', 'OPENAI_', 'ELEVENLABS_',
+    'ENGINEER_NAME', 'CLAUDE_HOOKS_',
+)
+
+
+def _config_key() -> str:
+    """Hash of everything a daemon inherits from the hook that starts it."""
+    h = hashlib.blake2b(digest_size=8)
+    h.update(sys.executable.encode())
+    h.update(b'\0' + str(HOOKS_DIR).encode())
+    for name in sorted(os.environ):
+        if name.startswith(DAEMON_ENV_PREFIXES):
+            h.update(f'\0{name}={os.environ[name]}'.encode())
+    return h.hexdigest()
+
+
+def _socket_dir() -> Optional[Path]:
+    if not hasattr(os, 'getuid'):
+        return None  # Windows
+    return Path(os.environ.get('XDG_RUNTIME_DIR') or '/tmp') / f'claude-hooks-{os.getuid()}'
+
+
+def _socket_path() -> str:
+    if SOCKET_DIR is None:
+        return ''
+    return str(SOCKET_DIR / f'{_config_key()}.sock')
+
+
+def private_dir_ok(path: Union[str, Path]) -> bool:
+    """Whether path is a real directory owned by this user with mode 0700 or stricter."""
+    try:
+        st = os.lstat(path)
+    except OSError:
+        return False
+    return (
+        stat.S_ISDIR(st.st_mode)
+        and st.st_uid == os.getuid()
+        and not st.st_mode & (stat.S_IRWXG | stat.S_IRWXO)
+    )
+
+
+def ensure_private_dir(path: Union[str, Path]) -> bool:
+    """Create path with mode 0700 if missing; True if it is (now) private to this user."""
+    try:
+        os.mkdir(path, 0o700)
+    except FileExistsError:
+        pass  # Checked below: it may belong to someone else
+    except OSError:
+        return False
+    return private_dir_ok(path)
+
+
+SOCKET_DIR = _socket_dir()
+SOCKET_PATH = _socket_path()
+
+# A live daemon accepts immediately; anything slower is treated as down
+CONNECT_TIMEOUT_SECONDS = 0.05
+# The daemon acknowledges on receipt; no reply by then means it's wedged
+REPLY_TIMEOUT_SECONDS = 2
+
+
+def start_daemon() -> None:
+    """Start send_event_daemon.py detached from this hook (errors ignored)."""
+    try:
+        # The socket path is passed along so the daemon serves exactly the one
+        # this hook computed, whatever it loads from .env afterwards
+        subprocess.Popen(
+            [sys.executable, str(DAEMON_SCRIPT), SOCKET_PATH],
+            cwd=str(HOOKS_DIR),
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True
+        )
+    except OSError:
+        pass
+
+
+def send_via_daemon(input_data: Dict[str, Any], options: Dict[str, Any]) -> bool:
+    """
+    Hand an event to the running daemon, which sends it with send_event_direct().
+
+    Args:
+        input_data: The hook JSON data
+        options: send_event_direct() options
+
+    Returns:
+        True if the daemon took the event, False if the caller should send it
+        itself (no daemon running, or the daemon didn't acknowledge it)
+    """
+    if not DAEMON_ENABLED:
+        return False
+
+    if not private_dir_ok(SOCKET_DIR):
+        # Missing (the daemon creates it), or not ours: never connect there
+        start_daemon()
+        return False
+
+    request = dumps({'input_data': input_data, 'options': options})
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT_SECONDS)
+        try:
+            sock.connect(SOCKET_PATH)
+        except OSError:
+            # Missing or stale socket: start a daemon for the next event
+            start_daemon()
+            return False
+
+        sock.settimeout(REPLY_TIMEOUT_SECONDS)
+        try:
+            sock.sendall(request)
+            sock.shutdown(socket.SHUT_WR)  # End of request
+        except OSError:
+            return False
+
+        try:
+            # One byte once the daemon has the event; b'' means it closed the
+            # connection without taking it
+            return sock.recv(1) != b''
+        except OSError:
+            return False  # Includes timeouts
+    finally:
+        sock.close()
+
+
+def run_detached(func: Callable[[], Any]) -> bool:
+    """
+    Run func() in a detached background process and return without waiting.
+
+    The process is double-forked into its own session, with stdin, stdout and
+    stderr on /dev/null so it doesn't hold the hook's pipes open.
+
+    Args:
+        func: Work to run in the background (its result is discarded)
+
+    Returns:
+        True if func was handed off, False if fork() isn't available or
+        failed (the caller should run func itself)
+    """
+    if not hasattr(os, 'fork'):
+        return False
+
+    # Nothing buffered may be written twice (or lost) across the fork
+    sys.stdout.flush()
+    sys.stderr.flush()
+    try:
+        pid = os.fork()
+    except OSError:
+        return False
+    if pid:
+        os.waitpid(pid, 0)  # The intermediate child exits straight after forking
+        return True
+
+    try:
+        os.setsid()
+        try:
+            if os.fork():
+                os._exit(0)
+        except OSError:
+            pass  # Run func here; the hook waits for it, as without fork
+        devnull = os.open(os.devnull, os.O_RDWR)
+        for fd in (0, 1, 2):
+            os.dup2(devnull, fd)
+        func()
+    finally:
+        os._exit(0)
@@ -0,0 +1,50 @@
+#!/usr/bin/env python3
+"""
+Fast JSON encode/decode for Claude Code hooks.
+
+Uses orjson when it is installed (several times faster than stdlib json, and
+it emits bytes directly) and falls back to the stdlib json module otherwise.
+Decode errors are always json.JSONDecodeError (orjson's error subclasses it),
+so existing `except json.JSONDecodeError` handlers keep working.
+"""
+
+import json
+from typing import Any, Union
+
+JSONDecodeError = json.JSONDecodeError
+
+
+def _dumps_json(obj: Any, pretty: bool = False) -> bytes:
+    """Serialize obj to UTF-8 JSON bytes with stdlib json."""
+    if pretty:
+        return json.dumps(obj, indent=2).encode('utf-8')
+    return json.dumps(obj, separators=(',', ':')).encode('utf-8')
+
+
+try:
+    import orjson
+
+    def dumps(obj: Any, pretty: bool = False) -> bytes:
+        """
+        Serialize obj to UTF-8 JSON bytes.
+
+        Args:
+            obj: JSON-serializable data
+            pretty: Indent with two spaces (for human-readable files)
+
+        Returns:
+            Encoded JSON
+        """
+        try:
+            return orjson.dumps(obj, option=orjson.OPT_INDENT_2 if pretty else 0)
+        except orjson.JSONEncodeError:
+            # e.g. non-str dict keys, lone surrogates or integers over 64 bits
+            return _dumps_json(obj, pretty)
+
+    def loads(data: Union[bytes, str]) -> Any:
+        """Parse JSON from bytes or str."""
+        return orjson.loads(data)
+
+except ImportError:
+    dumps = _dumps_json
+    loads = json.loads
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+Pooled HTTP POSTs for Claude Code hooks.
+
+urllib.request.urlopen() opens a new TCP (and TLS) connection for every
+request. post() sends through one process-wide urllib3 PoolManager instead,
+so every POST after the first in a process reuses a kept-alive connection
+and skips the handshakes. Without urllib3 it falls back to urlopen().
+
+Errors are raised the way urlopen() raises them (HTTPError for 4xx/5xx
+responses, URLError when the server can't be reached, TimeoutError when it
+stops answering), so callers keep their existing fallbacks.
+
+With OBSERVABILITY_COMPRESSION=zstd (and the zstandard package installed),
+bodies over COMPRESS_MIN_BYTES are sent with Content-Encoding: zstd. A
+server that answers 415 gets uncompressed bodies from then on.
+"""
+
+import os
+import urllib.error
+import urllib.request
+from typing import Dict, Optional
+
+try:
+    import urllib3
+except ImportError:
+    urllib3 = None  # Fall back to a urlopen() connection per request
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None  # Bodies are always sent uncompressed
+
+# Connections kept open per host (hooks talk to a single server)
+POOL_MAXSIZE = 4
+
+# Smaller bodies aren't worth compressing
+COMPRESS_MIN_BYTES = 1024
+ZSTD_LEVEL = 3
+
+# Opt-in: the server has to accept zstd-encoded request bodies
+COMPRESSION_ENABLED = (
+    zstandard is not None
+    and os.environ.get('OBSERVABILITY_COMPRESSION', '').lower() == 'zstd'
+)
+
+_pool: Optional['urllib3.PoolManager'] = None
+
+# URLs that refused a compressed body (415): sent uncompressed from then on
+_identity_urls = set()
+
+
+def _get_pool() -> 'urllib3.PoolManager':
+    """Create the shared PoolManager on first use."""
+    global _pool
+    if _pool is None:
+        # No automatic retries: a failed POST goes straight to the caller's
+        # fallbacks (PowerShell, Redis queue) just as it did with urlopen()
+        _pool = urllib3.PoolManager(num_pools=1, maxsize=POOL_MAXSIZE, block=False, retries=False)
+    return _pool
+
+
+def post(url: str, body: bytes, headers: Dict[str, str], timeout: float = 5) -> int:
+    """
+    POST body to url, reusing a pooled keep-alive connection.
+
+    Large bodies are zstd-compressed when COMPRESSION_ENABLED (see above).
+
+    Args:
+        url: Request URL
+        body: Encoded request body
+        headers: Request headers
+        timeout: Seconds allowed for connecting and for each read
+
+    Returns:
+        HTTP status of a successful (< 400) response
+
+    Raises:
+        urllib.error.HTTPError: The server answered with a 4xx/5xx status
+        urllib.error.URLError: The server couldn't be reached
+        TimeoutError: The server stopped answering mid-request
+    """
+    if COMPRESSION_ENABLED and len(body) > COMPRESS_MIN_BYTES and url not in _identity_urls:
+        # A compressor per call: instances aren't safe to share across threads
+        compressed = zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(body)
+        try:
+            return _post(url, compressed, dict(headers, **{'Content-Encoding': 'zstd'}), timeout)
+        except urllib.error.HTTPError as e:
+            if e.code != 415:
+                raise
+            _identity_urls.add(url)  # Unsupported Media Type: resend as-is
+    return _post(url, body, headers, timeout)
+
+
+def _post(url: str, body: bytes, headers: Dict[str, str], timeout: float) -> int:
+    """post() without compression."""
+    if urllib3 is None:
+        req = urllib.request.Request(url, data=body, headers=headers)
+        with urllib.request.urlopen(req, timeout=timeout) as response:
+            return response.status
+
+    try:
+        response = _get_pool().request(
+            'POST', url, body=body, headers=headers,
+            timeout=urllib3.Timeout(connect=timeout, read=timeout)
+        )
+    except urllib3.exceptions.ReadTimeoutError as e:
+        raise TimeoutError(str(e)) from e
+    except urllib3.exceptions.HTTPError as e:
+        raise urllib.error.URLError(e) from e
+
+    if response.status >= 400:
+        raise urllib.error.HTTPError(url, response.status, response.reason, response.headers, None)
+    return response.status
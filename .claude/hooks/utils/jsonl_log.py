@@ -0,0 +1,275 @@
+#!/usr/bin/env python3
+"""
+JSON Lines logging helpers for Claude Code hooks.
+
+Hook logs are append-only: each event is written as one JSON object per line,
+so logging never has to read, parse, or rewrite earlier entries. Each line is
+written with a single write(2) on an O_APPEND descriptor: the kernel moves to
+end-of-file and writes the buffer as one step, so concurrent appends from
+other hooks land before or after it, never inside it, and no lock is taken
+in the common case (see write_append() for the limits). Files are rotated
+once they exceed MAX_LOG_BYTES so a single log never grows unbounded.
+"""
+
+import hashlib
+import json
+import os
+import re
+import time
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not available on Windows
+
+
+def _encode_line_json(entry: Dict[str, Any]) -> bytes:
+    """Encode an entry as one newline-terminated JSON line with stdlib json."""
+    # Compact separators; non-ASCII kept as UTF-8 (lone surrogates are
+    # written as \uXXXX escapes so the line stays valid JSON)
+    line = json.dumps(entry, separators=(',', ':'), ensure_ascii=False)
+    return (line + '\n').encode('utf-8', 'backslashreplace')
+
+
+# Prefer orjson (C/Rust encoder) when installed, fall back to stdlib json
+try:
+    import orjson
+
+    def encode_line(entry: Dict[str, Any]) -> bytes:
+        """Encode an entry as one newline-terminated JSON line."""
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            # e.g. lone surrogates or integers over 64 bits
+            return _encode_line_json(entry)
+
+    _loads = orjson.loads
+    _DecodeError = orjson.JSONDecodeError
+except ImportError:
+    encode_line = _encode_line_json
+    _loads = json.loads
+    _DecodeError = json.JSONDecodeError
+
+# Rotate a log once it grows past this size (0 disables rotation)
+try:
+    MAX_LOG_BYTES = int(os.environ.get('CLAUDE_HOOKS_MAX_LOG_BYTES', 5_000_000))
+except ValueError:
+    MAX_LOG_BYTES = 5_000_000
+
+# Appends up to this size are written with one unlocked write(2) (see
+# write_append()). Not PIPE_BUF, which only concerns pipes and FIFOs: on a
+# regular file, O_APPEND is what keeps one write(2) whole
+UNLOCKED_WRITE_MAX = 4096
+
+_APPEND_FLAGS = os.O_WRONLY | os.O_CREAT | os.O_APPEND | getattr(os, 'O_BINARY', 0)
+
+
+# Session IDs used as-is in log file names (anything else could leave logs/)
+_SAFE_SESSION_ID = re.compile(r'[A-Za-z0-9_-]{1,128}')
+
+
+def session_file_id(session_id: str) -> str:
+    """
+    Session ID as a file name component.
+
+    IDs of letters, digits, '-' and '_' are used unchanged; anything else
+    (e.g. containing '/' or '..') is replaced by a hash of it, so it still
+    gets a file of its own.
+    """
+    session_id = str(session_id)
+    if _SAFE_SESSION_ID.fullmatch(session_id):
+        return session_id
+    return 'id-' + hashlib.blake2b(session_id.encode('utf-8', 'replace'), digest_size=8).hexdigest()
+
+
+def rotate_log(log_path: Union[str, Path]) -> None:
+    """Move a full log aside as <name>.<timestamp>.jsonl so appends start fresh."""
+    path = Path(log_path)
+    try:
+        path.rename(path.with_name(f"{path.stem}.{time.time_ns()}{path.suffix}"))
+    except OSError:
+        pass  # Another process may have rotated it already
+
+
+def open_append(log_path: Union[str, Path]) -> int:
+    """Open a log file for O_APPEND writes (created if missing); returns the fd."""
+    return os.open(log_path, _APPEND_FLAGS, 0o644)
+
+
+def write_append(fd: int, data: bytes) -> None:
+    """
+    Append whole JSON lines to an O_APPEND descriptor without interleaving.
+
+    On local filesystems a single O_APPEND write(2) to a regular file is
+    positioned and written as one step, so it never interleaves with other
+    appends. What one call can't promise is writing everything: a large
+    buffer may come back short (signal, quota) and the rest then needs a
+    second, separate write. Payloads up to UNLOCKED_WRITE_MAX (a hook log
+    line, in practice) go out as one unlocked write; larger ones take an
+    exclusive flock while looping, so a continuation can't be split from its
+    start by another process's locked append. NFS doesn't honor O_APPEND
+    atomically at all; logs there are best-effort.
+    """
+    if len(data) <= UNLOCKED_WRITE_MAX or fcntl is None:
+        os.write(fd, data)
+        return
+    # Lock just this file (logs are per-session, so sessions don't contend)
+    fcntl.flock(fd, fcntl.LOCK_EX)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        fcntl.flock(fd, fcntl.LOCK_UN)
+
+
+def append_jsonl(log_path: Union[str, Path], entry: Dict[str, Any]) -> None:
+    """
+    Append a single entry to a .jsonl log file, rotating it when full.
+
+    Args:
+        log_path: Path to the .jsonl log file (created if missing)
+        entry: JSON-serializable event data
+    """
+    line = encode_line(entry)
+    fd = open_append(log_path)
+    try:
+        write_append(fd, line)
+        size = os.fstat(fd).st_size
+    finally:
+        os.close(fd)
+    if MAX_LOG_BYTES and size > MAX_LOG_BYTES:
+        rotate_log(log_path)
+
+
+def read_jsonl(log_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over entries in a .jsonl log file.
+
+    Args:
+        log_path: Path to the .jsonl log file
+
+    Yields:
+        Parsed log entries (malformed lines are skipped)
+    """
+    try:
+        with open(log_path, 'rb') as f:
+            for line in f:
+                line = line.strip()
+                if not line:
+                    continue
+                try:
+                    yield _loads(line)
+                except _DecodeError:
+                    continue  # Skip partial/corrupt lines
+    except FileNotFoundError:
+        return
+
+
+def count_lines(path: Union[str, Path]) -> int:
+    """
+    Count lines in a file (e.g. entries in a JSONL transcript).
+
+    Scans raw bytes in large chunks with bytes.count, so no per-line Python
+    objects are created. A final line without a trailing newline is counted.
+
+    Args:
+        path: Path to the file
+
+    Returns:
+        Number of lines (0 if the file is missing or empty)
+    """
+    count = 0
+    last = b'\n'
+    try:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                count += chunk.count(b'\n')
+                last = chunk[-1:]
+    except OSError:
+        return 0
+    return count if last == b'\n' else count + 1
+
+
+def jsonl_to_json_array(src_path: Union[str, Path], dst_path: Union[str, Path]) -> int:
+    """
+    Convert a .jsonl file (e.g. a transcript) into an indented JSON array file.
+
+    Streams entry by entry, so memory stays constant however large the
+    source is. Malformed lines are skipped. The output matches
+    json.dump(entries, f, indent=2).
+
+    Args:
+        src_path: Path to the .jsonl file to read
+        dst_path: Path to the .json file to write
+
+    Returns:
+        Number of entries written
+    """
+    from utils.fastjson import dumps
+
+    count = 0
+    with open(src_path, 'rb') as src, open(dst_path, 'wb') as dst:
+        dst.write(b'[')
+        for line in src:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entry = _loads(line)
+            except _DecodeError:
+                continue  # Skip invalid lines
+            # Nest the entry's own indentation one level inside the array
+            dst.write(b',\n  ' if count else b'\n  ')
+            dst.write(dumps(entry, pretty=True).replace(b'\n', b'\n  '))
+            count += 1
+        dst.write(b'\n]' if count else b']')
+    return count
+
+
+def migrate_json_to_jsonl(json_path: Union[str, Path]) -> int:
+    """
+    Convert a legacy JSON-array log into the .jsonl log next to it.
+
+    Entries are appended to <name>.jsonl (after any events already logged
+    there) and the old file is renamed to <name>.json.migrated, so running it
+    again on the same path is a no-op.
+
+    Args:
+        json_path: Path to the legacy .json log file
+
+    Returns:
+        Number of entries migrated (0 if the file is missing or not an array)
+    """
+    path = Path(json_path)
+    try:
+        with open(path, 'rb') as f:
+            entries = _loads(f.read())
+    except (OSError, _DecodeError):
+        return 0
+    if not isinstance(entries, list):
+        return 0
+
+    jsonl_path = path.with_suffix('.jsonl')
+    for entry in entries:
+        append_jsonl(jsonl_path, entry)
+    path.rename(path.with_name(path.name + '.migrated'))
+    return len(entries)
+
+
+if __name__ == "__main__":
+    import sys
+
+    # Logs are written compact; pretty-printing happens only on demand:
+    #   jsonl_log.py --pretty <log.jsonl>...  - write an indented <log>.json copy
+    #   jsonl_log.py <legacy.json>...         - migrate old array logs in place
+    if sys.argv[1:2] == ['--pretty']:
+        sys.path.insert(0, str(Path(__file__).resolve().parent.parent))  # utils.fastjson
+        for arg in sys.argv[2:]:
+            pretty_path = Path(arg).with_suffix('.json')
+            print(f"{pretty_path}: {jsonl_to_json_array(arg, pretty_path)} entries")
+    else:
+        for arg in sys.argv[1:]:
+            print(f"{arg}: {migrate_json_to_jsonl(arg)} entries migrated")
@@ -0,0 +1,42 @@
+"""
+LLM helpers for Claude Code hooks.
+
+The utils/llm/*.py scripts run standalone under `uv run` and also import as
+modules. Hooks call the helpers below, which use a script in-process when its
+SDK imports here - skipping the fork, interpreter start-up and venv resolution
+of `uv run` - and only fall back to `uv run <script>` when it doesn't.
+"""
+
+import subprocess
+from pathlib import Path
+from typing import Optional
+
+ANTH_SCRIPT = Path(__file__).resolve().parent / "anth.py"
+
+
+def get_agent_name(timeout: float = 10) -> Optional[str]:
+    """
+    Generate a single-word agent name with Anthropic.
+
+    Args:
+        timeout: Seconds to wait for the `uv run` fallback
+
+    Returns:
+        The generated name (unvalidated when it comes from `uv run`),
+        or None if generation failed
+    """
+    try:
+        from utils.llm.anth import generate_agent_name
+        return generate_agent_name()
+    except ImportError:
+        pass  # anthropic/dotenv not importable here - use the script's env
+
+    result = subprocess.run(
+        ["uv", "run", str(ANTH_SCRIPT), "--agent-name"],
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode == 0 and result.stdout.strip():
+        return result.stdout.strip()
+    return None
@@ -29,9 +29,12 @@ def prompt_llm(prompt_text):
         print("ANTHROPIC_API_KEY not set", file=sys.stderr)
         return None
 
-    try:
-        import anthropic
+    # Imported outside the try so a missing SDK raises ImportError (callers
+    # running this in-process fall back to `uv run`) instead of a NameError
+    # from the except clause below
+    import anthropic
 
+    try:
         client = anthropic.Anthropic(
             api_key=api_key,
             timeout=10.0  # 10 second timeout
@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Log bus for Claude Code hooks.
+
+Hook processes are short-lived, so every log append pays for opening the log
+file. When enabled (CLAUDE_HOOKS_LOG_BUS=1), hooks instead send each JSON line
+as a single datagram to a small per-session writer process listening on a Unix
+socket. The writer keeps log files open, batches writes, and exits on its own
+after a period of inactivity.
+
+If the writer is not running (or the send fails) the entry is appended
+directly, so no events are lost; the first hook to notice starts the writer.
+"""
+
+import os
+import socket
+import subprocess
+import sys
+from pathlib import Path
+from typing import Any, Dict, Union
+
+# Allow `utils.*` imports when run directly as the writer process
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.jsonl_log import (
+    MAX_LOG_BYTES, append_jsonl, encode_line, open_append, rotate_log, write_append,
+)
+
+LOG_BUS_ENABLED = os.environ.get("CLAUDE_HOOKS_LOG_BUS", "").lower() in ("1", "true")
+
+# Writer exits after this many seconds without receiving events
+IDLE_TIMEOUT_SECONDS = 60
+
+# Per-user socket directory (0700) so other users can't inject log lines
+_SOCKET_DIR = Path(os.environ.get("XDG_RUNTIME_DIR") or "/tmp") / f"claude-log-{os.getuid()}"
+
+
+def get_socket_path(session_id: str) -> str:
+    """Get the Unix socket path for a session's log writer."""
+    safe_id = "".join(c if c.isalnum() or c in "-_" else "_" for c in session_id)[:64]
+    return str(_SOCKET_DIR / f"{safe_id or 'unknown'}.sock")
+
+
+def _spawn_writer(session_id: str) -> None:
+    """Start a detached writer process for the session (best-effort)."""
+    try:
+        _SOCKET_DIR.mkdir(mode=0o700, parents=True, exist_ok=True)
+        subprocess.Popen(
+            [sys.executable, os.path.abspath(__file__), "--serve", get_socket_path(session_id)],
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+        )
+    except OSError:
+        pass
+
+
+def send_log_entry(session_id: str, log_path: Union[str, Path], entry: Dict[str, Any]) -> None:
+    """
+    Log an entry to a .jsonl file, via the session's writer when enabled.
+
+    Args:
+        session_id: Claude session ID (selects the writer process)
+        log_path: Path to the .jsonl log file
+        entry: JSON-serializable event data
+    """
+    if not LOG_BUS_ENABLED:
+        append_jsonl(log_path, entry)
+        return
+
+    message = os.path.abspath(log_path).encode() + b"\n" + encode_line(entry)
+    try:
+        with socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM) as sock:
+            sock.sendto(message, get_socket_path(session_id))
+        return
+    except (FileNotFoundError, ConnectionRefusedError):
+        # No writer listening yet - start one for subsequent events
+        _spawn_writer(session_id)
+    except OSError:
+        pass  # e.g. entry larger than the datagram limit
+
+    append_jsonl(log_path, entry)
+
+
+def _bind_socket(socket_path: str) -> socket.socket:
+    """Bind the writer socket, replacing a stale socket file if needed."""
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+    try:
+        sock.bind(socket_path)
+    except OSError:
+        # Another writer may own it; a stale file refuses connections
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_DGRAM)
+        try:
+            probe.connect(socket_path)
+            sock.close()
+            raise SystemExit(0)  # Live writer already serving this session
+        except ConnectionRefusedError:
+            os.unlink(socket_path)
+            sock.bind(socket_path)
+        finally:
+            probe.close()
+    os.chmod(socket_path, 0o600)
+    return sock
+
+
+def _is_current(path: bytes, fd: int) -> bool:
+    """Whether fd is still the file at path (not renamed away or replaced)."""
+    try:
+        st = os.stat(path)
+    except FileNotFoundError:
+        return False
+    fst = os.fstat(fd)
+    return (st.st_ino, st.st_dev) == (fst.st_ino, fst.st_dev)
+
+
+def _drain(sock: socket.socket, message: bytes, files: Dict[bytes, int]) -> None:
+    """Write a received message plus everything already queued, one write per log."""
+    sock.setblocking(False)
+    batches: Dict[bytes, list] = {}
+    while message:
+        path, _, line = message.partition(b"\n")
+        batches.setdefault(path, []).append(line)
+        try:
+            message = sock.recv(1 << 20)
+        except BlockingIOError:
+            message = None
+
+    # Whole lines only, with append_jsonl's locking rules, so hooks that
+    # fall back to appending directly never land mid-line
+    for path, lines in batches.items():
+        fd = files.get(path)
+        if fd is not None and not _is_current(path, fd):
+            # Rotated (or deleted) by a hook appending directly: follow the name
+            os.close(fd)
+            fd = None
+        if fd is None:
+            fd = files[path] = open_append(path)
+        write_append(fd, b"".join(lines))
+        if MAX_LOG_BYTES and os.fstat(fd).st_size > MAX_LOG_BYTES:
+            os.close(fd)
+            del files[path]
+            rotate_log(path.decode())
+
+
+def serve(socket_path: str) -> None:
+    """Writer loop: receive JSON lines and append them to their log files."""
+    sock = _bind_socket(socket_path)
+    files: Dict[bytes, int] = {}
+    try:
+        while True:
+            sock.settimeout(IDLE_TIMEOUT_SECONDS)
+            try:
+                message = sock.recv(1 << 20)
+            except socket.timeout:
+                break
+            _drain(sock, message, files)
+
+        # Idle: stop accepting new datagrams, then write anything still queued
+        os.unlink(socket_path)
+        sock.setblocking(False)
+        try:
+            _drain(sock, sock.recv(1 << 20), files)
+        except BlockingIOError:
+            pass
+    finally:
+        for fd in files.values():
+            os.close(fd)
+        sock.close()
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 3 and sys.argv[1] == "--serve":
+        serve(sys.argv[2])
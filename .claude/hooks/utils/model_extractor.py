@@ -56,8 +56,10 @@ def get_model_from_transcript(session_id: str, transcript_path: str, ttl: int =
                 'timestamp': current_time,
                 'ttl': ttl
             }
-            with open(cache_file, 'w') as f:
-                json.dump(cache_data, f)
+            # Serialize first, then write the bytes in one call
+            payload = json.dumps(cache_data).encode()
+            with open(cache_file, 'wb') as f:
+                f.write(payload)
         except IOError:
             # Cache write failed, not critical - continue without cache
             pass
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Persistent PowerShell process for the WSL-to-Windows send fallback.
+
+Starting powershell.exe costs the better part of a second, paid on every
+event that needs the fallback. Long-running processes (the event daemon)
+call enable_powershell_worker() once; send_via_powershell() then runs each
+POST as one line on the stdin of a single `powershell.exe -Command -` and
+reads back a status line, instead of starting a new PowerShell each time.
+
+Short-lived hook processes never enable it and keep the one-shot path.
+"""
+
+import base64
+import os
+import select
+import subprocess
+import threading
+import time
+from typing import Optional
+
+# Status lines printed by each command (never part of Invoke-RestMethod output)
+OK_MARKER = b'__HOOK_POST_OK__'
+FAIL_MARKER = b'__HOOK_POST_FAIL__'
+
+
+class PowerShellWorker:
+    """One long-lived powershell.exe, running one POST command at a time."""
+
+    def __init__(self):
+        self._proc: Optional[subprocess.Popen] = None
+        self._buffer = b''
+        # The daemon sends from several threads; commands share one stdin/stdout
+        self._lock = threading.Lock()
+
+    def _start(self) -> None:
+        self._proc = subprocess.Popen(
+            ['powershell.exe', '-NoProfile', '-NonInteractive', '-Command', '-'],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.DEVNULL,
+            bufsize=0
+        )
+        self._buffer = b''
+
+    def stop(self) -> None:
+        """Stop the PowerShell process (a new one starts on the next post)."""
+        if self._proc is None:
+            return
+        try:
+            self._proc.stdin.close()
+            self._proc.wait(timeout=2)
+        except Exception:
+            self._proc.kill()
+        self._proc = None
+
+    def _read_status(self, deadline: float) -> bool:
+        """Read stdout lines until a status marker, or fail at the deadline."""
+        fd = self._proc.stdout.fileno()
+        while True:
+            while b'\n' in self._buffer:
+                line, self._buffer = self._buffer.split(b'\n', 1)
+                line = line.strip()
+                if line == OK_MARKER:
+                    return True
+                if line == FAIL_MARKER:
+                    return False
+
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([fd], [], [], remaining)[0]:
+                raise TimeoutError('PowerShell did not answer')
+            chunk = os.read(fd, 65536)
+            if not chunk:
+                raise EOFError('PowerShell exited')
+            self._buffer += chunk
+
+    def post(self, json_body: bytes, server_url: str, timeout: float = 10) -> bool:
+        """
+        POST a JSON body with Invoke-RestMethod in the persistent process.
+
+        Args:
+            json_body: Encoded JSON request body
+            server_url: Already-validated server URL
+            timeout: Seconds to wait for the command to finish
+
+        Returns:
+            True if the request succeeded
+        """
+        # One line per command: the body travels as base64 of its UTF-8 bytes
+        # (posted as-is, nothing to quote), the URL as a single-quoted string
+        # with quotes doubled
+        body_b64 = base64.b64encode(json_body).decode('ascii')
+        url = server_url.replace("'", "''")
+        command = (
+            "try { Invoke-RestMethod -Method Post -Uri '" + url + "'"
+            " -ContentType 'application/json'"
+            " -Body ([Convert]::FromBase64String('" + body_b64 + "'))"
+            " | Out-Null; '" + OK_MARKER.decode() + "' }"
+            " catch { '" + FAIL_MARKER.decode() + "' }\n"
+        )
+
+        with self._lock:
+            try:
+                if self._proc is None or self._proc.poll() is not None:
+                    self._start()
+                self._proc.stdin.write(command.encode('utf-8'))
+                return self._read_status(time.monotonic() + timeout)
+            except (OSError, ValueError, TimeoutError, EOFError):
+                # Hung or dead: replace it on the next post
+                self.stop()
+                return False
+
+
+_worker: Optional[PowerShellWorker] = None
+
+
+def enable_powershell_worker() -> None:
+    """Route send_via_powershell() through a persistent PowerShell process."""
+    global _worker
+    if _worker is None:
+        _worker = PowerShellWorker()
+
+
+def get_powershell_worker() -> Optional[PowerShellWorker]:
+    """The persistent worker, or None if this process hasn't enabled one."""
+    return _worker
+
+
+def stop_powershell_worker() -> None:
+    """Stop the persistent PowerShell process, if one is running."""
+    if _worker is not None:
+        _worker.stop()
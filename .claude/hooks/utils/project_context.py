@@ -11,6 +11,8 @@ from pathlib import Path
 from typing import Dict, List, Optional, Any
 from dataclasses import dataclass, field
 
+from lib.fs_cache import dir_entries
+
 
 @dataclass
 class ProjectContext:
@@ -76,9 +78,12 @@ def detect_project_context(cwd: Optional[str] = None) -> ProjectContext:
     ctx = ProjectContext(root_dir=cwd)
     root = Path(cwd)
 
+    # One scandir of the project root answers every marker-file check below
+    names = dir_entries(root)
+
     # Detect from package.json
     pkg_json = root / 'package.json'
-    if pkg_json.exists():
+    if pkg_json.name in names:
         try:
             pkg = json.loads(pkg_json.read_text())
             ctx.project_name = pkg.get('name', root.name)
@@ -95,14 +100,14 @@ def detect_project_context(cwd: Optional[str] = None) -> ProjectContext:
                 ctx.package_manager = 'deno'
 
             # Detect package manager from lockfiles
-            if (root / 'bun.lockb').exists() or (root / 'bun.lock').exists():
+            if 'bun.lockb' in names or 'bun.lock' in names:
                 ctx.package_manager = 'bun'
                 ctx.runtime = 'bun'
-            elif (root / 'pnpm-lock.yaml').exists():
+            elif 'pnpm-lock.yaml' in names:
                 ctx.package_manager = 'pnpm'
-            elif (root / 'yarn.lock').exists():
+            elif 'yarn.lock' in names:
                 ctx.package_manager = 'yarn'
-            elif (root / 'package-lock.json').exists():
+            elif 'package-lock.json' in names:
                 ctx.package_manager = 'npm'
 
             # Detect frameworks
@@ -158,27 +163,27 @@ def detect_project_context(cwd: Optional[str] = None) -> ProjectContext:
             pass
 
     # Detect Python projects
-    if (root / 'pyproject.toml').exists() or (root / 'setup.py').exists():
+    if 'pyproject.toml' in names or 'setup.py' in names:
         ctx.runtime = 'python'
-        if (root / 'poetry.lock').exists():
+        if 'poetry.lock' in names:
             ctx.package_manager = 'poetry'
-        elif (root / 'Pipfile.lock').exists():
+        elif 'Pipfile.lock' in names:
             ctx.package_manager = 'pipenv'
-        elif (root / 'uv.lock').exists():
+        elif 'uv.lock' in names:
             ctx.package_manager = 'uv'
         else:
             ctx.package_manager = 'pip'
 
-        if (root / 'pytest.ini').exists() or (root / 'conftest.py').exists():
+        if 'pytest.ini' in names or 'conftest.py' in names:
             ctx.test_runner = 'pytest'
 
     # Detect Go projects
-    if (root / 'go.mod').exists():
+    if 'go.mod' in names:
         ctx.runtime = 'go'
         ctx.package_manager = 'go'
 
     # Detect Rust projects
-    if (root / 'Cargo.toml').exists():
+    if 'Cargo.toml' in names:
         ctx.runtime = 'rust'
         ctx.package_manager = 'cargo'
 
@@ -186,12 +191,12 @@ def detect_project_context(cwd: Optional[str] = None) -> ProjectContext:
     env_patterns = ['.env', '.env.local', '.env.development', '.env.production']
     for pattern in env_patterns:
         env_file = root / pattern
-        if env_file.exists():
+        if pattern in names:
             ctx.env_files.append(str(env_file))
 
     # Parse CLAUDE.md for hints
     claude_md = root / 'CLAUDE.md'
-    if claude_md.exists():
+    if claude_md.name in names:
         try:
             content = claude_md.read_text()
             # Extract key hints (lines starting with - in CLAUDE.md)
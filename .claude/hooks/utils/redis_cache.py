@@ -15,11 +15,14 @@ import re
 import json
 import time
 import hashlib
-import fcntl
+import mmap
+import struct
 import threading
 from pathlib import Path
 from typing import Optional, Dict, Any
 
+from utils.fastjson import dumps
+
 # Load environment from ~/.env or project .env if available
 try:
     from dotenv import load_dotenv
@@ -59,13 +62,41 @@ VALID_STREAM_NAME = re.compile(r'^[a-zA-Z0-9_-]+$')
 
 # Fallback file locations
 FALLBACK_CACHE_DIR = Path('/tmp/claude-hooks-cache')
-FALLBACK_DEDUP_FILE = FALLBACK_CACHE_DIR / 'dedup.json'
 FALLBACK_AUDIO_DIR = FALLBACK_CACHE_DIR / 'audio'
 
 # TTL settings
 DEDUP_TTL_SECONDS = 5
 AUDIO_TTL_HOURS = 24
 
+# Fallback dedup table: fixed-size (key hash, timestamp) slots in a shared
+# memory-mapped file, probed linearly from key hash % DEDUP_SLOTS. Threads of
+# one process take HookCache._dedup_lock; writes from separate processes are
+# unlocked, where a torn or lost slot costs at most one duplicate send
+DEDUP_RECORD = struct.Struct('<Qd')
+DEDUP_SLOTS = 4096  # 64 KB table
+DEDUP_PROBE_LIMIT = 8
+_SHM_DIR = Path('/dev/shm')  # RAM-backed where available
+FALLBACK_DEDUP_FILE = (
+    _SHM_DIR / f'claude-hooks-dedup-{os.getuid()}.bin' if _SHM_DIR.is_dir()
+    else FALLBACK_CACHE_DIR / 'dedup.bin'
+)
+
+# Per-process memo of recent dedup keys is pruned once it grows past this
+RECENT_EVENTS_PRUNE_SIZE = 100
+
+# Socket timeout for regular commands (blocking reads add their block time)
+SOCKET_TIMEOUT_SECONDS = 2
+
+
+# Stream entries hold the whole event as one JSON document in this field
+# (entries queued by older versions have one field per event key instead)
+EVENT_FIELD = 'data'
+
+
+def _encode_event(event_data: Dict[str, Any]) -> Dict[str, bytes]:
+    """Serialize an event into a single-field Redis stream entry."""
+    return {EVENT_FIELD: dumps(event_data)}
+
 
 class HookCache:
     """
@@ -75,29 +106,56 @@ class HookCache:
 
     def __init__(self):
         self.redis: Optional['redis.Redis'] = None
+        self._blocking_readers: Dict[int, 'redis.Redis'] = {}
+        self._xautoclaim_supported = True
+        self._recent_events: Dict[str, float] = {}
+        self._dedup_map: Optional[mmap.mmap] = None
+        # The event daemon checks events from several threads at once
+        self._dedup_lock = threading.Lock()
         self._init_redis()
         self._init_fallback_dirs()
 
+    @staticmethod
+    def _connect(socket_timeout: float) -> 'redis.Redis':
+        """Create a Redis client (each client keeps its own connection pool)."""
+        return redis.Redis(
+            host=REDIS_HOST,
+            port=REDIS_PORT,
+            db=REDIS_DB,
+            password=REDIS_PASSWORD,
+            socket_connect_timeout=2,
+            socket_timeout=socket_timeout,
+            decode_responses=False  # For binary audio data
+        )
+
     def _init_redis(self) -> None:
         """Initialize Redis connection if available."""
         if not REDIS_AVAILABLE or not REDIS_ENABLED:
             return
 
         try:
-            self.redis = redis.Redis(
-                host=REDIS_HOST,
-                port=REDIS_PORT,
-                db=REDIS_DB,
-                password=REDIS_PASSWORD,
-                socket_connect_timeout=2,
-                socket_timeout=2,
-                decode_responses=False  # For binary audio data
-            )
+            self.redis = self._connect(SOCKET_TIMEOUT_SECONDS)
             self.redis.ping()
         except Exception as e:
             print(f"[HookCache] Redis unavailable, using file fallback: {e}")
             self.redis = None
 
+    def _blocking_reader(self, block_ms: int) -> 'redis.Redis':
+        """
+        Client for stream reads that block for up to block_ms.
+
+        A read blocking longer than the shared client's socket timeout would be
+        cut off with a timeout error and retried (polling instead of waiting),
+        so blocking reads use a client whose timeout covers the block time.
+        """
+        if block_ms <= 0:
+            return self.redis
+        reader = self._blocking_readers.get(block_ms)
+        if reader is None:
+            reader = self._connect(block_ms / 1000 + SOCKET_TIMEOUT_SECONDS)
+            self._blocking_readers[block_ms] = reader
+        return reader
+
     def _init_fallback_dirs(self) -> None:
         """Create fallback directories if needed."""
         try:
@@ -134,9 +192,32 @@ class HookCache:
         """
         key = self._make_dedup_key(event_type, session_id, content_hash)
 
+        # Keys this process has already seen (long-running processes like the
+        # event daemon) are answered without a Redis round trip or table probe
+        now = time.monotonic()
+        with self._dedup_lock:
+            seen_at = self._recent_events.get(key)
+        if seen_at is not None and now - seen_at < ttl_seconds:
+            print(f"[HookCache] Duplicate event: {key}")
+            return True
+
         if self.redis:
-            return self._redis_check_duplicate(key, ttl_seconds)
-        return self._file_check_duplicate(key, ttl_seconds)
+            is_duplicate = self._redis_check_duplicate(key, ttl_seconds)
+        else:
+            is_duplicate = self._file_check_duplicate(key, ttl_seconds)
+
+        if not is_duplicate:
+            self._remember_event(key, now, ttl_seconds)
+        return is_duplicate
+
+    def _remember_event(self, key: str, now: float, ttl_seconds: int) -> None:
+        """Record a new key in the per-process memo, evicting expired keys."""
+        with self._dedup_lock:
+            if len(self._recent_events) >= RECENT_EVENTS_PRUNE_SIZE:
+                self._recent_events = {
+                    k: t for k, t in self._recent_events.items() if now - t < ttl_seconds
+                }
+            self._recent_events[key] = now
 
     def _make_dedup_key(
         self,
@@ -144,12 +225,14 @@ class HookCache:
         session_id: str,
         content_hash: Optional[str] = None
     ) -> str:
-        """Generate unique dedup key using SHA256."""
+        """Generate unique dedup key (64-bit BLAKE2b digest of the parts)."""
         parts = [event_type, session_id]
         if content_hash:
             parts.append(content_hash)
         key_data = ":".join(parts)
-        return f"dedup:{hashlib.sha256(key_data.encode()).hexdigest()[:16]}"
+        # Keys are shared across processes (Redis, dedup table), so the hash must
+        # be stable; BLAKE2b with an 8-byte digest needs no truncation
+        return f"dedup:{hashlib.blake2b(key_data.encode(), digest_size=8).hexdigest()}"
 
     def _redis_check_duplicate(self, key: str, ttl_seconds: int) -> bool:
         """Check duplicate using Redis SETNX (atomic)."""
@@ -165,24 +248,58 @@ class HookCache:
             print(f"[HookCache] Redis error, falling back to file: {e}")
             return self._file_check_duplicate(key, ttl_seconds)
 
+    def _dedup_table(self) -> Optional[mmap.mmap]:
+        """Map the shared dedup table (created zero-filled on first use)."""
+        if self._dedup_map is None:
+            table_size = DEDUP_SLOTS * DEDUP_RECORD.size
+            try:
+                fd = os.open(FALLBACK_DEDUP_FILE, os.O_RDWR | os.O_CREAT, 0o600)
+                try:
+                    if os.fstat(fd).st_size < table_size:
+                        os.ftruncate(fd, table_size)
+                    self._dedup_map = mmap.mmap(fd, table_size)
+                finally:
+                    os.close(fd)  # The mapping stays valid
+            except (OSError, ValueError) as e:
+                print(f"[HookCache] Dedup table unavailable: {e}")
+        return self._dedup_map
+
     def _file_check_duplicate(self, key: str, ttl_seconds: int) -> bool:
-        """Check duplicate using file-based cache."""
-        cache = self._load_file_cache(FALLBACK_DEDUP_FILE)
-        current_time = time.time()
+        """Check duplicate using the shared memory-mapped dedup table."""
+        # Probe and claim a slot as one step for this process's threads
+        with self._dedup_lock:
+            return self._file_check_duplicate_locked(key, ttl_seconds)
+
+    def _file_check_duplicate_locked(self, key: str, ttl_seconds: int) -> bool:
+        """_file_check_duplicate() body; the caller holds _dedup_lock."""
+        table = self._dedup_table()
+        if table is None:
+            return False
 
-        # Check if recently processed
-        if key in cache:
-            if current_time - cache[key] < ttl_seconds:
+        # Slot 0 hashes mark never-used slots
+        key_hash = int(key.rpartition(':')[2], 16) or 1
+        current_time = time.time()
+        start = key_hash % DEDUP_SLOTS
+
+        # Probe a short run of slots: a live match means duplicate; otherwise
+        # take the first empty or expired slot, else the oldest one seen
+        free_slot = None
+        oldest_slot, oldest_time = start, float('inf')
+        for i in range(DEDUP_PROBE_LIMIT):
+            slot = (start + i) % DEDUP_SLOTS
+            slot_hash, slot_time = DEDUP_RECORD.unpack_from(table, slot * DEDUP_RECORD.size)
+            expired = current_time - slot_time >= ttl_seconds
+            if slot_hash == key_hash and not expired:
                 print(f"[HookCache] Duplicate event (file): {key}")
                 return True
+            if free_slot is None and (slot_hash == 0 or expired):
+                free_slot = slot
+            if slot_time < oldest_time:
+                oldest_slot, oldest_time = slot, slot_time
 
         # Mark as processed
-        cache[key] = current_time
-
-        # Cleanup old entries
-        cache = {k: v for k, v in cache.items() if current_time - v < ttl_seconds * 2}
-
-        self._save_file_cache(FALLBACK_DEDUP_FILE, cache)
+        slot = oldest_slot if free_slot is None else free_slot
+        DEDUP_RECORD.pack_into(table, slot * DEDUP_RECORD.size, key_hash, current_time)
         return False
 
     # ========== Audio Caching ==========
@@ -275,7 +392,8 @@ class HookCache:
     def queue_event(
         self,
         event_data: Dict[str, Any],
-        stream: str = "hook_events"
+        stream: str = "hook_events",
+        encoded: Optional[bytes] = None
     ) -> bool:
         """
         Queue event for async processing using Redis Streams.
@@ -283,6 +401,7 @@ class HookCache:
         Args:
             event_data: Event data to queue
             stream: Redis stream name (alphanumeric, underscore, hyphen only)
+            encoded: event_data already serialized as JSON (skips re-encoding)
 
         Returns:
             True if queued successfully
@@ -296,12 +415,8 @@ class HookCache:
             return False
 
         try:
-            # Convert to string values for Redis
-            flat_data = {
-                k: json.dumps(v) if isinstance(v, (dict, list)) else str(v)
-                for k, v in event_data.items()
-            }
-            self.redis.xadd(stream, flat_data, maxlen=1000)
+            entry = {EVENT_FIELD: encoded} if encoded is not None else _encode_event(event_data)
+            self.redis.xadd(stream, entry, maxlen=1000)
             return True
         except Exception as e:
             print(f"[HookCache] Queue error: {e}")
@@ -401,7 +516,7 @@ class HookCache:
 
         try:
             # '>' means only new messages not yet delivered to this group
-            events = self.redis.xreadgroup(
+            events = self._blocking_reader(block_ms).xreadgroup(
                 group, consumer,
                 {stream: '>'},
                 count=count,
@@ -443,6 +558,80 @@ class HookCache:
             print(f"[HookCache] ACK error: {e}")
             return False
 
+    def ack_events(
+        self,
+        event_ids: list,
+        stream: str = "hook_events",
+        group: str = "event_processors"
+    ) -> bool:
+        """
+        Acknowledge several events with a single XACK.
+
+        Args:
+            event_ids: Redis stream event IDs
+            stream: Redis stream name
+            group: Consumer group name
+
+        Returns:
+            True if acknowledged
+        """
+        if not self.redis:
+            return False
+        if not event_ids:
+            return True
+
+        try:
+            self.redis.xack(stream, group, *event_ids)
+            return True
+        except Exception as e:
+            print(f"[HookCache] ACK error: {e}")
+            return False
+
+    def ack_and_queue(
+        self,
+        event_ids: list,
+        dead_letters: list,
+        stream: str = "hook_events",
+        group: str = "event_processors",
+        dlq_stream: str = "hook_events_dlq"
+    ) -> bool:
+        """
+        Acknowledge events and queue dead letters in one round trip.
+
+        The XACK runs before the XADDs (a pipeline keeps command order), so a
+        failed DLQ write can't leave an event both pending and dead-lettered.
+
+        Args:
+            event_ids: Redis stream event IDs to acknowledge
+            dead_letters: Stream entries (field -> str/bytes value) to append
+                to dlq_stream as they are
+            stream: Redis stream name
+            group: Consumer group name
+            dlq_stream: Dead letter stream name
+
+        Returns:
+            True if every command succeeded
+        """
+        if not self.redis:
+            return False
+        if not event_ids and not dead_letters:
+            return True
+        if dead_letters and not VALID_STREAM_NAME.match(dlq_stream):
+            print(f"[HookCache] Invalid stream name: {dlq_stream}")
+            return False
+
+        try:
+            pipe = self.redis.pipeline(transaction=False)
+            if event_ids:
+                pipe.xack(stream, group, *event_ids)
+            for entry in dead_letters:
+                pipe.xadd(dlq_stream, entry, maxlen=1000)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"[HookCache] ACK/DLQ error: {e}")
+            return False
+
     def get_pending_events(
         self,
         stream: str = "hook_events",
@@ -516,30 +705,54 @@ class HookCache:
             return []
 
         try:
-            # Get pending events
-            pending = self.redis.xpending_range(stream, group, '-', '+', count)
-            stale_ids = [
-                p['message_id'] for p in pending
-                if p['time_since_delivered'] >= min_idle_ms
-            ]
-
-            if not stale_ids:
-                return []
-
-            # Claim the stale events
-            claimed = self.redis.xclaim(
-                stream, group, consumer,
-                min_idle_time=min_idle_ms,
-                message_ids=stale_ids
-            )
-
+            claimed = None
+            if self._xautoclaim_supported:
+                try:
+                    # XAUTOCLAIM (Redis 6.2+) finds and claims idle events in one call
+                    claimed = self.redis.xautoclaim(
+                        stream, group, consumer,
+                        min_idle_time=min_idle_ms,
+                        start_id='0-0',
+                        count=count
+                    )[1]
+                except redis.ResponseError:
+                    self._xautoclaim_supported = False  # Older server
+
+            if claimed is None:
+                claimed = self._pending_claim(stream, group, consumer, min_idle_ms, count)
+
+            # Entries deleted while pending come back without data
             return [(e[0].decode(), {
                 k.decode(): v.decode() for k, v in e[1].items()
-            }) for e in claimed]
+            }) for e in claimed if e[1]]
         except Exception as e:
             print(f"[HookCache] Claim error: {e}")
             return []
 
+    def _pending_claim(
+        self,
+        stream: str,
+        group: str,
+        consumer: str,
+        min_idle_ms: int,
+        count: int
+    ) -> list:
+        """Claim stale events with XPENDING + XCLAIM (servers without XAUTOCLAIM)."""
+        pending = self.redis.xpending_range(stream, group, '-', '+', count)
+        stale_ids = [
+            p['message_id'] for p in pending
+            if p['time_since_delivered'] >= min_idle_ms
+        ]
+
+        if not stale_ids:
+            return []
+
+        return self.redis.xclaim(
+            stream, group, consumer,
+            min_idle_time=min_idle_ms,
+            message_ids=stale_ids
+        )
+
     # ========== Session Context ==========
 
     def set_session_context(
@@ -574,36 +787,6 @@ class HookCache:
         except Exception:
             return None
 
-    # ========== Utility Methods ==========
-
-    def _load_file_cache(self, path: Path) -> dict:
-        """Load JSON cache from file with atomic locking (no TOCTOU)."""
-        try:
-            # Use a+ mode to avoid race condition between exists() and open()
-            with open(path, 'a+') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_SH)
-                try:
-                    f.seek(0)
-                    content = f.read()
-                    return json.loads(content) if content.strip() else {}
-                finally:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-        except (json.JSONDecodeError, OSError) as e:
-            print(f"[HookCache] Load error: {e}")
-            return {}
-
-    def _save_file_cache(self, path: Path, data: dict) -> None:
-        """Save JSON cache to file with locking."""
-        try:
-            with open(path, 'w') as f:
-                fcntl.flock(f.fileno(), fcntl.LOCK_EX)
-                try:
-                    json.dump(data, f)
-                finally:
-                    fcntl.flock(f.fileno(), fcntl.LOCK_UN)
-        except OSError as e:
-            print(f"[HookCache] Save error: {e}")
-
 
 # Global singleton instance with thread safety
 _cache_instance: Optional[HookCache] = None
@@ -629,7 +812,7 @@ def get_content_hash(data: dict) -> str:
         data: Event data dictionary
 
     Returns:
-        Short hash string (SHA256-based)
+        Short hash string (32-bit BLAKE2b digest)
     """
     relevant_fields = ['tool_name', 'message', 'title', 'level']
     content_parts = []
@@ -641,4 +824,4 @@ def get_content_hash(data: dict) -> str:
     if not content_parts:
         content_parts = [json.dumps(data, sort_keys=True)]
 
-    return hashlib.sha256(":".join(content_parts).encode()).hexdigest()[:8]
+    return hashlib.blake2b(":".join(content_parts).encode(), digest_size=4).hexdigest()
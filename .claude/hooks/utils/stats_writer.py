@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+Background session statistics writer for the SessionEnd hook.
+
+Counting transcript lines is O(transcript size), so the hook hands the work to
+a detached child process and returns immediately. The child appends one entry
+to logs/session_statistics.<session_id>.jsonl (relative to the working
+directory it inherits from the hook).
+
+Usage:
+    stats_writer.py <session_id> <reason> <transcript_path> <ended_at>
+"""
+
+import os
+import subprocess
+import sys
+from datetime import datetime
+from pathlib import Path
+
+# Allow `utils.*` imports when run directly as the writer process
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from utils.jsonl_log import append_jsonl, count_lines, session_file_id
+
+
+def save_session_statistics(session_id: str, reason: str, transcript_path: str,
+                            ended_at: str) -> None:
+    """Count transcript messages and append the session's statistics entry."""
+    # Count messages in transcript if available (JSONL format - one per line)
+    message_count = count_lines(transcript_path) if transcript_path else 0
+
+    stats_dir = Path("logs")
+    stats_dir.mkdir(parents=True, exist_ok=True)
+    stats_file = stats_dir / f'session_statistics.{session_file_id(session_id)}.jsonl'
+
+    append_jsonl(stats_file, {
+        "session_id": session_id,
+        "ended_at": ended_at,
+        "reason": reason,
+        "message_count": message_count
+    })
+
+
+def spawn_stats_writer(session_id: str, reason: str, transcript_path: str) -> None:
+    """
+    Save session statistics in a detached child process (fire-and-forget).
+
+    The end timestamp is taken now so it reflects when the session ended,
+    not when the child gets scheduled.
+    """
+    subprocess.Popen(
+        [sys.executable, os.path.abspath(__file__),
+         session_id, reason, transcript_path or '', datetime.now().isoformat()],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.DEVNULL,
+        start_new_session=True,
+    )
+
+
+if __name__ == "__main__":
+    if len(sys.argv) == 5:
+        try:
+            save_session_statistics(*sys.argv[1:])
+        except Exception:
+            pass  # Statistics are best-effort
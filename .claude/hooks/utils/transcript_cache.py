@@ -0,0 +1,103 @@
+#!/usr/bin/env python3
+"""
+Incremental transcript reader for --add-chat.
+
+Transcripts are append-only .jsonl files that grow with every turn, and
+--add-chat sends the whole parsed transcript with each event. read_transcript()
+remembers how far into each transcript it has parsed and, while the file keeps
+growing in place, parses only the lines appended since the last call. Repeat
+reads are then proportional to the new lines instead of the whole session.
+
+The memo is per process, so the savings show up in long-running processes
+(the event daemon); one-shot hooks parse the transcript once, as before.
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, List, NamedTuple
+
+from utils.fastjson import loads
+
+# Transcripts remembered at once (least recently read dropped first)
+MAX_CACHED_TRANSCRIPTS = 8
+
+# Bytes before the parsed offset that must be unchanged for the parsed
+# entries to be reused (catches a file rewritten in place)
+CHECK_BYTES = 64
+
+
+class _Parsed(NamedTuple):
+    inode: tuple  # (st_dev, st_ino): a replaced file starts over
+    offset: int  # Bytes consumed (always just past a newline)
+    check: bytes  # The last CHECK_BYTES bytes consumed
+    entries: List[Any]
+
+
+_cache: 'OrderedDict[str, _Parsed]' = OrderedDict()
+_lock = threading.Lock()
+
+
+def _parse_lines(data: bytes, entries: List[Any]) -> None:
+    """Append each valid JSON line in data to entries (others are skipped)."""
+    for line in data.split(b'\n'):
+        line = line.strip()
+        if line:
+            try:
+                entries.append(loads(line))
+            except ValueError:
+                pass  # Skip invalid lines
+
+
+def read_transcript(transcript_path: str) -> List[Any]:
+    """
+    Parse a .jsonl transcript into a list of entries.
+
+    Args:
+        transcript_path: Path to the .jsonl transcript file
+
+    Returns:
+        Parsed entries in file order (blank and invalid lines skipped). The
+        list is the caller's own; later reads don't change it.
+
+    Raises:
+        OSError: The transcript can't be read
+    """
+    with open(transcript_path, 'rb') as f:
+        st = os.fstat(f.fileno())
+        inode = (st.st_dev, st.st_ino)
+
+        with _lock:
+            cached = _cache.get(transcript_path)
+        if cached is not None and cached.inode == inode and cached.offset <= st.st_size:
+            f.seek(cached.offset - len(cached.check))
+            data = f.read()
+            if data.startswith(cached.check):
+                data = data[len(cached.check):]
+            else:
+                cached = None  # Rewritten in place
+        else:
+            cached = None  # New, replaced or truncated
+
+        if cached is None:
+            cached = _Parsed(inode, 0, b'', [])
+            f.seek(0)
+            data = f.read()
+
+    # Only complete lines are remembered: the last line may still be mid-write
+    complete_end = data.rfind(b'\n') + 1
+    new_entries: List[Any] = []
+    _parse_lines(data[:complete_end], new_entries)
+    entries = cached.entries + new_entries
+    check = (cached.check + data[max(0, complete_end - CHECK_BYTES):complete_end])[-CHECK_BYTES:]
+
+    with _lock:
+        _cache[transcript_path] = _Parsed(inode, cached.offset + complete_end, check, entries)
+        _cache.move_to_end(transcript_path)
+        while len(_cache) > MAX_CACHED_TRANSCRIPTS:
+            _cache.popitem(last=False)
+
+    # A final line without a newline still counts if it already parses
+    tail_entries: List[Any] = []
+    _parse_lines(data[complete_end:], tail_entries)
+    return entries + tail_entries
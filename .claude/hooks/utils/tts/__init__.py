@@ -0,0 +1,98 @@
+"""
+Text-to-speech helpers for Claude Code hooks.
+
+Each utils/tts/*_tts.py script exposes speak(text) and can also be run as a
+standalone `uv run` script. Hooks call speak_with() below, which runs the
+script's speak() in-process when its dependencies import here - skipping the
+fork, interpreter start-up and venv resolution of `uv run` - and only falls
+back to `uv run <script>` when they don't. speak_detached() does the same
+from a detached child process so announcements never delay the hook.
+"""
+
+import importlib
+import subprocess
+import sys
+import threading
+from pathlib import Path
+from typing import Optional, Union
+
+HOOKS_DIR = Path(__file__).resolve().parent.parent.parent
+
+# Upper bound on playback in a detached speaker process
+DETACHED_TIMEOUT_SECONDS = 60
+
+
+def _speak_in_process(module_name: str, text: str, timeout: float) -> bool:
+    """
+    Run utils.tts.<module_name>.speak(text), waiting at most timeout seconds.
+
+    Returns:
+        False if the module or its TTS engine can't be imported in this
+        process (the caller should fall back to `uv run`), True otherwise
+    """
+    try:
+        module = importlib.import_module(f"utils.tts.{module_name}")
+    except ImportError:
+        return False
+
+    error: list = []
+
+    def run():
+        try:
+            module.speak(text)
+        except BaseException as e:  # Reported to the caller below
+            error.append(e)
+
+    # A daemon thread bounds the wait like the subprocess timeout did: if
+    # playback overruns, the hook returns and the thread dies with the process
+    worker = threading.Thread(target=run, daemon=True)
+    worker.start()
+    worker.join(timeout)
+    return not (error and isinstance(error[0], ImportError))
+
+
+def speak_with(script_path: Union[str, Path], text: str,
+               timeout: Optional[float] = 10) -> None:
+    """
+    Speak text with the given utils/tts script (best-effort, never raises).
+
+    Args:
+        script_path: Path to a utils/tts/*_tts.py script
+        text: Text to speak
+        timeout: Maximum seconds to wait for playback
+    """
+    try:
+        if _speak_in_process(Path(script_path).stem, text, timeout):
+            return
+        subprocess.run(
+            ["uv", "run", str(script_path), text],
+            capture_output=True,  # Suppress output
+            timeout=timeout,
+        )
+    except Exception:
+        pass  # TTS is optional
+
+
+def speak_detached(script_path: Union[str, Path], text: str) -> None:
+    """
+    Speak text from a detached child process and return immediately.
+
+    The child (`python -m utils.tts`) runs speak_with() in its own session,
+    so the hook doesn't wait for playback and exiting doesn't cut it off.
+
+    Args:
+        script_path: Path to a utils/tts/*_tts.py script
+        text: Text to speak
+    """
+    try:
+        subprocess.Popen(
+            [sys.executable, "-m", "utils.tts", str(script_path), text],
+            cwd=HOOKS_DIR,  # -m resolves utils.tts from the working directory
+            stdin=subprocess.DEVNULL,
+            stdout=subprocess.DEVNULL,
+            stderr=subprocess.DEVNULL,
+            start_new_session=True,
+            close_fds=True,
+        )
+    except Exception:
+        pass  # TTS is optional
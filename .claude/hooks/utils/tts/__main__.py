@@ -0,0 +1,13 @@
+"""
+Detached speaker process started by speak_detached().
+
+Usage:
+    python -m utils.tts <script_path> <text>
+"""
+
+import sys
+
+from utils.tts import DETACHED_TIMEOUT_SECONDS, speak_with
+
+if __name__ == "__main__" and len(sys.argv) == 3:
+    speak_with(sys.argv[1], sys.argv[2], timeout=DETACHED_TIMEOUT_SECONDS)
@@ -28,6 +28,55 @@ try:
 except ImportError:
     CACHE_AVAILABLE = False
 
+def speak(text):
+    """
+    Speak text with ElevenLabs Flash v2.5 in the current process.
+
+    Reuses cached audio for repeated messages. Raises ImportError if the
+    elevenlabs package is not installed and RuntimeError if no API key is set.
+
+    Returns:
+        True if the audio came from the cache
+    """
+    from elevenlabs.client import ElevenLabs
+    from elevenlabs.play import play
+
+    api_key = os.getenv('ELEVENLABS_API_KEY')
+    if not api_key:
+        raise RuntimeError("ELEVENLABS_API_KEY not set")
+
+    # Get voice ID from environment or use default (Rachel)
+    voice_id = os.getenv('ELEVENLABS_VOICE_ID', '21m00Tcm4TlvDq8ikWAM')
+    audio_bytes = None
+    cache_hit = False
+
+    # Check cache first
+    if CACHE_AVAILABLE:
+        cache = get_hook_cache()
+        audio_bytes = cache.get_cached_audio(text, voice_id)
+        cache_hit = bool(audio_bytes)
+
+    # Generate audio if not cached
+    if not audio_bytes:
+        elevenlabs = ElevenLabs(api_key=api_key)
+        audio_generator = elevenlabs.text_to_speech.convert(
+            text=text,
+            voice_id=voice_id,
+            model_id="eleven_flash_v2_5",
+            output_format="mp3_44100_128",
+        )
+        # Collect all bytes from generator
+        audio_bytes = b''.join(audio_generator)
+
+        # Cache the audio for future use
+        if CACHE_AVAILABLE and audio_bytes:
+            get_hook_cache().cache_audio(text, audio_bytes, voice_id)
+
+    # Play the audio
+    play(io.BytesIO(audio_bytes))
+    return cache_hit
+
+
 def main():
     """
     ElevenLabs Flash v2.5 TTS Script
@@ -59,12 +108,6 @@ def main():
         sys.exit(1)
 
     try:
-        from elevenlabs.client import ElevenLabs
-        from elevenlabs.play import play
-
-        # Initialize client
-        elevenlabs = ElevenLabs(api_key=api_key)
-
         print("🎙️  ElevenLabs Flash v2.5 TTS")
         print("=" * 40)
 
@@ -78,42 +121,11 @@ def main():
         print("🔊 Generating and playing...")
 
         try:
-            # Get voice ID from environment or use default (Rachel)
-            voice_id = os.getenv('ELEVENLABS_VOICE_ID', '21m00Tcm4TlvDq8ikWAM')
-            audio_bytes = None
-            cache_hit = False
-
-            # Check cache first
-            if CACHE_AVAILABLE:
-                cache = get_hook_cache()
-                cached_audio = cache.get_cached_audio(text, voice_id)
-                if cached_audio:
-                    print("📦 Cache hit! Playing cached audio...")
-                    audio_bytes = cached_audio
-                    cache_hit = True
-
-            # Generate audio if not cached
-            if not audio_bytes:
-                print("🔊 Generating audio...")
-                audio_generator = elevenlabs.text_to_speech.convert(
-                    text=text,
-                    voice_id=voice_id,
-                    model_id="eleven_flash_v2_5",
-                    output_format="mp3_44100_128",
-                )
-                # Collect all bytes from generator
-                audio_bytes = b''.join(audio_generator)
-
-                # Cache the audio for future use
-                if CACHE_AVAILABLE and audio_bytes:
-                    cache = get_hook_cache()
-                    if cache.cache_audio(text, audio_bytes, voice_id):
-                        print("💾 Audio cached for future use")
-
-            # Play the audio
-            play(io.BytesIO(audio_bytes))
+            cache_hit = speak(text)
             print("✅ Playback complete!" + (" (from cache)" if cache_hit else ""))
 
+        except ImportError:
+            raise
         except Exception as e:
             print(f"❌ Error: {e}")
 
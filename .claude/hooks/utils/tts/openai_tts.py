@@ -12,7 +12,6 @@
 import os
 import sys
 import asyncio
-import io
 import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
@@ -27,6 +26,93 @@ except ImportError:
     CACHE_AVAILABLE = False
 
 
+def _play_mp3(audio_bytes):
+    """
+    Play mp3 bytes through ffplay or mpv via a temp file.
+
+    Returns:
+        True if a player was found
+    """
+    import subprocess
+
+    with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
+        f.write(audio_bytes)
+        temp_path = f.name
+    try:
+        for player in (['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet'],
+                       ['mpv', '--no-video']):
+            try:
+                subprocess.run(player + [temp_path], capture_output=True, timeout=30)
+                return True
+            except (FileNotFoundError, subprocess.TimeoutExpired):
+                continue
+        return False
+    finally:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+
+
+async def speak_async(text):
+    """
+    Speak text with OpenAI TTS (gpt-4o-mini-tts, Nova voice).
+
+    Reuses cached audio for repeated messages. Raises ImportError if the
+    openai package is not installed and RuntimeError if no API key is set.
+
+    Returns:
+        True if the audio came from the cache
+    """
+    from openai import AsyncOpenAI
+    from openai.helpers import LocalAudioPlayer
+
+    api_key = os.getenv("OPENAI_API_KEY")
+    if not api_key:
+        raise RuntimeError("OPENAI_API_KEY not set")
+
+    voice = "nova"
+    audio_bytes = None
+
+    # Check cache first
+    if CACHE_AVAILABLE:
+        cache = get_hook_cache()
+        audio_bytes = cache.get_cached_audio(text, f"openai-{voice}")
+    if audio_bytes:
+        _play_mp3(audio_bytes)
+        return True
+
+    # Generate audio using OpenAI TTS (non-streaming for caching)
+    openai = AsyncOpenAI(api_key=api_key)
+    response = await openai.audio.speech.create(
+        model="gpt-4o-mini-tts",
+        voice=voice,
+        input=text,
+        instructions="Speak in a cheerful, positive yet professional tone.",
+        response_format="mp3",
+    )
+    audio_bytes = response.content
+
+    # Cache the audio for future use
+    if CACHE_AVAILABLE and audio_bytes:
+        get_hook_cache().cache_audio(text, audio_bytes, f"openai-{voice}")
+
+    # Play the generated audio; last resort is streaming via LocalAudioPlayer
+    if not _play_mp3(audio_bytes):
+        async with openai.audio.speech.with_streaming_response.create(
+            model="gpt-4o-mini-tts",
+            voice=voice,
+            input=text,
+            instructions="Speak in a cheerful, positive yet professional tone.",
+            response_format="mp3",
+        ) as stream_response:
+            await LocalAudioPlayer().play(stream_response)
+    return False
+
+
+def speak(text):
+    """Speak text with OpenAI TTS in the current process (see speak_async)."""
+    return asyncio.run(speak_async(text))
+
+
 async def main():
     """
     OpenAI TTS Script
@@ -57,12 +143,6 @@ async def main():
         sys.exit(1)
 
     try:
-        from openai import AsyncOpenAI
-        from openai.helpers import LocalAudioPlayer
-
-        # Initialize OpenAI client
-        openai = AsyncOpenAI(api_key=api_key)
-
         print("🎙️  OpenAI TTS")
         print("=" * 20)
 
@@ -74,85 +154,12 @@ async def main():
 
         print(f"🎯 Text: {text}")
 
-        voice = "nova"
-        audio_bytes = None
-        cache_hit = False
-
-        # Check cache first
-        if CACHE_AVAILABLE:
-            cache = get_hook_cache()
-            cached_audio = cache.get_cached_audio(text, f"openai-{voice}")
-            if cached_audio:
-                print("📦 Cache hit! Playing cached audio...")
-                audio_bytes = cached_audio
-                cache_hit = True
-
         try:
-            if audio_bytes:
-                # Play cached audio using temp file
-                with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
-                    f.write(audio_bytes)
-                    temp_path = f.name
-                try:
-                    import subprocess
-                    # Use ffplay or similar to play the audio
-                    subprocess.run(['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', temp_path],
-                                   capture_output=True, timeout=30)
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    # Fallback: try mpv
-                    try:
-                        subprocess.run(['mpv', '--no-video', temp_path],
-                                       capture_output=True, timeout=30)
-                    except (FileNotFoundError, subprocess.TimeoutExpired):
-                        print("⚠️ Could not play cached audio (no player found)")
-                finally:
-                    os.unlink(temp_path)
-            else:
-                print("🔊 Generating audio...")
-                # Generate audio using OpenAI TTS (non-streaming for caching)
-                response = await openai.audio.speech.create(
-                    model="gpt-4o-mini-tts",
-                    voice=voice,
-                    input=text,
-                    instructions="Speak in a cheerful, positive yet professional tone.",
-                    response_format="mp3",
-                )
-                audio_bytes = response.content
-
-                # Cache the audio for future use
-                if CACHE_AVAILABLE and audio_bytes:
-                    cache = get_hook_cache()
-                    if cache.cache_audio(text, audio_bytes, f"openai-{voice}"):
-                        print("💾 Audio cached for future use")
-
-                # Play the generated audio via temp file
-                with tempfile.NamedTemporaryFile(suffix='.mp3', delete=False) as f:
-                    f.write(audio_bytes)
-                    temp_path = f.name
-                try:
-                    import subprocess
-                    subprocess.run(['ffplay', '-nodisp', '-autoexit', '-loglevel', 'quiet', temp_path],
-                                   capture_output=True, timeout=30)
-                except (FileNotFoundError, subprocess.TimeoutExpired):
-                    try:
-                        subprocess.run(['mpv', '--no-video', temp_path],
-                                       capture_output=True, timeout=30)
-                    except (FileNotFoundError, subprocess.TimeoutExpired):
-                        # Last resort: try LocalAudioPlayer with streaming
-                        async with openai.audio.speech.with_streaming_response.create(
-                            model="gpt-4o-mini-tts",
-                            voice=voice,
-                            input=text,
-                            instructions="Speak in a cheerful, positive yet professional tone.",
-                            response_format="mp3",
-                        ) as stream_response:
-                            await LocalAudioPlayer().play(stream_response)
-                finally:
-                    if os.path.exists(temp_path):
-                        os.unlink(temp_path)
-
+            cache_hit = await speak_async(text)
             print("✅ Playback complete!" + (" (from cache)" if cache_hit else ""))
 
+        except ImportError:
+            raise
         except Exception as e:
             print(f"❌ Error: {e}")
 
@@ -9,6 +9,23 @@
 import sys
 import random
 
+
+def speak(text):
+    """
+    Speak text with pyttsx3 in the current process.
+
+    Lets hooks that already have pyttsx3 available skip the `uv run`
+    subprocess. Raises ImportError if pyttsx3 is not installed.
+    """
+    import pyttsx3
+
+    engine = pyttsx3.init()
+    engine.setProperty('rate', 180)    # Speech rate (words per minute)
+    engine.setProperty('volume', 0.8)  # Volume (0.0 to 1.0)
+    engine.say(text)
+    engine.runAndWait()
+
+
 def main():
     """
     pyttsx3 TTS Script
@@ -28,15 +45,6 @@ def main():
     """
     
     try:
-        import pyttsx3
-        
-        # Initialize TTS engine
-        engine = pyttsx3.init()
-        
-        # Configure engine settings
-        engine.setProperty('rate', 180)    # Speech rate (words per minute)
-        engine.setProperty('volume', 0.8)  # Volume (0.0 to 1.0)
-        
         print("🎙️  pyttsx3 TTS")
         print("=" * 15)
         
@@ -58,8 +66,7 @@ def main():
         print("🔊 Speaking...")
         
         # Speak the text
-        engine.say(text)
-        engine.runAndWait()
+        speak(text)
         
         print("✅ Playback complete!")
         
@@ -13,6 +13,10 @@ import subprocess
 from pathlib import Path
 from datetime import datetime
 
+# Share the hooks' JSONL logging helpers
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent / "hooks"))
+from utils.jsonl_log import append_jsonl
+
 try:
     from dotenv import load_dotenv
     load_dotenv()
@@ -40,17 +44,7 @@ def log_status_line(input_data, status_line_output, error_message=None):
     # Ensure logs directory exists
     log_dir = Path("logs")
     log_dir.mkdir(parents=True, exist_ok=True)
-    log_file = log_dir / "status_line.json"
-
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, "r") as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
+    log_file = log_dir / "status_line.jsonl"
 
     # Create log entry with input data and generated output
     log_entry = {
@@ -62,12 +56,8 @@ def log_status_line(input_data, status_line_output, error_message=None):
     if error_message:
         log_entry["error"] = error_message
 
-    # Append the log entry
-    log_data.append(log_entry)
-
-    # Write back to file with formatting
-    with open(log_file, "w") as f:
-        json.dump(log_data, f, indent=2)
+    # Append-only JSONL: one write per render, no read-modify-write
+    append_jsonl(log_file, log_entry)
 
 
 def get_git_branch():
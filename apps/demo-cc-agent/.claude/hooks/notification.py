@@ -14,6 +14,7 @@ import subprocess
 import random
 from pathlib import Path
 from utils.constants import ensure_session_log_dir
+from utils.jsonl_log import append_jsonl
 
 try:
     from dotenv import load_dotenv
@@ -98,24 +99,10 @@ def main():
         
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_file = log_dir / 'notification.json'
+        log_file = log_dir / 'notification.jsonl'
         
-        # Read existing log data or initialize empty list
-        if log_file.exists():
-            with open(log_file, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-        
-        # Append new data
-        log_data.append(input_data)
-        
-        # Write back to file with formatting
-        with open(log_file, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_file, input_data)
         
         # Announce notification via TTS only if --notify flag is set
         # Skip TTS for the generic "Claude is waiting for your input" message
@@ -8,6 +8,7 @@ import os
 import sys
 from pathlib import Path
 from utils.constants import ensure_session_log_dir
+from utils.jsonl_log import append_jsonl
 
 def main():
     try:
@@ -19,24 +20,10 @@ def main():
         
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_path = log_dir / 'post_tool_use.json'
+        log_path = log_dir / 'post_tool_use.jsonl'
         
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-        
-        # Append new data
-        log_data.append(input_data)
-        
-        # Write back to file with formatting
-        with open(log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_path, input_data)
         
         sys.exit(0)
         
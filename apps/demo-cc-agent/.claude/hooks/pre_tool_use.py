@@ -1,6 +1,9 @@
 #!/usr/bin/env -S uv run --script
 # /// script
 # requires-python = ">=3.8"
+# dependencies = [
+#     "orjson",
+# ]
 # ///
 
 import json
@@ -8,49 +11,89 @@ import sys
 import re
 from pathlib import Path
 from utils.constants import ensure_session_log_dir
+from utils.jsonl_log import append_jsonl
+
+# Prefer orjson (C/Rust decoder) when installed, fall back to stdlib json
+try:
+    from orjson import loads as _loads
+except ImportError:
+    _loads = json.loads
+
+# Detection patterns, compiled once at import rather than looked up in the
+# re module's cache on every call. The rm patterns run on the lowercased
+# command as-is, so no whitespace normalization (split/join) is needed.
+# Commands are untrusted input, so no pattern may backtrack catastrophically:
+# nothing is written as `rm\s+.*<flag>` (every rm in the command would rescan
+# the rest of it) and matching stays linear in the length of the command.
+_RM_START_RE = re.compile(r'\brm\s')
+
+# Flags are searched for from the end of the first rm: a later rm only sees
+# a suffix of the command, so whatever follows it also follows the first one.
+# Pattern 1: Standard rm -rf variations - a flag cluster with both r and f
+# (rm -rf, rm -fr, rm -Rf, etc.), matchable in only one way
+_FORCE_RECURSIVE_FLAG_RE = re.compile(r'-[a-eg-qs-z]*(?:r[a-eg-z]*f|f[a-qs-z]*r)')
+_RM_LONG_FLAGS_RE = re.compile(r'\brm\s+(?:--recursive\s+--force|--force\s+--recursive)')
+# rm -r ... -f / rm -f ... -r: the first such rm decides, since any later
+# one lies after it and its own -r/-f completes the first's pair
+_RM_SPLIT_FLAG_RE = re.compile(r'\brm\s+-([rf])\s')
+
+# Pattern 2: rm with recursive flag targeting dangerous paths: root (/, /*),
+# home (~, ~/, $HOME), parent and current directory (.., ., trailing .) and
+# wildcards (*). The multi-character forms all start with one of the single
+# characters, so the alternation reduces to a character class plus $HOME.
+_RECURSIVE_FLAG_RE = re.compile(r'-[a-qs-z]*r')
+_DANGEROUS_PATH_RE = re.compile(r'[/~*.]|\$HOME')
+
+# .env file access in Bash commands (but allow .env.sample). The alternatives
+# share the `.env` suffix, so it is factored out and matched once.
+# `cmd\s+.*` (rest of the line after cmd and its blanks) is spelled
+# `cmd\s(?:\s*\n)?` plus a run that stops at the next command word, which
+# reaches every .env the earlier one would.
+_ENV_RE = re.compile(
+    r'(?:'
+    r'\b'                                                    # .env but not .env.sample
+    r'|(?:cat|touch|cp|mv)\s(?:\s*\n)?'                      # cat/touch/cp/mv .env
+    r'(?:(?!(?:cat|touch|cp|mv)\s)[^\n])*'
+    r'|echo\s(?:\s*\n)?(?:(?!echo\s)[^\n])*>\s*'             # echo > .env
+    r')\.env\b(?!\.sample)'
+)
+
+
+def _is_force_recursive(normalized, flags_start):
+    """Pattern 1: rm -rf and its variations (flags_start: end of the first rm)."""
+    if _FORCE_RECURSIVE_FLAG_RE.search(normalized, flags_start):
+        return True
+    if _RM_LONG_FLAGS_RE.search(normalized):
+        return True
+    split = _RM_SPLIT_FLAG_RE.search(normalized)
+    if split is None:
+        return False
+    other_flag = '-f' if split.group(1) == 'r' else '-r'
+    return normalized.find(other_flag, split.end()) != -1
 
 def is_dangerous_rm_command(command):
     """
     Comprehensive detection of dangerous rm commands.
     Matches various forms of rm -rf and similar destructive patterns.
     """
-    # Normalize command by removing extra spaces and converting to lowercase
-    normalized = ' '.join(command.lower().split())
+    # Fast reject: every pattern below requires a "-" flag and "rm", so skip
+    # the normalization and regex work for the common case (git, ls, ...)
+    if '-' not in command:
+        return False
+    normalized = command.lower()
+    if 'rm' not in normalized:
+        return False
+    rm = _RM_START_RE.search(normalized)
+    if rm is None:
+        return False
     
     # Pattern 1: Standard rm -rf variations
-    patterns = [
-        r'\brm\s+.*-[a-z]*r[a-z]*f',  # rm -rf, rm -fr, rm -Rf, etc.
-        r'\brm\s+.*-[a-z]*f[a-z]*r',  # rm -fr variations
-        r'\brm\s+--recursive\s+--force',  # rm --recursive --force
-        r'\brm\s+--force\s+--recursive',  # rm --force --recursive
-        r'\brm\s+-r\s+.*-f',  # rm -r ... -f
-        r'\brm\s+-f\s+.*-r',  # rm -f ... -r
-    ]
-    
-    # Check for dangerous patterns
-    for pattern in patterns:
-        if re.search(pattern, normalized):
-            return True
+    if _is_force_recursive(normalized, rm.end()):
+        return True
     
     # Pattern 2: Check for rm with recursive flag targeting dangerous paths
-    dangerous_paths = [
-        r'/',           # Root directory
-        r'/\*',         # Root with wildcard
-        r'~',           # Home directory
-        r'~/',          # Home directory path
-        r'\$HOME',      # Home environment variable
-        r'\.\.',        # Parent directory references
-        r'\*',          # Wildcards in general rm -rf context
-        r'\.',          # Current directory
-        r'\.\s*$',      # Current directory at end of command
-    ]
-    
-    if re.search(r'\brm\s+.*-[a-z]*r', normalized):  # If rm has recursive flag
-        for path in dangerous_paths:
-            if re.search(path, normalized):
-                return True
-    
-    return False
+    return bool(_RECURSIVE_FLAG_RE.search(normalized, rm.end())
+                and _DANGEROUS_PATH_RE.search(normalized))
 
 def is_env_file_access(tool_name, tool_input):
     """
@@ -66,26 +109,16 @@ def is_env_file_access(tool_name, tool_input):
         # Check bash commands for .env file access
         elif tool_name == 'Bash':
             command = tool_input.get('command', '')
-            # Pattern to detect .env file access (but allow .env.sample)
-            env_patterns = [
-                r'\b\.env\b(?!\.sample)',  # .env but not .env.sample
-                r'cat\s+.*\.env\b(?!\.sample)',  # cat .env
-                r'echo\s+.*>\s*\.env\b(?!\.sample)',  # echo > .env
-                r'touch\s+.*\.env\b(?!\.sample)',  # touch .env
-                r'cp\s+.*\.env\b(?!\.sample)',  # cp .env
-                r'mv\s+.*\.env\b(?!\.sample)',  # mv .env
-            ]
-            
-            for pattern in env_patterns:
-                if re.search(pattern, command):
-                    return True
+            # Every pattern requires a literal ".env"
+            if '.env' in command and _ENV_RE.search(command):
+                return True
     
     return False
 
 def main():
     try:
         # Read JSON input from stdin
-        input_data = json.load(sys.stdin)
+        input_data = _loads(sys.stdin.buffer.read())
         
         tool_name = input_data.get('tool_name', '')
         tool_input = input_data.get('tool_input', {})
@@ -110,24 +143,10 @@ def main():
         
         # Ensure session log directory exists
         log_dir = ensure_session_log_dir(session_id)
-        log_path = log_dir / 'pre_tool_use.json'
-        
-        # Read existing log data or initialize empty list
-        if log_path.exists():
-            with open(log_path, 'r') as f:
-                try:
-                    log_data = json.load(f)
-                except (json.JSONDecodeError, ValueError):
-                    log_data = []
-        else:
-            log_data = []
-        
-        # Append new data
-        log_data.append(input_data)
+        log_path = log_dir / 'pre_tool_use.jsonl'
         
-        # Write back to file with formatting
-        with open(log_path, 'w') as f:
-            json.dump(log_data, f, indent=2)
+        # Append-only JSONL: one write per event, no read-modify-write
+        append_jsonl(log_path, input_data)
         
         sys.exit(0)
         
@@ -18,7 +18,7 @@ import os
 import argparse
 import urllib.request
 import urllib.error
-from datetime import datetime
+import time
 from utils.summarizer import generate_event_summary
 
 def send_event_to_server(event_data, server_url='https://ai.di4.dev/events'):
@@ -73,7 +73,7 @@ def main():
         'session_id': input_data.get('session_id', 'unknown'),
         'hook_event_type': args.event_type,
         'payload': input_data,
-        'timestamp': int(datetime.now().timestamp() * 1000)
+        'timestamp': time.time_ns() // 1_000_000
     }
     
     # Handle --add-chat option
@@ -13,6 +13,7 @@ import sys
 from pathlib import Path
 from datetime import datetime
 from utils.constants import ensure_session_log_dir
+from utils.jsonl_log import append_jsonl
 
 try:
     from dotenv import load_dotenv
@@ -25,24 +26,10 @@ def log_user_prompt(session_id, input_data):
     """Log user prompt to session directory."""
     # Ensure session log directory exists
     log_dir = ensure_session_log_dir(session_id)
-    log_file = log_dir / 'user_prompt_submit.json'
+    log_file = log_dir / 'user_prompt_submit.jsonl'
     
-    # Read existing log data or initialize empty list
-    if log_file.exists():
-        with open(log_file, 'r') as f:
-            try:
-                log_data = json.load(f)
-            except (json.JSONDecodeError, ValueError):
-                log_data = []
-    else:
-        log_data = []
-    
-    # Append the entire input data
-    log_data.append(input_data)
-    
-    # Write back to file with formatting
-    with open(log_file, 'w') as f:
-        json.dump(log_data, f, indent=2)
+    # Append-only JSONL: one write per event, no read-modify-write
+    append_jsonl(log_file, input_data)
 
 
 def validate_prompt(prompt):
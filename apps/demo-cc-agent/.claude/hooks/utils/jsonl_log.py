@@ -0,0 +1,88 @@
+#!/usr/bin/env -S uv run --script
+# /// script
+# requires-python = ">=3.8"
+# ///
+
+"""
+JSON Lines logging for Claude Code Hooks.
+
+Each event is appended as one compact JSON object per line, so logging
+never reads, parses, or rewrites earlier entries.
+"""
+
+import json
+import os
+from pathlib import Path
+from typing import Any, Dict, Iterator, Union
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not available on Windows
+
+# Lines up to this size go out as one unlocked write(2). Not PIPE_BUF (a
+# pipe/FIFO limit): on a regular file O_APPEND keeps one write(2) whole, and
+# the limit only bounds short writes, whose rest would need a second call
+UNLOCKED_WRITE_MAX = 4096
+
+
+def _encode_line_json(entry: Dict[str, Any]) -> bytes:
+    return (json.dumps(entry, separators=(',', ':')) + '\n').encode('utf-8')
+
+
+# Prefer orjson (C/Rust encoder, emits bytes) when installed
+try:
+    import orjson
+
+    def _encode_line(entry: Dict[str, Any]) -> bytes:
+        try:
+            return orjson.dumps(entry, option=orjson.OPT_APPEND_NEWLINE)
+        except orjson.JSONEncodeError:
+            return _encode_line_json(entry)  # e.g. integers over 64 bits
+except ImportError:
+    _encode_line = _encode_line_json
+
+
+def append_jsonl(log_path: Union[str, Path], entry: Dict[str, Any]) -> None:
+    """
+    Append an entry to a .jsonl log file.
+
+    Args:
+        log_path: Path to the .jsonl log file (created if missing)
+        entry: JSON-serializable event data
+    """
+    line = _encode_line(entry)
+    fd = os.open(log_path, os.O_WRONLY | os.O_CREAT | os.O_APPEND, 0o644)
+    try:
+        # One O_APPEND write(2) never interleaves with other appends; lock
+        # longer lines so a short write's continuation stays with its start
+        if len(line) > UNLOCKED_WRITE_MAX and fcntl is not None:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+        view = memoryview(line)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)  # Also releases the lock
+
+
+def read_jsonl(log_path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """
+    Iterate over the entries of a .jsonl log file.
+
+    Args:
+        log_path: Path to the .jsonl log file
+
+    Yields:
+        Parsed log entries (blank and malformed lines are skipped)
+    """
+    try:
+        with open(log_path, 'r') as f:
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    yield json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+    except FileNotFoundError:
+        return